@@ -0,0 +1,75 @@
+"""
+Benchmark for the case details parser
+Times the lxml dispatch parser against the original BeautifulSoup label chain on saved pages
+Run from the project root: python benchmarks/bench_parser.py
+"""
+import os
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+
+from bs4 import BeautifulSoup
+
+from models import CaseDetails
+from parser import parse_case_details
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+CASE_STATUS_FIXTURES = ["case_status.html"]
+
+
+def legacy_parse_case_details(page_source: str):
+    soup = BeautifulSoup(page_source, 'lxml')
+    case = CaseDetails()
+    tables = soup.find_all('table')
+    if not tables:
+        return None
+    for table in tables:
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                label = cells[0].get_text(strip=True).lower()
+                value = cells[1].get_text(strip=True)
+                if 'case' in label and 'number' in label:
+                    case.case_number = value
+                elif 'case' in label and 'type' in label:
+                    case.case_type = value
+                elif 'year' in label:
+                    case.case_year = value
+                elif 'petitioner' in label or 'plaintiff' in label:
+                    case.petitioner = value
+                elif 'respondent' in label or 'defendant' in label:
+                    case.respondent = value
+                elif 'court' in label and 'name' in label:
+                    case.court_name = value
+                elif 'filing' in label and 'date' in label:
+                    case.filing_date = value
+                elif 'registration' in label and 'date' in label:
+                    case.registration_date = value
+                elif 'status' in label:
+                    case.status = value
+                elif 'judge' in label:
+                    case.judge_name = value
+                elif 'next' in label and ('hearing' in label or 'date' in label):
+                    case.next_hearing_date = value
+    return case if case.case_number else None
+
+
+def bench(func, page_source: str, number: int) -> float:
+    return min(timeit.repeat(lambda: func(page_source), number=number, repeat=5)) / number * 1000
+
+
+def main(number: int = 200):
+    for name in CASE_STATUS_FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+            page_source = f.read()
+        if legacy_parse_case_details(page_source) != parse_case_details(page_source):
+            print(f"{name}: parsers disagree!")
+        legacy_ms = bench(legacy_parse_case_details, page_source, number)
+        new_ms = bench(parse_case_details, page_source, number)
+        print(f"{name}: legacy {legacy_ms:.3f} ms, dispatch {new_ms:.3f} ms ({legacy_ms / new_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
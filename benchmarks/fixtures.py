@@ -0,0 +1,122 @@
+"""
+Recorded portal fixtures for the benchmarks
+Loads the saved case status and cause list pages; run as a script to regenerate the cause lists
+Run from the project root: python benchmarks/fixtures.py
+"""
+import gzip
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+CASE_STATUS_FIXTURE = "case_status.html"
+CAUSE_LIST_FIXTURES = {
+    "small": ("cause_list_small.html", 12),
+    "typical": ("cause_list_typical.html", 250),
+    "5k": ("cause_list_5k.html.gz", 5000),
+}
+
+_CASE_TYPES = ["CS", "CRL.A", "CRL.M.C", "W.P.(C)", "FAO", "RFA", "MAC.APP", "C.M.A", "ARB.P", "RSA"]
+_PURPOSES = ["For Evidence", "For Arguments", "For Orders", "For Appearance", "For Written Statement", "For Judgment"]
+_NAMES = ["Ramesh Kumar Sharma", "Suresh Patil", "Anita Deshmukh", "Mahesh Joshi", "Sunita Rao",
+          "Vijay Kulkarni", "State of Maharashtra", "Lata Gaikwad", "Prakash Shinde", "Meena Iyer"]
+_ADVOCATES = ["S. K. Deshpande", "R. M. Kale", "P. V. Naik", "A. S. Pawar", "N. D. Jadhav"]
+_JUDGES = ["Shri A. B. Kulkarni", "Smt. R. S. Mehta", "Shri V. K. Bhosale", "Smt. P. N. Kadam"]
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Cause List | eCourts Services</title>
+<script src="/ecourtindia_v6/assets/js/jquery.min.js"></script>
+</head>
+<body>
+<header id="header"><nav class="navbar"><ul class="nav">
+<li><a href="?p=home/index">Home</a></li><li><a href="?p=casestatus/index">Case Status</a></li>
+<li><a href="?p=cause_list/index">Cause List</a></li></ul></nav></header>
+<div class="container">
+<form id="cause_list_form" action="?p=cause_list/index" method="post">
+<input type="hidden" name="app_token" value="8f1f6c1e0b2a4d7f9e3c5a1b2d4f6e8a">
+<select id="state_code" name="state_code"><option value="1">Maharashtra</option></select>
+<select id="dist_code" name="dist_code"><option value="19">Aurangabad</option></select>
+<select id="court_complex_code" name="court_complex_code"><option value="3">District and Sessions Court</option></select>
+<input type="text" id="causelist_date" name="causelist_date" value="20-10-2026">
+<img id="captcha_image" src="/ecourtindia_v6/vendor/securimage/securimage_show.php" alt="captcha">
+<button type="submit">Civil</button><button type="submit">Criminal</button>
+</form>
+<div id="res_cause_list">
+<h3>Cause List for 20-10-2026</h3>
+<table id="dispTable" class="table">
+<thead><tr><th>Sr No</th><th>Cases</th><th>Party Name</th><th>Advocate</th></tr></thead>
+<tbody>
+"""
+
+_PAGE_TAIL = """</tbody>
+</table>
+</div>
+</div>
+<footer id="footer"><p>Content owned by eCommittee, Supreme Court of India</p></footer>
+</body>
+</html>
+"""
+
+
+def build_cause_list_html(rows: int, seed: int = 2015) -> str:
+    rng = random.Random(seed)
+    parts = [_PAGE_HEAD]
+    court_number = 0
+    for serial in range(1, rows + 1):
+        if serial % 60 == 1:
+            court_number += 1
+            parts.append(f'<tr><td colspan="4" class="court-head">Court No. {court_number} : '
+                         f'Civil Judge Senior Division</td></tr>\n')
+            parts.append(f'<tr><td colspan="4">Judge : {rng.choice(_JUDGES)}</td></tr>\n')
+        if serial % 15 == 1:
+            parts.append(f'<tr><td colspan="4" class="purpose">{rng.choice(_PURPOSES)}</td></tr>\n')
+        case_type = rng.choice(_CASE_TYPES)
+        number = rng.randint(1, 9999)
+        year = rng.randint(1995, 2026)
+        cnr = f"MHAU01{number:06d}{year}"
+        petitioner, respondent = rng.sample(_NAMES, 2)
+        parts.append(
+            f'<tr><td>{serial}</td>'
+            f'<td><a href="#" onclick="viewHistory(\'{cnr}\')">{case_type}/{number}/{year}</a></td>'
+            f'<td>{petitioner}<br>versus<br>{respondent}</td>'
+            f'<td>{rng.choice(_ADVOCATES)}</td></tr>\n'
+        )
+    parts.append(_PAGE_TAIL)
+    return "".join(parts)
+
+
+def load_fixture(name: str) -> str:
+    path = os.path.join(FIXTURES_DIR, name)
+    if name.endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_cause_list(size: str) -> str:
+    return load_fixture(CAUSE_LIST_FIXTURES[size][0])
+
+
+def load_case_status() -> str:
+    return load_fixture(CASE_STATUS_FIXTURE)
+
+
+def regenerate():
+    for name, rows in CAUSE_LIST_FIXTURES.values():
+        page = build_cause_list_html(rows)
+        path = os.path.join(FIXTURES_DIR, name)
+        if name.endswith('.gz'):
+            with gzip.GzipFile(path, 'wb', mtime=0) as f:
+                f.write(page.encode('utf-8'))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(page)
+        print(f"Wrote {path} ({rows} rows)")
+
+
+if __name__ == "__main__":
+    regenerate()
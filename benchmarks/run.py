@@ -0,0 +1,168 @@
+"""
+Benchmark suite for the eCourts scraping pipeline
+Times parsing, model construction, serialization, saving and end-to-end lookups on recorded fixtures
+Run from the project root:
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --compare bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from src import __version__
+from fixtures import CAUSE_LIST_FIXTURES, load_case_status, load_cause_list
+from stub_server import StubPortal
+from models import CaseDetails, CaseListing, CauseList
+from parser import parse_case_details, parse_cause_list
+from scraper import ECourtsScraper
+from transport import HttpTransport
+from utils import save_to_json, setup_logger
+from waits import AdaptiveDelay
+
+LISTING_DATE = "20-10-2026"
+
+
+def measure(name: str, func: Callable[[], Any], iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def build_listings(rows: int) -> List[CaseListing]:
+    return [
+        CaseListing(
+            serial_number=serial,
+            listing_date=LISTING_DATE,
+            court_name="Civil Judge Senior Division",
+            court_number=str(serial // 60 + 1),
+            judge_name="Shri A. B. Kulkarni",
+            case_details=CaseDetails(
+                cnr=f"MHAU01{serial:06d}2015",
+                case_type="CS",
+                case_number=str(serial),
+                case_year="2015",
+                petitioner="Ramesh Kumar Sharma",
+                respondent="Suresh Patil",
+            ),
+            purpose="For Evidence",
+        )
+        for serial in range(1, rows + 1)
+    ]
+
+
+def quiet_scraper(portal: StubPortal) -> ECourtsScraper:
+    scraper = ECourtsScraper(transport=HttpTransport(portal.case_status_url, portal.cause_list_url))
+    scraper.politeness = AdaptiveDelay(min_delay=0, max_delay=0)
+    return scraper
+
+
+def run_benchmarks(scale: float = 1.0) -> List[Dict[str, Any]]:
+    def n(iterations: int) -> int:
+        return max(1, int(iterations * scale))
+
+    results = []
+    case_status_html = load_case_status()
+    cause_lists = {size: load_cause_list(size) for size in CAUSE_LIST_FIXTURES}
+
+    with StubPortal(case_status_html, cause_lists["typical"]) as portal:
+        scraper = quiet_scraper(portal)
+        results.append(measure("parse_case_details", lambda: scraper._parse_case_details(case_status_html), n(200)))
+        for size, page in cause_lists.items():
+            iterations = {"small": 200, "typical": 50, "5k": 5}[size]
+            results.append(measure(f"parse_cause_list[{size}]",
+                                   lambda page=page: parse_cause_list(page, LISTING_DATE), n(iterations)))
+
+        results.append(measure("construct_listings[5k]", lambda: build_listings(5000), n(10)))
+        cause_list_5k = CauseList(date=LISTING_DATE, listings=build_listings(5000), total_cases=5000)
+        cause_list_dict = cause_list_5k.to_dict()
+        results.append(measure("to_dict[5k]", cause_list_5k.to_dict, n(20)))
+        results.append(measure("to_rows[5k]", cause_list_5k.to_rows, n(20)))
+        results.append(measure("from_dict[5k]", lambda: CauseList.from_dict(cause_list_dict), n(10)))
+        case_details = parse_case_details(case_status_html)
+        results.append(measure("case_details.to_dict", case_details.to_dict, n(20000), warmup=100))
+
+        with tempfile.TemporaryDirectory() as directory:
+            results.append(measure("save_to_json[case]",
+                                   lambda: save_to_json(case_details.to_dict(), "bench_case", directory), n(200)))
+            results.append(measure("save_to_json[5k]",
+                                   lambda: save_to_json(cause_list_dict, "bench_cause_list", directory), n(5)))
+
+        results.append(measure("search_by_cnr[stub]",
+                               lambda: scraper.search_by_cnr("MHAU019999992015", check_listing=False), n(50)))
+        results.append(measure("download_cause_list[stub,typical]",
+                               lambda: scraper.download_cause_list(LISTING_DATE), n(20)))
+        scraper.close()
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {entry["name"]: entry for entry in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for entry in results:
+        old = baseline.get(entry["name"])
+        if old is None:
+            continue
+        ratio = entry["median_ms"] / old["median_ms"] if old["median_ms"] else float('inf')
+        marker = "  (slower)" if ratio > 1.1 else "  (faster)" if ratio < 0.9 else ""
+        print(f"  {entry['name']:<36} {old['median_ms']:>10.3f} -> {entry['median_ms']:>10.3f} ms  x{ratio:.2f}{marker}",
+              file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="eCourts Scraper benchmark suite")
+    parser.add_argument('--output', type=str, help='Write JSON results to this file (default: stdout)')
+    parser.add_argument('--compare', type=str, help='Baseline JSON results to compare against')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply iteration counts (e.g. 0.2 for a quick run)')
+    args = parser.parse_args(argv)
+
+    setup_logger().setLevel(logging.WARNING)
+    results = run_benchmarks(args.scale)
+    for entry in results:
+        print(f"  {entry['name']:<36} median {entry['median_ms']:>10.3f} ms  (n={entry['iterations']})", file=sys.stderr)
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Local stub of the eCourts portal for end-to-end benchmarks
+Serves recorded pages: GET returns the search form page, POST returns the matching result page
+"""
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+
+class StubPortal:
+    """
+    Threaded HTTP server answering case status and cause list form posts with fixture HTML
+    Paths added to files are served as PDFs instead, honouring single "bytes=N-"
+    Range requests; the Range header of each file request is kept in ranges.
+    """
+    def __init__(self, case_status_html: str, cause_list_html: str, host: str = "127.0.0.1", port: int = 0):
+        case_status = case_status_html.encode('utf-8')
+        cause_list = cause_list_html.encode('utf-8')
+        portal = self
+        self.requests = 0
+        self.failures: List[int] = []
+        self.files: Dict[str, bytes] = {}
+        self.ranges: List[Optional[str]] = []
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, body: bytes, status: int = 200, content_type: str = "text/html; charset=utf-8",
+                      headers: Optional[Dict[str, str]] = None):
+                with portal._lock:
+                    portal.requests += 1
+                    if portal.failures:
+                        status, headers = portal.failures.pop(0), None
+                if status >= 400:
+                    body = f"<html><body>Error {status}</body></html>".encode('utf-8')
+                    content_type = "text/html; charset=utf-8"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Set-Cookie", "PHPSESSID=stub; Path=/")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_file(self, body: bytes):
+                requested = self.headers.get("Range")
+                with portal._lock:
+                    portal.ranges.append(requested)
+                if not requested:
+                    self._send(body, content_type="application/pdf")
+                    return
+                start = int(requested[len("bytes="):].rstrip("-"))
+                if start >= len(body):
+                    self._send(b"", 416, headers={"Content-Range": f"bytes */{len(body)}"})
+                    return
+                self._send(body[start:], 206, "application/pdf",
+                           {"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"})
+
+            def do_GET(self):
+                if self.path in portal.files:
+                    self._send_file(portal.files[self.path])
+                    return
+                self._send(cause_list if "cause_list" in self.path else case_status)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                fields = parse_qs(self.rfile.read(length).decode('utf-8'))
+                self._send(cause_list if "causelist_date" in fields else case_status)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def fail_next(self, status: int, times: int = 1):
+        """
+        Answers the next times requests with an error status instead of the fixture page
+        """
+        with self._lock:
+            self.failures.extend([status] * times)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def case_status_url(self) -> str:
+        return self.base_url + "?p=casestatus/index"
+
+    @property
+    def cause_list_url(self) -> str:
+        return self.base_url + "?p=cause_list/index"
+
+    def start(self) -> "StubPortal":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
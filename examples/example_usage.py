@@ -6,6 +6,7 @@ import sys
 sys.path.append('../src')  # Add src to path
 
 from scraper import ECourtsScraper
+from batch import search_many
 from utils import save_to_json, print_banner
 
 def example_1_basic_search():
@@ -59,20 +60,18 @@ def example_4_multiple_searches():
         "MHAU019999992015",
         "DLHC010123452020",
     ]
-    with ECourtsScraper(headless=False) as scraper:
-        results = []
-        for cnr in cnr_list:
-            print(f"\nSearching for: {cnr}")
-            result = scraper.search_by_cnr(cnr, check_listing=False)
-            results.append(result)
-            if result.success:
-                print(f"  ✅ Found")
-            else:
-                print(f"  ❌ Not found")
-        print("\n" + "-"*70)
-        print(f"Total searched: {len(cnr_list)}")
-        print(f"Found: {sum(1 for r in results if r.success)}")
-        print(f"Not found: {sum(1 for r in results if not r.success)}")
+    results = []
+    for cnr, result in search_many(cnr_list, concurrency=2, check_listing=False):
+        print(f"\nSearched: {cnr}")
+        results.append(result)
+        if result.success:
+            print(f"  ✅ Found")
+        else:
+            print(f"  ❌ Not found")
+    print("\n" + "-"*70)
+    print(f"Total searched: {len(cnr_list)}")
+    print(f"Found: {sum(1 for r in results if r.success)}")
+    print(f"Not found: {sum(1 for r in results if not r.success)}")
 
 def example_5_error_handling():
     print("\n" + "="*70)
@@ -0,0 +1,352 @@
+"""
+Asyncio scraping core for eCourts
+Keeps hundreds of lookups in flight over one pooled httpx client instead of one thread per lookup
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+from config import (
+    CASE_STATUS_URL,
+    CAUSE_LIST_URL,
+    REQUEST_TIMEOUT,
+    USER_AGENT,
+    SEARCH_TYPE_FIELD,
+    SEARCH_BY_CNR,
+    CNR_FORM_FIELD,
+    CAUSE_LIST_DATE_FIELD,
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_PER_HOST_LIMIT,
+    ERROR_MESSAGES,
+    CAPTCHA_FORM_FIELD,
+    CAPTCHA_ATTEMPTS,
+    SESSION_MAX_AGE,
+    CACHE_TTLS,
+)
+from models import CaseDetails, CaseListing, CauseList, CourtSelector, SearchResult
+from parser import parse_case_details, parse_cause_list
+from transport import (
+    Handshake,
+    extract_form,
+    needs_javascript,
+    court_form_fields,
+    find_captcha_image,
+    captcha_rejected,
+    session_expired,
+)
+from captcha import CaptchaQueue
+from metrics import MetricsRegistry, REGISTRY
+from resilience import Resilience, classify_failure
+from causelist_index import CauseListIndex
+from utils import setup_logger, get_date_string, validate_cnr
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError:
+        raise RuntimeError("AsyncECourtsScraper requires the 'httpx' package (pip install httpx)")
+    return httpx
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncECourtsScraper:
+    """
+    Async counterpart of ECourtsScraper for the HTTP backend
+    One keep-alive connection pool (HTTP/2 when the h2 package is installed) is
+    shared by all lookups, a semaphore caps in-flight requests per host, and
+    every request is cancelled after REQUEST_TIMEOUT seconds. CAPTCHAs are
+    awaited on the given CaptchaQueue while other lookups keep running; without
+    a queue, and for pages that need JavaScript, lookups come back as failed results.
+    Each form page is handshaken once and shared by all lookups until it expires.
+    """
+    def __init__(self,
+                 case_status_url: str = CASE_STATUS_URL,
+                 cause_list_url: str = CAUSE_LIST_URL,
+                 max_connections: int = ASYNC_MAX_CONNECTIONS,
+                 per_host_limit: int = ASYNC_PER_HOST_LIMIT,
+                 timeout: float = REQUEST_TIMEOUT,
+                 http2: bool = True,
+                 court: Optional[CourtSelector] = None,
+                 captcha: Optional[CaptchaQueue] = None,
+                 session_max_age: float = SESSION_MAX_AGE,
+                 metrics: Optional[MetricsRegistry] = None,
+                 resilience: Optional[Resilience] = None,
+                 cause_list_max_age: float = CACHE_TTLS["cause_list"]):
+        self.logger = setup_logger()
+        self.case_status_url = case_status_url
+        self.cause_list_url = cause_list_url
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.http2 = http2 and _http2_available()
+        self.court = court
+        self.captcha = captcha
+        self.session_max_age = session_max_age
+        self.metrics = metrics or REGISTRY
+        self.resilience = resilience or Resilience(metrics=self.metrics)
+        self._handshakes: Dict[str, Handshake] = {}
+        self._handshake_locks: Dict[str, asyncio.Lock] = {}
+        self._httpx = _import_httpx()
+        self._client = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.cause_list_max_age = cause_list_max_age
+        # (started_at, task) by (court, date), like CauseListIndexRegistry; failed loads are dropped when they finish
+        self._cause_lists: Dict[Tuple[str, str], Tuple[float, asyncio.Task]] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            httpx = self._httpx
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=httpx.Timeout(self.timeout),
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True
+            )
+        return self._client
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._semaphores[host]
+
+    async def _send(self, method: str, url: str, check_status: bool = True, **kwargs):
+        async with self._semaphore(url):
+            response = await asyncio.wait_for(
+                self._get_client().request(method, url, **kwargs),
+                timeout=self.timeout
+            )
+        if check_status:
+            response.raise_for_status()
+        return response
+
+    async def _request(self, method: str, url: str, **kwargs) -> str:
+        return (await self._send(method, url, **kwargs)).text
+
+    async def _submit_form(self, page_url: str, fields: Dict[str, str], field_name: str) -> Optional[str]:
+        """
+        Result page of a form post; None when no CAPTCHA answer was accepted
+        """
+        for attempt in range(CAPTCHA_ATTEMPTS):
+            handshake = await self._handshake(page_url, field_name)
+            if handshake is None:
+                return None
+            response = await self._send("POST", handshake.action, check_status=False,
+                                        data=handshake.payload(fields), headers={"Referer": page_url})
+            if session_expired(response.status_code, response.text) or captcha_rejected(response.text):
+                if self._handshakes.get(page_url) is handshake:
+                    del self._handshakes[page_url]
+                continue
+            response.raise_for_status()
+            return response.text
+        return None
+
+    async def _handshake(self, page_url: str, field_name: str) -> Optional[Handshake]:
+        lock = self._handshake_locks.setdefault(page_url, asyncio.Lock())
+        async with lock:
+            handshake = self._handshakes.get(page_url)
+            if handshake is not None and not handshake.expired(self.session_max_age):
+                return handshake
+            page = await self._request("GET", page_url)
+            action, tokens = extract_form(page, page_url, field_name)
+            captcha_url = find_captcha_image(page, page_url)
+            if captcha_url and self.captcha is not None:
+                answer = await self._solve_captcha(captcha_url, page_url)
+                if answer is None:
+                    return None
+                tokens[CAPTCHA_FORM_FIELD] = answer
+            handshake = Handshake(action, tokens)
+            self._handshakes[page_url] = handshake
+            return handshake
+
+    async def _solve_captcha(self, captcha_url: str, page_url: str) -> Optional[str]:
+        if self.captcha is None:
+            return None
+        image = await self._send("GET", captcha_url, headers={"Referer": page_url})
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self.captcha.submit(image.content)),
+                                          timeout=self.captcha.timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning("⚠ CAPTCHA solver timed out")
+            return None
+
+    async def search_by_cnr(self, cnr: str, check_listing: bool = False) -> SearchResult:
+        is_valid, message = validate_cnr(cnr)
+        if not is_valid:
+            self.metrics.inc("ecourts_lookups_total", outcome="invalid_cnr")
+            return SearchResult(success=False, message=message, error="Invalid CNR", failure_reason="invalid_cnr")
+        outcome = "unexpected"
+        start = time.perf_counter()
+        try:
+            page_source = await self.resilience.call_async(
+                self.case_status_url,
+                self._submit_form,
+                self.case_status_url,
+                {SEARCH_TYPE_FIELD: SEARCH_BY_CNR, CNR_FORM_FIELD: cnr},
+                CNR_FORM_FIELD
+            )
+            if page_source is None:
+                outcome = "captcha_required"
+                return SearchResult(
+                    success=False,
+                    message=ERROR_MESSAGES["captcha_required"],
+                    error="CAPTCHA was not solved",
+                    failure_reason=outcome
+                )
+            if needs_javascript(page_source):
+                outcome = "javascript_required"
+                return SearchResult(
+                    success=False,
+                    message=ERROR_MESSAGES["javascript_required"],
+                    error="Page requires JavaScript",
+                    failure_reason=outcome
+                )
+            case_details = parse_case_details(page_source)
+            if not case_details:
+                outcome = "case_not_found"
+                return SearchResult(
+                    success=False,
+                    message="Case not found",
+                    error="No case data found for this CNR",
+                    failure_reason=outcome
+                )
+            is_listed, listing_info = False, None
+            if check_listing:
+                is_listed, listing_info = await self._check_case_listing(case_details)
+            outcome = "success"
+            return SearchResult(
+                success=True,
+                message="Case found successfully",
+                case_details=case_details,
+                is_listed=is_listed,
+                listing_info=listing_info
+            )
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            return SearchResult(
+                success=False,
+                message="Request timed out",
+                error="The server took too long to respond",
+                failure_reason=outcome
+            )
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            outcome = classify_failure(e)
+            self.logger.error(f"Error searching {cnr} ({outcome}): {e}")
+            return SearchResult(
+                success=False,
+                message="An unexpected error occurred" if outcome == "unexpected" else ERROR_MESSAGES[outcome],
+                error=str(e),
+                failure_reason=outcome
+            )
+        finally:
+            self.metrics.inc("ecourts_lookups_total", outcome=outcome)
+            self.metrics.observe("ecourts_lookup_seconds", time.perf_counter() - start, outcome=outcome)
+
+    async def download_cause_list(self, date: Optional[str] = None,
+                                  court: Optional[CourtSelector] = None) -> Optional[CauseList]:
+        if date is None:
+            date = get_date_string(0, "ecourts")
+        court = court or self.court
+        fields = court_form_fields(court)
+        fields[CAUSE_LIST_DATE_FIELD] = date
+        try:
+            page_source = await self.resilience.call_async(self.cause_list_url, self._submit_form,
+                                                           self.cause_list_url, fields, CAUSE_LIST_DATE_FIELD)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error downloading cause list for {date}: {e}")
+            return None
+        if page_source is None:
+            self.logger.warning(f"Cause list for {date} needs a CAPTCHA answer")
+            return None
+        if needs_javascript(page_source):
+            self.logger.warning(f"Cause list for {date} requires JavaScript")
+            return None
+        return parse_cause_list(page_source, date, court.key if court else None)
+
+    async def _cause_list_index(self, date: str) -> Optional[CauseListIndex]:
+        key = (self.court.key if self.court else "all", date)
+        entry = self._cause_lists.get(key)
+        if entry is not None and entry[1].done() and time.monotonic() - entry[0] > self.cause_list_max_age:
+            entry = None
+        if entry is None:
+            async def load() -> Optional[CauseListIndex]:
+                cause_list = await self.download_cause_list(date)
+                return CauseListIndex(cause_list) if cause_list is not None else None
+            task = asyncio.ensure_future(load())
+            entry = self._cause_lists[key] = (time.monotonic(), task)
+            task.add_done_callback(lambda done: self._forget_failed(key, done))
+        return await asyncio.shield(entry[1])
+
+    def _forget_failed(self, key: Tuple[str, str], task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            entry = self._cause_lists.get(key)
+            if entry is not None and entry[1] is task:
+                del self._cause_lists[key]
+
+    async def _check_case_listing(self, case_details: CaseDetails) -> Tuple[bool, Optional[CaseListing]]:
+        for offset in (0, 1):
+            index = await self._cause_list_index(get_date_string(offset, "ecourts"))
+            listing = index.lookup(case_details) if index else None
+            if listing:
+                return True, listing
+        return False, None
+
+    async def search_many(self, cnrs: Iterable[str], check_listing: bool = False,
+                          concurrency: Optional[int] = None) -> AsyncIterator[Tuple[str, SearchResult]]:
+        """
+        Yields (cnr, result) as lookups finish
+        At most concurrency lookups (default max_connections) are in flight and
+        cnrs is consumed only as they complete, so memory stays flat however
+        long the input is.
+        """
+        async def lookup(cnr: str) -> Tuple[str, SearchResult]:
+            return cnr, await self.search_by_cnr(cnr, check_listing=check_listing)
+
+        limit = max(1, concurrency or self.max_connections)
+        cnr_iter = iter(cnrs)
+        pending = set()
+        try:
+            while True:
+                for cnr in cnr_iter:
+                    pending.add(asyncio.ensure_future(lookup(cnr)))
+                    if len(pending) >= limit:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def close(self):
+        for _, task in list(self._cause_lists.values()):
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
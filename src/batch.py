@@ -0,0 +1,251 @@
+"""
+Concurrent batch lookups for the eCourts scraper
+Spreads CNR searches and cause list downloads over a bounded pool of workers and streams results back
+"""
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager, ExitStack
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, List, TypeVar
+
+from requests.cookies import RequestsCookieJar
+
+from config import BATCH_CONCURRENCY, DEFAULT_BACKEND
+from ratelimit import HostRateLimiter
+from browser_pool import BrowserPool
+from cache import ResponseCache
+from causelist_index import CauseListIndexRegistry
+from captcha import CaptchaQueue
+from resilience import Resilience
+from metrics import MetricsRegistry, REGISTRY
+from models import SearchResult, CauseList, CourtSelector, CaseOrder
+from parser import parse_cause_list
+from scraper import ECourtsScraper
+from utils import setup_logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Hidden form inputs carry per-request tokens that would make identical cause lists hash differently
+_HIDDEN_INPUT = re.compile(r'<input[^>]*type=["\']?hidden[^>]*>', re.IGNORECASE)
+
+
+def page_digest(page_source: str) -> str:
+    return hashlib.sha1(_HIDDEN_INPUT.sub('', page_source).encode('utf-8')).hexdigest()
+
+
+@contextmanager
+def shared_scrapers(concurrency: int, headless: bool, backend: str,
+                     rate_limiter: HostRateLimiter, cache: Optional[ResponseCache], refresh: bool,
+                     court: Optional[CourtSelector], captcha: Optional[CaptchaQueue],
+                     resilience: Optional[Resilience]) -> Iterator[Callable[[], ECourtsScraper]]:
+    pool = BrowserPool(size=concurrency, headless=headless)
+    cause_lists = CauseListIndexRegistry()
+    owns_captcha = captcha is None
+    captcha = captcha or CaptchaQueue()
+    resilience = resilience or Resilience()
+    try:
+        yield lambda: ECourtsScraper(headless=headless, backend=backend,
+                                     rate_limiter=rate_limiter, pool=pool,
+                                     cache=cache, refresh=refresh, court=court,
+                                     cause_lists=cause_lists, captcha=captcha,
+                                     resilience=resilience)
+    finally:
+        pool.close()
+        if owns_captcha:
+            captcha.close()
+
+
+def _run_workers(items: Iterable[T],
+                 work: Callable[[ECourtsScraper, T], R],
+                 failed: Callable[[T, Exception], R],
+                 concurrency: int,
+                 scraper_factory: Callable[[], ECourtsScraper]) -> Iterator[Tuple[T, R]]:
+    local = threading.local()
+    scrapers = []
+    scrapers_lock = threading.Lock()
+
+    def get_scraper() -> ECourtsScraper:
+        scraper = getattr(local, 'scraper', None)
+        if scraper is None:
+            scraper = scraper_factory()
+            local.scraper = scraper
+            with scrapers_lock:
+                scrapers.append(scraper)
+        return scraper
+
+    def run(item: T) -> R:
+        return work(get_scraper(), item)
+
+    pending = {}
+    item_iter = iter(items)
+    max_pending = max(1, concurrency) * 2
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            try:
+                while True:
+                    for item in item_iter:
+                        pending[executor.submit(run, item)] = item
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        item = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = failed(item, e)
+                        yield item, result
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        for scraper in scrapers:
+            scraper.close()
+
+
+def search_many(cnrs: Iterable[str],
+                concurrency: int = BATCH_CONCURRENCY,
+                check_listing: bool = False,
+                headless: bool = True,
+                backend: str = DEFAULT_BACKEND,
+                rate_limiter: Optional[HostRateLimiter] = None,
+                cache: Optional[ResponseCache] = None,
+                refresh: bool = False,
+                court: Optional[CourtSelector] = None,
+                captcha: Optional[CaptchaQueue] = None,
+                resilience: Optional[Resilience] = None,
+                scraper_factory: Optional[Callable[[], ECourtsScraper]] = None) -> Iterator[Tuple[str, SearchResult]]:
+    """
+    Yields (cnr, result) pairs as lookups complete. Each worker thread owns its own
+    scraper; all workers share one per-host rate limiter. Only 2 * concurrency
+    lookups are queued at a time, so cnrs can be a lazy iterable. Browser
+    fallbacks lease from one pool shared by all workers, and each day's cause
+    list is fetched once for the whole batch. CAPTCHAs from every worker go to
+    one shared solver queue, and retries and circuit breaking are shared too, so a
+    failing portal is backed off by the whole batch rather than worker by worker.
+    """
+    def lookup(scraper: ECourtsScraper, cnr: str) -> SearchResult:
+        return scraper.search_by_cnr(cnr, check_listing=check_listing)
+
+    def failed(cnr: str, error: Exception) -> SearchResult:
+        return SearchResult(
+            success=False,
+            message="An unexpected error occurred",
+            error=str(error),
+            failure_reason="unexpected"
+        )
+
+    with ExitStack() as stack:
+        if scraper_factory is None:
+            scraper_factory = stack.enter_context(shared_scrapers(
+                concurrency, headless, backend, rate_limiter or HostRateLimiter(), cache, refresh,
+                court, captcha, resilience
+            ))
+        yield from _run_workers(cnrs, lookup, failed, concurrency, scraper_factory)
+
+
+def list_orders_many(cnrs: Iterable[str],
+                     concurrency: int = BATCH_CONCURRENCY,
+                     headless: bool = True,
+                     backend: str = DEFAULT_BACKEND,
+                     rate_limiter: Optional[HostRateLimiter] = None,
+                     cache: Optional[ResponseCache] = None,
+                     captcha: Optional[CaptchaQueue] = None,
+                     resilience: Optional[Resilience] = None,
+                     scraper_factory: Optional[Callable[[], ECourtsScraper]] = None
+                     ) -> Iterator[Tuple[str, List[CaseOrder], Optional[RequestsCookieJar]]]:
+    """
+    Yields (cnr, orders, cookies) with the order PDF links of each case, read
+    from the cache where the case page is already there, and a copy of the
+    portal session cookies of the scraper that listed them (None without an
+    HTTP session) for the downloads. Cases whose page cannot be fetched yield
+    an empty list.
+    """
+    logger = setup_logger()
+
+    def list_orders(scraper: ECourtsScraper, cnr: str) -> Tuple[List[CaseOrder], Optional[RequestsCookieJar]]:
+        orders = scraper.fetch_case_orders(cnr)
+        cookies = scraper.order_cookies()
+        return orders, cookies.copy() if cookies is not None else None
+
+    def failed(cnr: str, error: Exception) -> Tuple[List[CaseOrder], Optional[RequestsCookieJar]]:
+        logger.error(f"Could not list orders for {cnr}: {error}")
+        return [], None
+
+    with ExitStack() as stack:
+        if scraper_factory is None:
+            scraper_factory = stack.enter_context(shared_scrapers(
+                concurrency, headless, backend, rate_limiter or HostRateLimiter(), cache, False,
+                None, captcha, resilience
+            ))
+        for cnr, (orders, cookies) in _run_workers(cnrs, list_orders, failed, concurrency, scraper_factory):
+            yield cnr, orders, cookies
+
+
+def crawl_cause_lists(courts: Iterable[Optional[CourtSelector]],
+                      dates: Iterable[str],
+                      concurrency: int = BATCH_CONCURRENCY,
+                      headless: bool = True,
+                      backend: str = DEFAULT_BACKEND,
+                      rate_limiter: Optional[HostRateLimiter] = None,
+                      captcha: Optional[CaptchaQueue] = None,
+                      resilience: Optional[Resilience] = None,
+                      scraper_factory: Optional[Callable[[], ECourtsScraper]] = None,
+                      metrics: Optional[MetricsRegistry] = None
+                      ) -> Iterator[Tuple[Optional[CourtSelector], str, Optional[CauseList]]]:
+    """
+    Yields (court, date, cause_list) for every court and date as pages arrive,
+    with None for pages that could not be fetched. Fetches fan out over the
+    same kind of worker pool as search_many under one per-host rate limiter.
+    Each distinct page is parsed once: courts that get an identical page on the
+    same date (a complex-wide list, or the same "no sitting" notice) get their
+    own list of its listings, and other dates get copies dated for that day.
+    """
+    metrics = metrics or REGISTRY
+    logger = setup_logger()
+    jobs = list(dict.fromkeys((court, date) for court in courts for date in dates))
+    parsed: Dict[str, CauseList] = {}
+    dated: Dict[Tuple[str, str], CauseList] = {}
+
+    def fetch(scraper: ECourtsScraper, job: Tuple[Optional[CourtSelector], str]) -> str:
+        court, date = job
+        return scraper.fetch_cause_list_page(date, court)
+
+    def failed(job: Tuple[Optional[CourtSelector], str], error: Exception) -> None:
+        court, date = job
+        logger.error(f"Could not fetch cause list for {court.key if court else 'all courts'} on {date}: {error}")
+        metrics.inc("ecourts_cause_list_downloads_total", outcome="error")
+        return None
+
+    with ExitStack() as stack:
+        if scraper_factory is None:
+            scraper_factory = stack.enter_context(shared_scrapers(
+                concurrency, headless, backend, rate_limiter or HostRateLimiter(), None, False,
+                None, captcha, resilience
+            ))
+        for (court, date), page_source in _run_workers(jobs, fetch, failed, concurrency, scraper_factory):
+            if page_source is None:
+                yield court, date, None
+                continue
+            court_key = court.key if court else None
+            digest = page_digest(page_source)
+            first = dated.get((digest, date))
+            if first is None and digest in parsed:
+                # Same page on another date: the listings carry their own listing_date, so they are copied
+                first = dated[(digest, date)] = CauseList(
+                    date=date, court_complex=court_key, total_cases=parsed[digest].total_cases,
+                    listings=[replace(listing, listing_date=date) for listing in parsed[digest].listings])
+            if first is None:
+                parsed[digest] = dated[(digest, date)] = cause_list = parse_cause_list(page_source, date, court_key)
+                metrics.inc("ecourts_cause_list_pages_total", result="unique")
+            else:
+                cause_list = CauseList(date=date, court_complex=court_key,
+                                       total_cases=first.total_cases, listings=list(first.listings))
+                metrics.inc("ecourts_cause_list_pages_total", result="duplicate")
+            metrics.inc("ecourts_cause_list_downloads_total", outcome="success")
+            yield court, date, cause_list
@@ -0,0 +1,253 @@
+"""
+Warm browser pool for the eCourts scraper
+Keeps Chrome drivers alive between lookups so each search skips the browser cold start
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+
+from config import (
+    CASE_STATUS_URL,
+    IMPLICIT_WAIT,
+    WINDOW_SIZE,
+    USER_AGENT,
+    DISABLE_IMAGES,
+    BROWSER_POOL_SIZE,
+    BROWSER_MAX_USES,
+    BROWSER_LEASE_TIMEOUT,
+    CHROMEDRIVER_PATH,
+    DRIVER_CACHE_FILE,
+    DRIVER_CACHE_TTL,
+)
+from utils import setup_logger
+
+
+_driver_path_lock = threading.Lock()
+_driver_path: Optional[str] = None
+
+
+def _read_cached_driver_path(cache_file: str, max_age: float) -> Optional[str]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    path = cached.get("path")
+    if not path or not os.path.exists(path) or time.time() - cached.get("resolved_at", 0) > max_age:
+        return None
+    return path
+
+
+def _write_cached_driver_path(cache_file: str, path: str):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_path = f"{cache_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"path": path, "resolved_at": time.time()}, f)
+    os.replace(tmp_path, cache_file)
+
+
+def resolve_driver_path(refresh: bool = False, cache_file: str = DRIVER_CACHE_FILE,
+                        max_age: float = DRIVER_CACHE_TTL) -> str:
+    """
+    Path of the chromedriver binary
+    CHROMEDRIVER_PATH wins when set. Otherwise the path webdriver_manager found
+    on an earlier run is reused until the binary disappears or the entry is
+    older than max_age, so the version check does not run on every launch.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if CHROMEDRIVER_PATH:
+            return CHROMEDRIVER_PATH
+        if not refresh and _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+        path = None if refresh else _read_cached_driver_path(cache_file, max_age)
+        if path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            _write_cached_driver_path(cache_file, path)
+        _driver_path = path
+        return path
+
+
+def create_driver(headless: bool = True):
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--window-size={WINDOW_SIZE}")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+    if DISABLE_IMAGES:
+        prefs = {"profile.managed_default_content_settings.images": 2}
+        chrome_options.add_experimental_option("prefs", prefs)
+
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=chrome_options)
+    except SessionNotCreatedException:
+        if CHROMEDRIVER_PATH:
+            raise
+        # Chrome was updated past the cached driver: resolve a matching one
+        driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=chrome_options)
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    return driver
+
+
+class BrowserPool:
+    """
+    Pool of pre-launched Chrome drivers handed out through lease()
+    Drivers are recycled after max_uses leases or when they crash, and their
+    cookies and storage are cleared before they go back into the pool. A lease
+    waits for an idle driver or a free slot, whichever comes first, and gives
+    up with TimeoutError after lease_timeout seconds.
+    """
+    def __init__(self,
+                 size: int = BROWSER_POOL_SIZE,
+                 max_uses: int = BROWSER_MAX_USES,
+                 headless: bool = True,
+                 warm_url: Optional[str] = CASE_STATUS_URL,
+                 prelaunch: bool = False,
+                 lease_timeout: float = BROWSER_LEASE_TIMEOUT):
+        self.logger = setup_logger()
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.headless = headless
+        self.warm_url = warm_url
+        self.lease_timeout = lease_timeout
+        # Idle drivers (most recently used last), lease counts by driver and the number of live drivers,
+        # all guarded by _available
+        self._idle: List = []
+        self._uses: Dict[int, int] = {}
+        self._created = 0
+        self._available = threading.Condition()
+        self._closed = False
+        if prelaunch:
+            self.start()
+
+    def start(self):
+        while True:
+            with self._available:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            self._put_idle(self._launch())
+
+    def _launch(self):
+        try:
+            driver = create_driver(self.headless)
+            if self.warm_url:
+                driver.get(self.warm_url)
+        except Exception as e:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            self.logger.error(f"Failed to initialize browser: {e}")
+            raise
+        with self._available:
+            self._uses[id(driver)] = 0
+        self.logger.info("✓ Browser initialized")
+        return driver
+
+    def _acquire(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser became free within {timeout:.0f}s")
+                self._available.wait(remaining)
+        return self._launch()
+
+    def _put_idle(self, driver):
+        with self._available:
+            if not self._closed:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+        self._discard(driver)
+
+    def _release(self, driver, healthy: bool):
+        with self._available:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            retire = self._closed or not healthy or uses >= self.max_uses
+        if retire:
+            self._discard(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            self.logger.warning(f"Browser reset failed ({e}) - recycling it")
+            self._discard(driver)
+            return
+        self._put_idle(driver)
+
+    def _reset(self, driver):
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get(self.warm_url or "about:blank")
+
+    def _discard(self, driver):
+        # A slot is free again: wake a lease waiting for one so it launches a replacement
+        with self._available:
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        driver = self._acquire(self.lease_timeout if timeout is None else timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self._is_alive(driver)
+            raise
+        finally:
+            self._release(driver, healthy)
+
+    def close(self):
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for driver in idle:
+            self._discard(driver)
+        self.logger.info("✓ Browser pool closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,140 @@
+"""
+On-disk response cache for the eCourts scraper
+Stores raw portal pages and parsed results under hashed keys with TTLs and LRU size eviction
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from config import (
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
+    CACHE_TTL_VOLATILE,
+    CACHE_TTLS,
+    VOLATILE_CASE_FIELDS,
+)
+from models import CaseDetails
+
+CASE_STATUS_KIND = "case_status"
+# TTL key for the filing and registration fields of a case status entry
+CASE_STATUS_STABLE_TTL = "case_status_stable"
+
+
+def case_key(cnr: Optional[str] = None,
+             case_type: Optional[str] = None,
+             case_number: Optional[str] = None,
+             case_year: Optional[str] = None) -> str:
+    if cnr:
+        return f"cnr:{cnr.strip().replace(' ', '').upper()}"
+    return f"case:{(case_type or '').strip().upper()}/{(case_number or '').strip()}/{(case_year or '').strip()}"
+
+
+class ResponseCache:
+    """
+    File-per-entry cache keyed by sha256(kind:key)
+    Reads refresh an entry's mtime, and the least recently used entries are
+    evicted once the cache grows past max_bytes.
+    """
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = dict(CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind: str, key: str) -> str:
+        digest = hashlib.sha256(f"{kind}:{key}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def _read(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(kind, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def get(self, kind: str, key: str, ttl: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        entry = self._read(kind, key)
+        if entry is None:
+            return None
+        ttl = ttl if ttl is not None else self.ttls.get(kind, CACHE_TTL_VOLATILE)
+        if time.time() - entry["stored_at"] > ttl:
+            return None
+        return entry
+
+    def put(self, kind: str, key: str, html: Optional[str] = None, parsed: Optional[Dict[str, Any]] = None):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"kind": kind, "key": key, "stored_at": time.time(), "html": html, "parsed": parsed}
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def get_case_details(self, key: str, stable_only: bool = False) -> Optional[CaseDetails]:
+        volatile_ttl = self.ttls[CASE_STATUS_KIND]
+        ttl = max(volatile_ttl, self.ttls[CASE_STATUS_STABLE_TTL]) if stable_only else volatile_ttl
+        entry = self.get(CASE_STATUS_KIND, key, ttl=ttl)
+        if entry is None or not entry.get("parsed"):
+            return None
+        case = CaseDetails.from_dict(entry["parsed"])
+        if stable_only and time.time() - entry["stored_at"] > volatile_ttl:
+            for field_name in VOLATILE_CASE_FIELDS:
+                setattr(case, field_name, None)
+        return case
+
+    def put_case_details(self, key: str, case_details: CaseDetails, html: Optional[str] = None):
+        self.put(CASE_STATUS_KIND, key, html=html, parsed=case_details.to_dict())
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_mtime, stat.st_size
+
+    def _scan_size(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _evict(self):
+        target = int(self.max_bytes * 0.9)
+        for path, _, size in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
@@ -0,0 +1,199 @@
+"""
+CAPTCHA handling for the eCourts scraper
+Captured CAPTCHA images go to a solver queue so a lookup waiting on an answer does not stall the others
+"""
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from io import BytesIO
+from typing import Dict, Optional, Type
+
+from config import (
+    CAPTCHA_DIR,
+    CAPTCHA_SOLVER,
+    CAPTCHA_WORKERS,
+    CAPTCHA_TIMEOUT,
+    CAPTCHA_POLL_INTERVAL,
+)
+from utils import setup_logger
+
+
+class CaptchaRequiredError(Exception):
+    """
+    A form could not be submitted: the solver gave no answer, or the portal kept rejecting them
+    """
+
+
+class CaptchaSolver:
+    """
+    Turns a CAPTCHA image into its text, or None when it cannot be solved
+    Solvers may block; CaptchaQueue runs them on worker threads.
+    """
+    name = "base"
+
+    def solve(self, image: bytes) -> Optional[str]:
+        raise NotImplementedError
+
+
+class StubSolver(CaptchaSolver):
+    """
+    Returns a fixed answer; for tests and stub portals that accept any CAPTCHA
+    """
+    name = "stub"
+
+    def __init__(self, answer: str = "stub"):
+        self.answer = answer
+
+    def solve(self, image: bytes) -> Optional[str]:
+        return self.answer
+
+
+class ManualSolver(CaptchaSolver):
+    """
+    Saves the image to disk and asks for the text on the console, one prompt at a time
+    """
+    name = "manual"
+    _prompt_lock = threading.Lock()
+
+    def __init__(self, directory: str = CAPTCHA_DIR):
+        self.directory = directory
+        self.logger = setup_logger()
+
+    def solve(self, image: bytes) -> Optional[str]:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.png")
+        with open(path, 'wb') as f:
+            f.write(image)
+        try:
+            with self._prompt_lock:
+                self.logger.warning(f"⚠ CAPTCHA saved to {path}")
+                answer = input("Enter the CAPTCHA text: ").strip()
+        finally:
+            os.remove(path)
+        return answer or None
+
+
+class OcrSolver(CaptchaSolver):
+    """
+    Reads the CAPTCHA with Tesseract (needs the pytesseract and Pillow packages)
+    """
+    name = "ocr"
+
+    def __init__(self, min_length: int = 4):
+        try:
+            import pytesseract
+            from PIL import Image
+        except ImportError:
+            raise RuntimeError("The OCR CAPTCHA solver requires 'pytesseract' and 'Pillow' (pip install pytesseract Pillow)")
+        self._pytesseract = pytesseract
+        self._image = Image
+        self.min_length = min_length
+
+    def solve(self, image: bytes) -> Optional[str]:
+        text = self._pytesseract.image_to_string(self._image.open(BytesIO(image)), config="--psm 7")
+        text = re.sub(r'[^A-Za-z0-9]', '', text)
+        return text if len(text) >= self.min_length else None
+
+
+class FileQueueSolver(CaptchaSolver):
+    """
+    Human-operator queue on a shared directory
+    Each CAPTCHA is written as <id>.png; an operator (or another tool) answers it
+    by writing <id>.txt next to it. Unanswered CAPTCHAs are withdrawn after timeout.
+    """
+    name = "operator"
+
+    def __init__(self, directory: str = CAPTCHA_DIR, timeout: float = CAPTCHA_TIMEOUT,
+                 poll_interval: float = CAPTCHA_POLL_INTERVAL):
+        self.directory = directory
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.logger = setup_logger()
+
+    def solve(self, image: bytes) -> Optional[str]:
+        os.makedirs(self.directory, exist_ok=True)
+        challenge_id = uuid.uuid4().hex
+        image_path = os.path.join(self.directory, f"{challenge_id}.png")
+        answer_path = os.path.join(self.directory, f"{challenge_id}.txt")
+        tmp_path = f"{image_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(image)
+        os.replace(tmp_path, image_path)
+        self.logger.info(f"CAPTCHA {challenge_id} queued for an operator in {self.directory}")
+        deadline = time.monotonic() + self.timeout
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    with open(answer_path, 'r', encoding='utf-8') as f:
+                        answer = f.read().strip()
+                except FileNotFoundError:
+                    time.sleep(self.poll_interval)
+                    continue
+                return answer or None
+            self.logger.warning(f"⚠ CAPTCHA {challenge_id} was not answered within {self.timeout}s")
+            return None
+        finally:
+            for path in (image_path, answer_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+CAPTCHA_SOLVERS: Dict[str, Type[CaptchaSolver]] = {
+    solver.name: solver for solver in (ManualSolver, OcrSolver, FileQueueSolver, StubSolver)
+}
+
+
+def create_solver(name: str = CAPTCHA_SOLVER) -> CaptchaSolver:
+    if name not in CAPTCHA_SOLVERS:
+        raise ValueError(f"Unknown CAPTCHA solver '{name}' (choose from {', '.join(CAPTCHA_SOLVERS)})")
+    return CAPTCHA_SOLVERS[name]()
+
+
+class CaptchaQueue:
+    """
+    Runs a solver on its own worker threads
+    submit() returns a Future right away, so async callers can await it with
+    asyncio.wrap_future() and threaded callers only block the lookup that needs
+    the answer. solve() is the blocking shortcut and gives None on timeout.
+    """
+    def __init__(self, solver: Optional[CaptchaSolver] = None,
+                 workers: int = CAPTCHA_WORKERS, timeout: float = CAPTCHA_TIMEOUT):
+        self.logger = setup_logger()
+        self.solver = solver or create_solver()
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="captcha")
+        self._lock = threading.Lock()
+        self.solved = 0
+        self.failed = 0
+
+    def submit(self, image: bytes) -> Future:
+        future = self._executor.submit(self.solver.solve, image)
+        future.add_done_callback(self._record)
+        return future
+
+    def _record(self, future: Future):
+        ok = not future.cancelled() and future.exception() is None and future.result()
+        with self._lock:
+            if ok:
+                self.solved += 1
+            else:
+                self.failed += 1
+
+    def solve(self, image: bytes, timeout: Optional[float] = None) -> Optional[str]:
+        future = self.submit(image)
+        try:
+            return future.result(timeout=timeout if timeout is not None else self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.logger.warning("⚠ CAPTCHA solver timed out")
+        except Exception as e:
+            self.logger.error(f"CAPTCHA solver failed: {e}")
+        return None
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
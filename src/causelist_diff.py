@@ -0,0 +1,214 @@
+"""
+Cause list diffing
+Compares two days' cause lists case by case and emits a compact feed of added, removed and changed listings
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config import LISTING_DIFF_FIELDS
+from causelist_index import case_details_key
+from models import CaseListing, CauseList, ListingChange
+from utils import parse_portal_date
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+def listing_key(listing: CaseListing) -> Optional[str]:
+    """
+    Identity of the case behind a listing: its CNR, else the normalized type/number/year
+    """
+    details = listing.case_details
+    if details is None:
+        return None
+    if details.cnr:
+        return details.cnr.strip().upper()
+    return case_details_key(details)
+
+
+def _values(listing: CaseListing, fields: Sequence[str]) -> Tuple:
+    return tuple(getattr(listing, name) for name in fields)
+
+
+# (court_complex, old_date, new_date) of the two lists being compared
+Span = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def _change(key: str, kind: str, listing: CaseListing, span: Span,
+            changes: Dict[str, List[Any]]) -> ListingChange:
+    details = listing.case_details
+    case_number = "/".join(part for part in (details.case_type, details.case_number, details.case_year) if part)
+    return ListingChange(key=key, kind=kind, cnr=details.cnr, case_number=case_number or None,
+                         court_complex=span[0], old_date=span[1], new_date=span[2], changes=changes)
+
+
+def _compare(key: str, old_listing: CaseListing, new_listing: CaseListing, span: Span,
+             fields: Sequence[str]) -> Optional[ListingChange]:
+    old_values, new_values = _values(old_listing, fields), _values(new_listing, fields)
+    if old_values == new_values:
+        return None
+    changes = {name: [before, after] for name, before, after in zip(fields, old_values, new_values)
+               if before != after}
+    return _change(key, CHANGED, new_listing, span, changes)
+
+
+def _added(key: str, listing: CaseListing, span: Span, fields: Sequence[str]) -> ListingChange:
+    return _change(key, ADDED, listing, span,
+                   {name: [None, value] for name, value in zip(fields, _values(listing, fields))
+                    if value is not None})
+
+
+def _removed(key: str, listing: CaseListing, span: Span, fields: Sequence[str]) -> ListingChange:
+    return _change(key, REMOVED, listing, span,
+                   {name: [value, None] for name, value in zip(fields, _values(listing, fields))
+                    if value is not None})
+
+
+def keyed_listings(listings: Iterable[CaseListing]) -> Dict[str, CaseListing]:
+    """
+    Listings by case identity; listings without one are dropped and a case listed twice keeps its first row
+    """
+    keyed = {}
+    for listing in listings:
+        key = listing_key(listing)
+        if key is not None and key not in keyed:
+            keyed[key] = listing
+    return keyed
+
+
+def diff_listings(old: Iterable[CaseListing], new: Iterable[CaseListing],
+                  old_date: Optional[str] = None, new_date: Optional[str] = None,
+                  court_complex: Optional[str] = None,
+                  fields: Sequence[str] = LISTING_DIFF_FIELDS) -> Iterator[ListingChange]:
+    """
+    Yields the changes from old to new in one pass over each side
+    Only old's listings are held in memory, as a dict keyed by case; new is
+    consumed as a stream (keeping just its keys) and its changes are yielded
+    as they are found, removals last.
+    old may also be a dict from keyed_listings().
+    """
+    remaining = dict(old) if isinstance(old, dict) else keyed_listings(old)
+    span = (court_complex, old_date, new_date)
+    seen = set()
+    for listing in new:
+        key = listing_key(listing)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        previous = remaining.pop(key, None)
+        if previous is None:
+            yield _added(key, listing, span, fields)
+            continue
+        change = _compare(key, previous, listing, span, fields)
+        if change is not None:
+            yield change
+    for key, listing in remaining.items():
+        yield _removed(key, listing, span, fields)
+
+
+def diff_sorted_listings(old: Iterable[CaseListing], new: Iterable[CaseListing],
+                         old_date: Optional[str] = None, new_date: Optional[str] = None,
+                         court_complex: Optional[str] = None,
+                         fields: Sequence[str] = LISTING_DIFF_FIELDS) -> Iterator[ListingChange]:
+    """
+    Merge diff of two listing streams already ordered by listing_key()
+    Neither side is held in memory, so lists read row by row from a store or
+    file can be compared whatever their size.
+    """
+    span = (court_complex, old_date, new_date)
+
+    def keyed(listings: Iterable[CaseListing]) -> Iterator[Tuple[str, CaseListing]]:
+        last = None
+        for listing in listings:
+            key = listing_key(listing)
+            if key is None or key == last:
+                continue
+            if last is not None and key < last:
+                raise ValueError(f"Listings are not sorted by case: {key} after {last}")
+            last = key
+            yield key, listing
+
+    old_iter, new_iter = keyed(old), keyed(new)
+    old_item, new_item = next(old_iter, None), next(new_iter, None)
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item[0] < new_item[0]):
+            yield _removed(old_item[0], old_item[1], span, fields)
+            old_item = next(old_iter, None)
+        elif old_item is None or new_item[0] < old_item[0]:
+            yield _added(new_item[0], new_item[1], span, fields)
+            new_item = next(new_iter, None)
+        else:
+            change = _compare(new_item[0], old_item[1], new_item[1], span, fields)
+            if change is not None:
+                yield change
+            old_item, new_item = next(old_iter, None), next(new_iter, None)
+
+
+def diff_cause_lists(old: CauseList, new: CauseList,
+                     fields: Sequence[str] = LISTING_DIFF_FIELDS) -> List[ListingChange]:
+    return list(diff_listings(old.listings, new.listings, old.date, new.date,
+                              new.court_complex or old.court_complex, fields))
+
+
+class ConsecutiveDiffer:
+    """
+    Diffs each court's cause list against the same court's previous one
+    Feed lists in date order per court with add(); only the keyed listings of
+    the latest day are kept for each court, so a daily run over thousands of
+    courts holds one day per court in memory. When the expected dates are
+    given, arrive() takes lists in any order, as a crawl delivers them, and
+    holds early ones back until the days before them are in.
+    """
+    def __init__(self, fields: Sequence[str] = LISTING_DIFF_FIELDS, dates: Sequence[str] = ()):
+        self.fields = fields
+        self.dates = list(dates)
+        self._latest: Dict[Optional[str], Tuple[str, Dict[str, CaseListing]]] = {}
+        self._waiting: Dict[Optional[str], Dict[str, Optional[CauseList]]] = {}
+        self._next: Dict[Optional[str], int] = {}
+
+    def add(self, cause_list: CauseList) -> List[ListingChange]:
+        """
+        Records cause_list and returns its changes since the court's previous list (none for the first)
+        """
+        court = cause_list.court_complex
+        keyed = keyed_listings(cause_list.listings)
+        previous = self._latest.get(court)
+        if previous is not None:
+            previous_day, day = parse_portal_date(previous[0]), parse_portal_date(cause_list.date)
+            if previous_day and day and day <= previous_day:
+                raise ValueError(f"Cause list for {court or 'all courts'} on {cause_list.date} "
+                                 f"arrived after {previous[0]}")
+        self._latest[court] = (cause_list.date, keyed)
+        if previous is None:
+            return []
+        return list(diff_listings(previous[1], keyed.values(), previous[0], cause_list.date,
+                                  court, self.fields))
+
+    def arrive(self, court: Optional[str], date: str,
+               cause_list: Optional[CauseList]) -> Iterator[Tuple[CauseList, List[ListingChange]]]:
+        """
+        Yields (cause_list, changes) for each of court's lists that can now be diffed in date order;
+        pass None for a date whose list could not be fetched so later dates are not held back
+        """
+        waiting = self._waiting.setdefault(court, {})
+        waiting[date] = cause_list
+        position = self._next.get(court, 0)
+        while position < len(self.dates) and self.dates[position] in waiting:
+            ready = waiting.pop(self.dates[position])
+            position += 1
+            self._next[court] = position
+            if ready is not None:
+                yield ready, self.add(ready)
+
+
+def summarize(changes: Iterable[ListingChange]) -> Dict[str, int]:
+    """
+    Counts of added, removed and changed listings, and of changes to each compared field
+    """
+    counts = {ADDED: 0, REMOVED: 0, CHANGED: 0}
+    for change in changes:
+        counts[change.kind] += 1
+        if change.kind == CHANGED:
+            for name in change.changes:
+                counts[name] = counts.get(name, 0) + 1
+    return counts
@@ -0,0 +1,169 @@
+"""
+Cause list index for fast listing checks
+Looks up cases in a day's cause list by CNR or normalized case number instead of re-fetching it
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from config import INDEX_DIR, CACHE_TTLS
+from models import CaseDetails, CaseListing, CauseList
+from utils import sanitize_filename
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]")
+_DIGITS = re.compile(r"\d+")
+_YEAR = re.compile(r"\b(\d{4})\b")
+
+
+def normalize_case_key(case_type: Optional[str],
+                       case_number: Optional[str],
+                       case_year: Optional[str]) -> Optional[str]:
+    if not case_type or not case_number:
+        return None
+    number_match = _DIGITS.search(case_number)
+    if not number_match:
+        return None
+    year = case_year
+    if not year:
+        year_match = _YEAR.search(case_number[number_match.end():])
+        year = year_match.group(1) if year_match else None
+    if not year:
+        return None
+    normalized_type = _NON_ALNUM.sub("", case_type.split(" - ")[0].upper())
+    return f"{normalized_type}/{int(number_match.group(0))}/{year.strip()}"
+
+
+def case_details_key(case_details: CaseDetails) -> Optional[str]:
+    return normalize_case_key(case_details.case_type, case_details.case_number, case_details.case_year)
+
+
+class CauseListIndex:
+    """
+    In-memory index of one cause list on CNR and on normalized (type, number, year)
+    """
+    def __init__(self, cause_list: CauseList):
+        self.cause_list = cause_list
+        self.by_cnr: Dict[str, int] = {}
+        self.by_case: Dict[str, int] = {}
+        for position, listing in enumerate(cause_list.listings):
+            self._add(position, listing)
+
+    def _add(self, position: int, listing: CaseListing):
+        details = listing.case_details
+        if details is None:
+            return
+        if details.cnr:
+            self.by_cnr.setdefault(details.cnr.upper(), position)
+        key = case_details_key(details)
+        if key:
+            self.by_case.setdefault(key, position)
+
+    def lookup(self, case_details: CaseDetails) -> Optional[CaseListing]:
+        position = None
+        if case_details.cnr:
+            position = self.by_cnr.get(case_details.cnr.upper())
+        if position is None:
+            key = case_details_key(case_details)
+            if key:
+                position = self.by_case.get(key)
+        return self.cause_list.listings[position] if position is not None else None
+
+    def to_dict(self):
+        return {
+            "cause_list": self.cause_list.to_dict(),
+            "by_cnr": self.by_cnr,
+            "by_case": self.by_case,
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CauseListIndex":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        index = cls.__new__(cls)
+        index.cause_list = CauseList.from_dict(data["cause_list"])
+        index.by_cnr = data["by_cnr"]
+        index.by_case = data["by_case"]
+        return index
+
+
+class CauseListIndexRegistry:
+    """
+    Shares cause list indexes across lookups and threads
+    Each (court, date) list is fetched at most once per max_age, then served
+    from memory or from its persisted copy under INDEX_DIR. Entries older than
+    max_age are rebuilt, and a failed fetch is not cached, so the next lookup
+    against that list tries again.
+    """
+    def __init__(self, directory: Optional[str] = INDEX_DIR, max_age: int = CACHE_TTLS["cause_list"]):
+        self.directory = directory
+        self.max_age = max_age
+        # (built_at, index) by (court, date); built_at is a time.time() stamp, like a persisted copy's mtime
+        self._indexes: Dict[Tuple[str, str], Tuple[float, CauseListIndex]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, court_key: str, date: str) -> str:
+        return os.path.join(self.directory, sanitize_filename(f"causelist_{court_key}_{date}.json"))
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[CauseListIndex]:
+        entry = self._indexes.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.max_age:
+            del self._indexes[key]
+            self._locks.pop(key, None)
+            return None
+        return entry[1]
+
+    def get(self, court_key: str, date: str,
+            loader: Callable[[], Optional[CauseList]]) -> Optional[CauseListIndex]:
+        key = (court_key, date)
+        with self._lock:
+            index = self._cached(key)
+            if index is not None:
+                return index
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                index = self._cached(key)
+            if index is not None:
+                return index
+            try:
+                entry = self._load_persisted(court_key, date)
+                if entry is None:
+                    cause_list = loader()
+                    if cause_list is None:
+                        return None
+                    entry = (time.time(), CauseListIndex(cause_list))
+                    if self.directory:
+                        entry[1].save(self._path(court_key, date))
+                with self._lock:
+                    self._indexes[key] = entry
+                return entry[1]
+            finally:
+                # Once loaded, lookups are served from _indexes; threads already waiting keep their reference
+                with self._lock:
+                    if self._locks.get(key) is key_lock:
+                        del self._locks[key]
+
+    def _load_persisted(self, court_key: str, date: str) -> Optional[Tuple[float, CauseListIndex]]:
+        if not self.directory:
+            return None
+        path = self._path(court_key, date)
+        try:
+            built_at = os.path.getmtime(path)
+            if time.time() - built_at > self.max_age:
+                return None
+            return built_at, CauseListIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
@@ -18,8 +18,56 @@ IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 15
 REQUEST_TIMEOUT = 30
 REQUEST_DELAY = 2
+POLITENESS_MIN_DELAY = 0.2
+POLITENESS_LATENCY_FACTOR = 1.0
+POLITENESS_SMOOTHING = 0.3
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
+# ===========================
+# TRANSPORT SETTINGS
+# ===========================
+BACKEND_HTTP = "http"
+BACKEND_SELENIUM = "selenium"
+DEFAULT_BACKEND = BACKEND_HTTP
+SEARCH_TYPE_FIELD = "search_type"
+CNR_FORM_FIELD = "cnr_number"
+CAUSE_LIST_DATE_FIELD = "causelist_date"
+STATE_FORM_FIELD = "state_code"
+DISTRICT_FORM_FIELD = "dist_code"
+COMPLEX_FORM_FIELD = "court_complex_code"
+COURT_FORM_FIELD = "court_no"
+# Text of the portal's JavaScript interstitial; a re-rendered search form (with its CAPTCHA) is not one
+JS_REQUIRED_MARKERS = ["enable javascript"]
+CASE_DETAILS_CONTAINER_IDS = ["history_cnr", "caseHistoryDiv"]
+CAUSE_LIST_CONTAINER_IDS = ["res_cause_list", "dispTable"]
+SESSION_MAX_AGE = 20 * 60
+SESSION_EXPIRED_STATUS = [401, 403, 419, 440]
+SESSION_EXPIRED_MARKERS = ["session expired", "session has expired", "invalid token", "invalid request"]
+
+# ===========================
+# BATCH SETTINGS
+# ===========================
+BATCH_CONCURRENCY = 4
+HOST_MIN_INTERVAL = 0.25
+CRAWL_MAX_DAYS = 31
+ASYNC_MAX_CONNECTIONS = 100
+ASYNC_PER_HOST_LIMIT = 20
+
+# ===========================
+# RETRY SETTINGS
+# ===========================
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_BUDGETS = {
+    "timeout": 2,
+    "no_connection": 3,
+    "server_error": 2,
+    "rate_limited": 3,
+    "element_missing": 1,
+}
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 60
+
 # ===========================
 # FILE PATHS
 # ===========================
@@ -29,9 +77,66 @@ DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 JSON_DIR = os.path.join(DATA_DIR, "json")
 PDF_DIR = os.path.join(DATA_DIR, "pdf")
 LOG_DIR = os.path.join(DATA_DIR, "logs")
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+INDEX_DIR = os.path.join(DATA_DIR, "index")
+CAPTCHA_DIR = os.path.join(DATA_DIR, "captcha")
+WATCH_DIR = os.path.join(DATA_DIR, "watch")
+QUEUE_DIR = os.path.join(DATA_DIR, "queue")
+JOURNAL_DIR = os.path.join(DATA_DIR, "journal")
+
+# ===========================
+# CACHE SETTINGS
+# ===========================
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+CACHE_TTL_VOLATILE = 15 * 60
+CACHE_TTL_STABLE = 30 * 24 * 60 * 60
+VOLATILE_CASE_FIELDS = ["status", "next_hearing_date", "court_name", "court_number", "judge_name"]
+CACHE_TTLS = {
+    "case_status": CACHE_TTL_VOLATILE,
+    # How long filing and registration details stay usable when a refetch fails
+    "case_status_stable": CACHE_TTL_STABLE,
+    "cause_list": 6 * 60 * 60,
+}
 
-for directory in [DATA_DIR, JSON_DIR, PDF_DIR, LOG_DIR]:
-    os.makedirs(directory, exist_ok=True)
+# ===========================
+# PDF DOWNLOAD SETTINGS
+# ===========================
+PDF_CONCURRENCY = 4
+PDF_CHUNK_SIZE = 64 * 1024
+ORDER_LINK_MARKERS = [".pdf", "display_pdf", "displaypdf"]
+
+# ===========================
+# CAUSE LIST DIFF SETTINGS
+# ===========================
+# Listing fields compared between two days' cause lists
+LISTING_DIFF_FIELDS = ["court_number", "court_name", "judge_name", "serial_number", "purpose"]
+
+# ===========================
+# SHARD SETTINGS
+# ===========================
+SHARD_THREADS = 1
+# Failures worth another try when a sweep is resumed; other outcomes are final
+SHARD_RETRY_REASONS = ["timeout", "no_connection", "server_error", "rate_limited", "circuit_open", "captcha_required",
+                       "unexpected"]
+# Shard processes have no console, so their CAPTCHAs go to the operator file queue unless another solver is chosen
+SHARD_CAPTCHA_SOLVER = "operator"
+
+# ===========================
+# SERVICE SETTINGS
+# ===========================
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8787
+SERVICE_LOOKUP_TIMEOUT = 300
+SERVICE_MAX_BATCH = 100
+QUEUE_POLL_INTERVAL = 1.0
+
+# ===========================
+# WATCH SETTINGS
+# ===========================
+WATCH_STATE_FILE = os.path.join(WATCH_DIR, "state.json")
+WATCH_MAX_INTERVAL_DAYS = 7
+WATCH_DISPOSED_INTERVAL_DAYS = 30
+WATCH_DISPOSED_MARKERS = ["disposed", "decided", "closed"]
 
 # ===========================
 # SEARCH TYPES
@@ -47,6 +152,7 @@ SEARCH_BY_FIR = "fir"
 ECOURTS_DATE_FORMAT = "%d-%m-%Y"
 INTERNAL_DATE_FORMAT = "%Y-%m-%d"
 DISPLAY_DATE_FORMAT = "%d %B %Y"
+PORTAL_DATE_FORMATS = [ECOURTS_DATE_FORMAT, INTERNAL_DATE_FORMAT, "%d/%m/%Y", "%d.%m.%Y", DISPLAY_DATE_FORMAT, "%d %b %Y"]
 
 # ===========================
 # LOGGING SETTINGS
@@ -60,6 +166,18 @@ LOG_FILE = os.path.join(LOG_DIR, "ecourts_scraper.log")
 # ===========================
 DEFAULT_OUTPUT_FORMAT = "json"
 JSON_INDENT = 4
+JSONL_COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+STORE_JSON = "json"
+STORE_SQLITE = "sqlite"
+DEFAULT_STORE = STORE_JSON
+STORE_DB_FILE = os.path.join(DATA_DIR, "ecourts.db")
+STORE_BATCH_SIZE = 500
+
+# ===========================
+# METRICS SETTINGS
+# ===========================
+METRICS_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120]
+METRICS_FLUSH_INTERVAL = 15
 
 # ===========================
 # BROWSER SETTINGS
@@ -67,6 +185,25 @@ JSON_INDENT = 4
 HEADLESS_MODE = True
 WINDOW_SIZE = "1920,1080"
 DISABLE_IMAGES = True
+BROWSER_POOL_SIZE = 2
+BROWSER_MAX_USES = 50
+BROWSER_LEASE_TIMEOUT = 120
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+DRIVER_CACHE_FILE = os.path.join(DATA_DIR, "chromedriver.json")
+DRIVER_CACHE_TTL = 7 * 24 * 60 * 60
+
+# ===========================
+# CAPTCHA SETTINGS
+# ===========================
+CAPTCHA_IMAGE_ID = "captcha_image"
+CAPTCHA_FORM_FIELD = "fcaptcha_code"
+CAPTCHA_INVALID_MARKERS = ["invalid captcha", "captcha mismatch"]
+CAPTCHA_SUBMIT_SELECTOR = "#searchbtn, button[type='submit'], input[type='submit']"
+CAPTCHA_SOLVER = "manual"
+CAPTCHA_WORKERS = 2
+CAPTCHA_TIMEOUT = 300
+CAPTCHA_POLL_INTERVAL = 0.5
+CAPTCHA_ATTEMPTS = 3
 
 # ===========================
 # ERROR MESSAGES
@@ -77,7 +214,13 @@ ERROR_MESSAGES = {
     "case_not_found": "Case not found. Please verify the case details.",
     "no_listing": "This case is not listed today or tomorrow.",
     "captcha_required": "CAPTCHA verification required. Please solve manually.",
+    "javascript_required": "The portal page needs JavaScript. Use the selenium backend for this lookup.",
     "timeout": "Request timed out. The server took too long to respond.",
+    "server_error": "The eCourts portal returned a server error. Try again later.",
+    "rate_limited": "The eCourts portal is rate limiting requests. Try again later.",
+    "element_missing": "The portal page did not contain the expected form elements.",
+    "circuit_open": "The eCourts portal is failing; requests are paused for a while.",
+    "unexpected": "An unexpected error occurred.",
 }
 
 SUCCESS_MESSAGES = {
@@ -0,0 +1,121 @@
+"""
+Columnar export of cause lists and search results
+Builds pandas DataFrames straight from the model attributes and writes them to Parquet/Arrow
+"""
+from dataclasses import fields
+from itertools import repeat
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from config import ECOURTS_DATE_FORMAT
+from models import CaseDetails, CauseList, SearchResult, LISTING_COLUMNS
+from utils import parse_portal_date
+
+CASE_FIELDS = tuple(f.name for f in fields(CaseDetails))
+LISTING_INFO_FIELDS = ("serial_number", "listing_date", "court_name", "court_number", "judge_name", "purpose")
+RESULT_FIELDS = ("success", "message", "is_listed", "error", "failure_reason", "search_timestamp")
+RESULT_COLUMNS = RESULT_FIELDS + CASE_FIELDS + tuple(f"listing_{name}" for name in LISTING_INFO_FIELDS)
+
+DATE_COLUMNS = ("list_date", "listing_date", "filing_date", "registration_date", "next_hearing_date",
+                "listing_listing_date")
+CATEGORY_COLUMNS = ("failure_reason", "court_complex", "court_name", "court_number", "judge_name", "purpose", "case_type",
+                    "status", "listing_court_name", "listing_court_number", "listing_judge_name",
+                    "listing_purpose")
+INTEGER_COLUMNS = {"serial_number": "Int32", "listing_serial_number": "Int32", "case_year": "Int16"}
+
+_result_fields = attrgetter(*RESULT_FIELDS)
+_case_fields = attrgetter(*CASE_FIELDS)
+_listing_info_fields = attrgetter(*LISTING_INFO_FIELDS)
+_EMPTY_CASE = (None,) * len(CASE_FIELDS)
+_EMPTY_LISTING = (None,) * len(LISTING_INFO_FIELDS)
+
+
+def _dates(values: Sequence[Any]) -> pd.Series:
+    series = pd.Series(values, dtype="object")
+    parsed = pd.to_datetime(series, format=ECOURTS_DATE_FORMAT, errors="coerce")
+    missing = parsed.isna() & series.notna()
+    if missing.any():
+        # Long-form dates ("20th October 2026") repeat a lot, so parse each distinct value once
+        lookup = {value: parse_portal_date(value) for value in series[missing].unique()}
+        fallback = pd.to_datetime(series.where(missing).map(lookup), errors="coerce")
+        parsed = parsed.where(~missing, fallback)
+    return parsed.astype("datetime64[ns]")
+
+
+def _typed_frame(columns: Dict[str, Sequence[Any]]) -> pd.DataFrame:
+    data = {}
+    for name, values in columns.items():
+        if name in DATE_COLUMNS:
+            data[name] = _dates(values)
+        elif name in CATEGORY_COLUMNS:
+            data[name] = pd.Categorical(values)
+        elif name in INTEGER_COLUMNS:
+            data[name] = pd.to_numeric(pd.Series(values, dtype="object"), errors="coerce").astype(INTEGER_COLUMNS[name])
+        elif name == "search_timestamp":
+            data[name] = pd.to_datetime(pd.Series(values, dtype="object"), errors="coerce")
+        else:
+            data[name] = list(values)
+    return pd.DataFrame(data)
+
+
+def _columns(names: Sequence[str], rows: List[tuple]) -> Dict[str, Sequence[Any]]:
+    if not rows:
+        return {name: () for name in names}
+    return dict(zip(names, zip(*rows)))
+
+
+def cause_list_frame(cause_lists: Union[CauseList, Iterable[CauseList]]) -> pd.DataFrame:
+    """
+    One row per listing, with the cause list date and court complex as leading columns
+    """
+    if isinstance(cause_lists, CauseList):
+        cause_lists = [cause_lists]
+    rows: List[tuple] = []
+    list_dates: List[str] = []
+    complexes: List[Any] = []
+    for cause_list in cause_lists:
+        list_rows = cause_list.to_rows()
+        rows.extend(list_rows)
+        list_dates.extend(repeat(cause_list.date, len(list_rows)))
+        complexes.extend(repeat(cause_list.court_complex, len(list_rows)))
+    columns = {"list_date": list_dates, "court_complex": complexes}
+    columns.update(_columns(LISTING_COLUMNS, rows))
+    return _typed_frame(columns)
+
+
+def _result_row(result: SearchResult) -> tuple:
+    details = result.case_details
+    listing = result.listing_info
+    return (_result_fields(result)
+            + (_case_fields(details) if details is not None else _EMPTY_CASE)
+            + (_listing_info_fields(listing) if listing is not None else _EMPTY_LISTING))
+
+
+def search_results_frame(results: Iterable[SearchResult],
+                         cnrs: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    One row per result; cnrs (the searched CNRs, in the same order) fill in
+    the cnr column where the result page did not show it
+    """
+    columns = _columns(RESULT_COLUMNS, [_result_row(result) for result in results])
+    if cnrs is not None:
+        columns["cnr"] = [found or searched for found, searched in zip(columns["cnr"] or repeat(None), cnrs)]
+    return _typed_frame(columns)
+
+
+def to_arrow(frame: pd.DataFrame):
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Arrow export requires the 'pyarrow' package (pip install pyarrow)")
+    return pyarrow.Table.from_pandas(frame, preserve_index=False)
+
+
+def write_parquet(frame: pd.DataFrame, path: str) -> str:
+    try:
+        frame.to_parquet(path, index=False)
+    except ImportError:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package (pip install pyarrow)")
+    return path
@@ -0,0 +1,155 @@
+"""
+Bulk loading and validation of case references
+Normalizes, validates and dedupes whole CSV/Excel/text files of CNRs or case details with column-wide string operations
+"""
+import os
+import re
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import CNR_LENGTH, VALID_CASE_TYPES, MIN_YEAR, MAX_YEAR
+
+REFERENCE_COLUMNS = ("cnr", "case_type", "case_number", "case_year")
+COLUMN_ALIASES = {
+    "cnr": "cnr", "cnr_number": "cnr", "cnr_no": "cnr",
+    "case_type": "case_type", "type": "case_type",
+    "case_number": "case_number", "case_no": "case_number", "number": "case_number",
+    "case_year": "case_year", "year": "case_year",
+}
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+REJECT_INVALID_CNR = f"Invalid CNR (must be {CNR_LENGTH} letters and digits)"
+REJECT_EMPTY = "No CNR or case details"
+REJECT_CASE_TYPE = "Unknown case type"
+REJECT_CASE_NUMBER = "Case number must be numeric"
+REJECT_YEAR = f"Year must be between {MIN_YEAR} and {MAX_YEAR}"
+REJECT_DUPLICATE = "Duplicate"
+
+_CNR_REGEX = rf"[A-Z0-9]{{{CNR_LENGTH}}}"
+
+
+def _case_type_key(case_type: str) -> str:
+    return re.sub(r'[^A-Z0-9]', '', case_type.upper())
+
+
+_VALID_CASE_TYPES = set(VALID_CASE_TYPES)
+_CASE_TYPE_KEYS: Dict[str, str] = {}
+for _case_type in VALID_CASE_TYPES:
+    _CASE_TYPE_KEYS.setdefault(_case_type_key(_case_type), _case_type)
+
+
+def _header_name(column) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', str(column).strip().lower()).strip('_')
+
+
+def _read_text(path: str) -> pd.DataFrame:
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    # string dtype keeps .str usable when the file has no lines at all
+    return pd.DataFrame({"cnr": pd.Series(lines, dtype="string"), "source_row": range(1, len(lines) + 1)}).query(
+        "cnr != '' and not cnr.str.startswith('#')", engine="python"
+    )
+
+
+def read_references(path: str) -> pd.DataFrame:
+    """
+    Loads a CSV, Excel or plain text file (one CNR per line) into the REFERENCE_COLUMNS
+    plus source_row, the line or row number in the file
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        try:
+            frame = pd.read_excel(path, dtype=str)
+        except ImportError:
+            raise RuntimeError("Reading Excel files requires the 'openpyxl' package (pip install openpyxl)")
+    elif extension == ".csv":
+        try:
+            frame = pd.read_csv(path, dtype=str, skipinitialspace=True, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            frame = pd.DataFrame()
+    else:
+        return _read_text(path).reindex(columns=REFERENCE_COLUMNS + ("source_row",))
+    if frame.columns.empty:
+        return pd.DataFrame({column: pd.Series(dtype="string") for column in REFERENCE_COLUMNS}).assign(
+            source_row=pd.Series(dtype="int64"))
+    frame = frame.rename(columns=lambda column: COLUMN_ALIASES.get(_header_name(column), column))
+    if not any(column in frame.columns for column in REFERENCE_COLUMNS):
+        # No recognised header: the first column holds CNRs and the header row is one of them
+        first = frame.columns[0]
+        frame = pd.concat([pd.DataFrame({first: [first]}), frame[[first]]], ignore_index=True)
+        frame = frame.rename(columns={first: "cnr"})
+        frame["source_row"] = range(1, len(frame) + 1)
+    else:
+        frame["source_row"] = range(2, len(frame) + 2)
+    return frame.reindex(columns=REFERENCE_COLUMNS + ("source_row",))
+
+
+def _clean(values: pd.Series) -> pd.Series:
+    cleaned = values.astype("string").str.strip()
+    return cleaned.mask(cleaned == "")
+
+
+def canonical_case_types(values: pd.Series) -> pd.Series:
+    """
+    Maps spellings like 'wp(c)', 'W.P. (C)' or 'crl a' onto VALID_CASE_TYPES; unknown types become NA
+    """
+    compact = _clean(values).str.upper().str.replace(r'\s+', '', regex=True)
+    exact = compact.where(compact.isin(_VALID_CASE_TYPES))
+    by_key = compact.str.replace(r'[^A-Z0-9]', '', regex=True).map(_CASE_TYPE_KEYS)
+    return exact.fillna(by_key).astype("string")
+
+
+def validate_references(frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns (accepted, rejects). Accepted rows have a valid CNR or a valid case
+    type/number/year; rejects keep the original values plus a reason. Repeats
+    of an accepted reference are rejected as duplicates.
+    """
+    cnr = _clean(frame["cnr"]).str.upper().str.replace(r'[\s\-/]', '', regex=True)
+    case_type = canonical_case_types(frame["case_type"])
+    case_number = _clean(frame["case_number"])
+    case_year = pd.to_numeric(_clean(frame["case_year"]), errors="coerce")
+
+    has_cnr = cnr.notna()
+    cnr_valid = cnr.str.fullmatch(_CNR_REGEX).fillna(False).astype(bool)
+    has_details = (_clean(frame["case_type"]).notna() | case_number.notna() | case_year.notna())
+    number_valid = case_number.str.fullmatch(r'\d+').fillna(False).astype(bool)
+    year_valid = case_year.between(MIN_YEAR, MAX_YEAR).fillna(False).astype(bool)
+
+    reason = pd.Series(np.select(
+        [has_cnr & cnr_valid, has_cnr, ~has_details, case_type.isna(), ~number_valid, ~year_valid],
+        [None, REJECT_INVALID_CNR, REJECT_EMPTY, REJECT_CASE_TYPE, REJECT_CASE_NUMBER, REJECT_YEAR],
+        default=None
+    ), index=frame.index, dtype="object")
+
+    normalized = pd.DataFrame({
+        "source_row": frame["source_row"],
+        "cnr": cnr.where(cnr_valid),
+        "case_type": case_type,
+        "case_number": case_number.where(number_valid).str.lstrip('0').replace("", "0"),
+        "case_year": case_year.where(year_valid).astype("Int64"),
+    })
+    accepted_mask = reason.isna()
+    key = normalized["cnr"].fillna(
+        normalized["case_type"] + "/" + normalized["case_number"] + "/" + normalized["case_year"].astype("string")
+    )
+    duplicate = accepted_mask & key.where(accepted_mask).duplicated(keep="first") & key.notna()
+    reason = reason.mask(duplicate, REJECT_DUPLICATE)
+    accepted_mask = reason.isna()
+
+    accepted = normalized[accepted_mask].reset_index(drop=True)
+    rejects = frame[~accepted_mask].reindex(columns=("source_row",) + REFERENCE_COLUMNS).assign(
+        reason=reason[~accepted_mask]
+    ).reset_index(drop=True)
+    return accepted, rejects
+
+
+def load_references(path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return validate_references(read_references(path))
+
+
+def write_rejects(rejects: pd.DataFrame, path: str) -> str:
+    rejects.to_csv(path, index=False)
+    return path
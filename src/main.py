@@ -3,21 +3,50 @@ Main entry point for eCourts Scraper
 Provides command-line interface (CLI) for the scraper
 """
 import argparse
+import os
 import sys
 import json
-from typing import Optional
+from collections import Counter
+from typing import Optional, TYPE_CHECKING
 
-from scraper import ECourtsScraper
+# Selenium, pandas, requests and friends are imported where they are first needed,
+# so --help, --version and argument errors return without loading them
+from captcha import CaptchaQueue, CAPTCHA_SOLVERS, create_solver
+from models import CauseList, CourtSelector
+from metrics import REGISTRY, create_metrics_sink
+
+if TYPE_CHECKING:
+    from cache import ResponseCache
+    from sinks import JsonlSink
+    from store import SqliteStore
 from utils import (
     setup_logger, 
     print_banner, 
     save_to_json, 
     generate_search_filename,
+    sanitize_filename,
     get_date_string,
+    date_range,
     validate_cnr,
     validate_case_details
 )
-from config import SUCCESS_MESSAGES, ERROR_MESSAGES
+from config import (
+    SUCCESS_MESSAGES,
+    ERROR_MESSAGES,
+    BACKEND_HTTP,
+    BACKEND_SELENIUM,
+    DEFAULT_BACKEND,
+    BATCH_CONCURRENCY,
+    CAPTCHA_SOLVER,
+    SHARD_CAPTCHA_SOLVER,
+    CACHE_TTL_VOLATILE,
+    STORE_JSON,
+    STORE_SQLITE,
+    DEFAULT_STORE,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    QUEUE_DIR
+)
 
 def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -29,8 +58,15 @@ Examples:
   python main.py --case-type CS --case-number 123 --year 2015 --tomorrow
   python main.py --causelist --today
   python main.py --causelist --tomorrow
+  python main.py --causelist --court 1:19:3 --date 20-10-2026 --save
+  python main.py --causelist --courts courts.txt --from 20-10-2026 --to 26-10-2026 --store sqlite
   python main.py --cnr MHAU019999992015 --save
   python main.py --cnr MHAU019999992015 --no-headless
+  python main.py --cnr MHAU019999992015 --backend selenium
+  python main.py --cnr-file district.csv --shards 8 --store sqlite
+  python main.py --serve --port 8787 --captcha-solver operator
+  python main.py --cnr-file cnrs.txt --concurrency 8 --save
+  python main.py --cnr MHAU019999992015 --refresh
         """
     )
     search_group = parser.add_argument_group('Search Options')
@@ -54,6 +90,65 @@ Examples:
         type=str,
         help='Case year (e.g., 2015)'
     )
+    batch_group = parser.add_argument_group('Batch Options')
+    batch_group.add_argument(
+        '--cnr-file',
+        type=str,
+        help='Search every case in a file: one CNR per line, or a CSV/Excel sheet with CNR or case type/number/year columns'
+    )
+    batch_group.add_argument(
+        '--concurrency',
+        type=int,
+        default=BATCH_CONCURRENCY,
+        help=f'Number of parallel workers for --cnr-file and --serve (default: {BATCH_CONCURRENCY})'
+    )
+    batch_group.add_argument(
+        '--shards',
+        type=int,
+        metavar='N',
+        help='Split --cnr-file over N worker processes and journal progress, so a rerun resumes where it stopped'
+    )
+    batch_group.add_argument(
+        '--journal',
+        type=str,
+        metavar='PATH',
+        help='Progress journal for --shards (default: data/journal/<cnr file>.journal.jsonl)'
+    )
+    batch_group.add_argument(
+        '--rejects',
+        type=str,
+        metavar='PATH',
+        help='Write rows of --cnr-file that failed validation to this CSV file'
+    )
+    batch_group.add_argument(
+        '--watch',
+        action='store_true',
+        help='Only re-fetch watched cases that may have changed and print what changed (adds --cnr-file CNRs to the watch list)'
+    )
+    service_group = parser.add_argument_group('Service Options')
+    service_group.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a resident service answering lookups over a local HTTP/JSON API and a job queue directory'
+    )
+    service_group.add_argument(
+        '--host',
+        type=str,
+        default=SERVICE_HOST,
+        help=f'Address the service listens on (default: {SERVICE_HOST})'
+    )
+    service_group.add_argument(
+        '--port',
+        type=int,
+        default=SERVICE_PORT,
+        help=f'Port the service listens on (default: {SERVICE_PORT})'
+    )
+    service_group.add_argument(
+        '--queue-dir',
+        type=str,
+        default=QUEUE_DIR,
+        help='Job queue directory watched by the service (default: data/queue)'
+    )
     date_group = parser.add_argument_group('Date Options')
     date_group.add_argument(
         '--today',
@@ -66,6 +161,12 @@ Examples:
         help='Check if case is listed tomorrow'
     )
     causelist_group = parser.add_argument_group('Cause List Options')
+    causelist_group.add_argument(
+        '--diff',
+        type=str,
+        metavar='PATH',
+        help='With --from/--to, compare each court\'s cause list with its previous day and append the changes to a JSON Lines file'
+    )
     causelist_group.add_argument(
         '--causelist',
         action='store_true',
@@ -76,6 +177,30 @@ Examples:
         type=str,
         help='Specific date for cause list (format: DD-MM-YYYY)'
     )
+    causelist_group.add_argument(
+        '--court',
+        type=str,
+        help='Court selector for cause lists and listing checks (STATE:DISTRICT:COMPLEX[:COURT])'
+    )
+    causelist_group.add_argument(
+        '--courts',
+        type=str,
+        help='Crawl cause lists for several courts: comma-separated selectors, or a file with one per line'
+    )
+    causelist_group.add_argument(
+        '--from',
+        dest='date_from',
+        type=str,
+        metavar='DATE',
+        help='Crawl cause lists for every date from DATE (DD-MM-YYYY) up to --to'
+    )
+    causelist_group.add_argument(
+        '--to',
+        dest='date_to',
+        type=str,
+        metavar='DATE',
+        help='Last date to crawl (default: same as --from)'
+    )
     output_group = parser.add_argument_group('Output Options')
     output_group.add_argument(
         '--save',
@@ -87,10 +212,76 @@ Examples:
         type=str,
         help='Custom output filename'
     )
+    output_group.add_argument(
+        '--jsonl',
+        type=str,
+        help='Append results to a JSON Lines file (or directory) instead of one JSON file per search'
+    )
+    output_group.add_argument(
+        '--compress',
+        choices=['gzip', 'zstd'],
+        help='Compress the --jsonl output'
+    )
+    output_group.add_argument(
+        '--rotate-mb',
+        type=int,
+        help='Start a new --jsonl segment after this many megabytes of uncompressed JSON'
+    )
+    output_group.add_argument(
+        '--rotate-daily',
+        action='store_true',
+        help='Start a new --jsonl segment every day'
+    )
+    output_group.add_argument(
+        '--import-jsonl',
+        type=str,
+        metavar='PATTERN',
+        help='Load results and cause lists from --jsonl files (a path or glob over rotated segments) into --store sqlite'
+    )
+    output_group.add_argument(
+        '--parquet',
+        type=str,
+        metavar='PATH',
+        help='Also export the cause list or search results to a Parquet file (needs pyarrow)'
+    )
+    output_group.add_argument(
+        '--store',
+        choices=[STORE_JSON, STORE_SQLITE],
+        default=DEFAULT_STORE,
+        help='Where results are kept: JSON files with --save, or the SQLite database (always saved, indexed for queries)'
+    )
+    output_group.add_argument(
+        '--db',
+        type=str,
+        help='SQLite database file for --store sqlite (default: data/ecourts.db)'
+    )
+    output_group.add_argument(
+        '--metrics',
+        type=str,
+        metavar='PATH',
+        help='Write lookup counters and step latencies to PATH (Prometheus text, or JSON for .json files)'
+    )
     output_group.add_argument(
         '--download-pdf',
         action='store_true',
-        help='Download case PDF (if available)'
+        help='Download the order and judgment PDFs of the case(s) found, into data/pdf/<CNR>/'
+    )
+    cache_group = parser.add_argument_group('Cache Options')
+    cache_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the local response cache'
+    )
+    cache_group.add_argument(
+        '--cache-ttl',
+        type=int,
+        metavar='MINUTES',
+        help=f'Serve cached case details for this many minutes before refetching (default: {CACHE_TTL_VOLATILE // 60})'
+    )
+    cache_group.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached results and fetch fresh data (the cache is still updated)'
     )
     browser_group = parser.add_argument_group('Browser Options')
     browser_group.add_argument(
@@ -98,6 +289,18 @@ Examples:
         action='store_true',
         help='Show browser window (useful for debugging)'
     )
+    browser_group.add_argument(
+        '--backend',
+        choices=[BACKEND_HTTP, BACKEND_SELENIUM],
+        default=DEFAULT_BACKEND,
+        help='Fetch backend: plain HTTP with browser fallback, or browser only (default: http)'
+    )
+    browser_group.add_argument(
+        '--captcha-solver',
+        choices=list(CAPTCHA_SOLVERS),
+        help=f'How CAPTCHAs are solved: console prompt, OCR, operator file queue, or a fixed test answer '
+             f'(default: {CAPTCHA_SOLVER}, or {SHARD_CAPTCHA_SOLVER} with --shards)'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -114,10 +317,63 @@ def validate_arguments(args) -> tuple[bool, Optional[str]]:
     has_cnr = args.cnr is not None
     has_case_details = all([args.case_type, args.case_number, args.year])
     has_causelist = args.causelist
-    if not (has_cnr or has_case_details or has_causelist):
-        return False, "Please provide either --cnr, case details (--case-type, --case-number, --year), or --causelist"
+    has_cnr_file = args.cnr_file is not None
+    if args.import_jsonl:
+        if has_cnr or has_case_details or has_causelist or has_cnr_file or args.watch or args.serve:
+            return False, "--import-jsonl loads saved results and cannot be combined with a search"
+        if args.store != STORE_SQLITE:
+            return False, "--import-jsonl needs --store sqlite"
+        return True, None
+    if not (has_cnr or has_case_details or has_causelist or has_cnr_file or args.watch or args.serve):
+        return False, "Please provide either --cnr, --cnr-file, --watch, --serve, case details (--case-type, --case-number, --year), or --causelist"
+    if args.serve and (has_cnr or has_case_details or has_causelist or has_cnr_file or args.watch):
+        return False, "--serve takes its lookups over HTTP and the job queue, not from the command line"
+    if args.watch and (has_cnr or has_case_details or has_causelist):
+        return False, "--watch only works with --cnr-file"
     if has_cnr and has_case_details:
         return False, "Please use either --cnr OR case details, not both"
+    if has_cnr_file and (has_cnr or has_case_details):
+        return False, "Please use either --cnr-file OR a single case, not both"
+    if has_cnr_file and not os.path.isfile(args.cnr_file):
+        return False, f"CNR file not found: {args.cnr_file}"
+    if args.download_pdf and (has_causelist or args.watch):
+        return False, "--download-pdf only works with --cnr or --cnr-file"
+    if (args.shards is not None or args.journal) and not has_cnr_file:
+        return False, "--shards and --journal only work with --cnr-file"
+    if args.shards is not None and args.shards < 1:
+        return False, "--shards must be at least 1"
+    if args.journal and args.shards is None:
+        return False, "--journal needs --shards"
+    if args.shards is not None and args.captcha_solver == "manual":
+        return False, "--shards workers cannot prompt for CAPTCHAs: use --captcha-solver operator, ocr or stub"
+    if args.concurrency < 1:
+        return False, "--concurrency must be at least 1"
+    if args.cache_ttl is not None and args.cache_ttl < 0:
+        return False, "--cache-ttl cannot be negative"
+    if args.court:
+        try:
+            CourtSelector.parse(args.court)
+        except ValueError as e:
+            return False, str(e)
+    if args.diff and not (args.date_from or args.date_to):
+        return False, "--diff needs a date range: --causelist --from DATE --to DATE"
+    if (args.courts or args.date_from or args.date_to) and not has_causelist:
+        return False, "--courts, --from and --to only work with --causelist"
+    if args.courts and args.court:
+        return False, "Please use either --court OR --courts, not both"
+    if args.date_from or args.date_to:
+        if args.date:
+            return False, "Please use either --date OR --from/--to, not both"
+        try:
+            crawl_dates(args)
+        except ValueError as e:
+            return False, str(e)
+    if args.courts:
+        try:
+            if not parse_courts(args.courts):
+                return False, "--courts did not name any court"
+        except (ValueError, OSError) as e:
+            return False, str(e)
     if has_cnr:
         is_valid, message = validate_cnr(args.cnr)
         if not is_valid:
@@ -197,17 +453,373 @@ def print_search_result(result, args):
             print(f"  ✗ Case is NOT listed {date_str}")
     print("\n" + "="*70 + "\n")
 
-def save_result(result, args):
+def save_result(result, args, cnr: Optional[str] = None, sink: Optional["JsonlSink"] = None,
+                store: Optional["SqliteStore"] = None):
+    logger = setup_logger()
+    with REGISTRY.timer("ecourts_step_seconds", step="save"):
+        if store is not None:
+            store.save_result(result, cnr=cnr or args.cnr)
+            logger.debug(f"✓ Result stored in: {store.path}")
+        if sink is not None:
+            sink.write(result.to_dict())
+            logger.debug(f"✓ Result appended to: {sink.path}")
+        if store is not None or sink is not None:
+            return
+        filename = args.output if args.output and not cnr else generate_search_filename(
+            cnr=cnr or args.cnr,
+            case_type=args.case_type,
+            case_number=args.case_number,
+            case_year=args.year
+        )
+        filepath = save_to_json(result.to_dict(), filename)
+        logger.info(f"✓ Results saved to: {filepath}")
+        print(f"\n💾 Results saved to: {filepath}")
+
+def print_cause_list(cause_list):
+    print("\n" + "="*70)
+    print(f"CAUSE LIST - {cause_list.date}")
+    print("="*70)
+    if cause_list.court_complex:
+        print(f"  Court Complex:     {cause_list.court_complex}")
+    print(f"  Total Cases:       {cause_list.total_cases}")
+    print("-" * 70)
+    for listing in cause_list.listings:
+        case = listing.case_details
+        case_text = f"{case.case_type}/{case.case_number}/{case.case_year}" if case else "-"
+        court_text = f"Court {listing.court_number}" if listing.court_number else ""
+        print(f"  {listing.serial_number or '-':>4}  {case_text:<28} {court_text:<10} {listing.purpose or ''}")
+    print("\n" + "="*70 + "\n")
+
+def save_cause_list(cause_list, args, sink: Optional["JsonlSink"] = None,
+                    store: Optional["SqliteStore"] = None, batch: bool = False):
+    logger = setup_logger()
+    with REGISTRY.timer("ecourts_step_seconds", step="save"):
+        if store is not None:
+            store.save_cause_list(cause_list)
+            print(f"\n💾 Cause list stored in: {store.path}")
+        if sink is not None:
+            sink.write(cause_list.to_dict())
+            print(f"\n💾 Cause list appended to: {sink.path}")
+        if store is not None or sink is not None:
+            return
+        filename = args.output if args.output and not batch else sanitize_filename(
+            f"causelist_{cause_list.court_complex or 'all'}_{cause_list.date}"
+        )
+        filepath = save_to_json(cause_list.to_dict(), filename)
+        logger.info(f"✓ Cause list saved to: {filepath}")
+        print(f"\n💾 Cause list saved to: {filepath}")
+
+def create_cache(args) -> Optional["ResponseCache"]:
+    if args.no_cache:
+        return None
+    from cache import ResponseCache, CASE_STATUS_KIND
+    if args.cache_ttl is not None:
+        return ResponseCache(ttls={CASE_STATUS_KIND: args.cache_ttl * 60})
+    return ResponseCache()
+
+def create_sink(args) -> Optional["JsonlSink"]:
+    if not args.jsonl:
+        return None
+    from sinks import JsonlSink
+    return JsonlSink(
+        args.jsonl,
+        compression=args.compress,
+        rotate_bytes=args.rotate_mb * 1024 * 1024 if args.rotate_mb else None,
+        rotate_daily=args.rotate_daily
+    )
+
+def create_captcha_queue(args) -> CaptchaQueue:
+    return CaptchaQueue(create_solver(args.captcha_solver))
+
+def export_parquet(frame, path: str):
+    from export import write_parquet
+    write_parquet(frame, path)
+    setup_logger().info(f"✓ Exported {len(frame)} rows to: {path}")
+    print(f"\n💾 {len(frame)} rows exported to: {path}")
+
+def create_store(args) -> Optional["SqliteStore"]:
+    if args.store != STORE_SQLITE:
+        return None
+    from store import SqliteStore
+    return SqliteStore(args.db) if args.db else SqliteStore()
+
+def run_import(args, store: "SqliteStore"):
+    from sinks import iter_saved
+    counts = Counter()
+    for item in iter_saved(args.import_jsonl):
+        if isinstance(item, CauseList):
+            store.save_cause_list(item)
+            counts["cause lists"] += 1
+        else:
+            store.save_result(item)
+            counts["results"] += 1
+    store.flush()
+    print(f"\n💾 Imported {counts['results']} results and {counts['cause lists']} cause lists into: {store.path}")
+
+def read_batch_input(args) -> list:
+    from inputs import load_references, write_rejects
+    logger = setup_logger()
+    accepted, rejects = load_references(args.cnr_file)
+    if len(rejects):
+        print(f"\n⚠️  {len(rejects)} rows rejected:")
+        for row in rejects.head(10).itertuples(index=False):
+            values = [value for value in (row.cnr, row.case_type, row.case_number, row.case_year)
+                      if isinstance(value, str) and value]
+            print(f"  row {row.source_row}: {row.reason} ({' '.join(values) or '-'})")
+        if len(rejects) > 10:
+            print(f"  ... and {len(rejects) - 10} more")
+        if args.rejects:
+            print(f"💾 Rejected rows written to: {write_rejects(rejects, args.rejects)}")
+    by_details = accepted["cnr"].isna().sum()
+    if by_details:
+        logger.warning(f"⚠ Skipping {by_details} rows without a CNR - search by case details is not yet implemented")
+    return accepted["cnr"].dropna().tolist()
+
+def run_batch(args, headless: bool, sink: Optional["JsonlSink"] = None,
+              store: Optional["SqliteStore"] = None):
+    from batch import search_many
+    from export import search_results_frame
+    logger = setup_logger()
+    cnrs = read_batch_input(args)
+    logger.info(f"Searching {len(cnrs)} CNRs with {args.concurrency} workers...")
+    check_listing = args.today or args.tomorrow
+    found = []
+    failures = Counter()
+    exported = []
+    court = CourtSelector.parse(args.court) if args.court else None
+    for cnr, result in search_many(cnrs, concurrency=args.concurrency, check_listing=check_listing,
+                                   headless=headless, backend=args.backend,
+                                   cache=create_cache(args), refresh=args.refresh, court=court,
+                                   captcha=create_captcha_queue(args)):
+        if result.success:
+            found.append(cnr)
+            print(f"  ✅ {cnr}: {result.message}")
+        else:
+            failures[result.failure_reason or "unexpected"] += 1
+            print(f"  ❌ {cnr}: {result.message}")
+        if args.save or sink or store:
+            save_result(result, args, cnr=cnr, sink=sink, store=store)
+        if args.parquet:
+            exported.append((cnr, result))
+    print("\n" + "-"*70)
+    print(f"Total searched: {len(cnrs)}")
+    print(f"Found: {len(found)}")
+    print(f"Not found: {len(cnrs) - len(found)}")
+    for reason, count in failures.most_common():
+        print(f"  {reason}: {count}")
+    if sink:
+        print(f"\n💾 {sink.records_written} results appended to: {sink.path}")
+    if args.parquet:
+        export_parquet(search_results_frame([result for _, result in exported],
+                                            cnrs=[cnr for cnr, _ in exported]), args.parquet)
+    if args.download_pdf and found:
+        download_batch_orders(found, args, headless)
+
+def download_orders(items, cookies=None) -> Counter:
+    from orders import OrderDownloader
+    statuses = Counter()
+    with OrderDownloader(cookies=cookies) as downloader:
+        for download in downloader.download_many(items):
+            statuses[download.status] += 1
+            order = download.order
+            label = " ".join(part for part in (download.cnr, order.order_date, order.order_number) if part)
+            if download.status == "failed":
+                print(f"  ❌ {label or order.url}: {download.error}")
+            else:
+                print(f"  📄 {label or order.url}: {download.status} -> {download.path}")
+    if statuses:
+        print("PDFs: " + ", ".join(f"{count} {status}" for status, count in statuses.most_common()))
+    else:
+        print("No order PDFs found")
+    return statuses
+
+def download_batch_orders(cnrs: list, args, headless: bool):
+    from requests.cookies import RequestsCookieJar
+    from batch import list_orders_many
+    print(f"\n📄 Downloading order PDFs for {len(cnrs)} cases...")
+    # Orders are listed first so the downloads can carry the portal session the listing scrapers opened
+    items = []
+    cookies = RequestsCookieJar()
+    for cnr, orders, session_cookies in list_orders_many(cnrs, concurrency=args.concurrency, headless=headless,
+                                                         backend=args.backend, cache=create_cache(args),
+                                                         captcha=create_captcha_queue(args)):
+        items.extend((cnr, order) for order in orders)
+        if session_cookies is not None:
+            cookies.update(session_cookies)
+    download_orders(items, cookies=cookies)
+
+def run_sharded(args, headless: bool, sink: Optional["JsonlSink"] = None,
+                store: Optional["SqliteStore"] = None):
+    from shards import Journal, journal_path, run_shards
+    logger = setup_logger()
+    cnrs = read_batch_input(args)
+    path = args.journal or journal_path(args.cnr_file)
+    logger.info(f"Searching {len(cnrs)} CNRs in {args.shards} shards, journal: {path}")
+    searched = 0
+    with Journal(path) as journal:
+        for cnr, result in run_shards(cnrs, journal, args.shards,
+                                      check_listing=args.today or args.tomorrow, headless=headless,
+                                      backend=args.backend, use_cache=not args.no_cache,
+                                      refresh=args.refresh, court=args.court,
+                                      captcha_solver=args.captcha_solver):
+            searched += 1
+            if args.save or sink or store:
+                save_result(result, args, cnr=cnr, sink=sink, store=store)
+        # Totals cover the whole sweep: CNRs finished by earlier runs count as well as this one's
+        outcomes = Counter(journal.outcome(cnr) for cnr in cnrs)
+        found = [cnr for cnr in cnrs if journal.outcome(cnr) == "success"]
+    remaining = outcomes.pop(None, 0)
+    outcomes.pop("success", None)
+    print("\n" + "-"*70)
+    print(f"Searched this run: {searched}")
+    print(f"Found: {len(found)} of {len(cnrs)}")
+    for reason, count in outcomes.most_common():
+        print(f"  {reason}: {count}")
+    if remaining:
+        print(f"\n⚠️  {remaining} CNRs still to do - run the same command again to resume")
+    else:
+        print(f"\n✅ All {len(cnrs)} CNRs done (journal: {path})")
+    if sink:
+        print(f"\n💾 {sink.records_written} results appended to: {sink.path}")
+    if args.download_pdf and found:
+        download_batch_orders(found, args, headless)
+
+def parse_courts(spec: str) -> list:
+    if os.path.isfile(spec):
+        with open(spec, 'r', encoding='utf-8') as f:
+            selectors = [line.strip() for line in f]
+    else:
+        selectors = [selector.strip() for selector in spec.split(",")]
+    return [CourtSelector.parse(selector) for selector in selectors
+            if selector and not selector.startswith('#')]
+
+def crawl_dates(args) -> list:
+    if args.date_from or args.date_to:
+        return date_range(args.date_from or get_date_string(0, "ecourts"), args.date_to or args.date_from)
+    return [args.date if args.date else get_date_string(1 if args.tomorrow else 0, "ecourts")]
+
+def print_crawl_summary(totals: dict, dates: list):
+    print("\n" + "="*70)
+    print("CAUSE LIST CRAWL")
+    print("="*70)
+    print(f"  {'Court':<20}" + "".join(f"{date[:5]:>8}" for date in dates))
+    print("-" * 70)
+    for court_key in sorted(totals):
+        counts = totals[court_key]
+        print(f"  {court_key:<20}" + "".join(f"{counts.get(date, '-'):>8}" for date in dates))
+    print("\n" + "="*70 + "\n")
+
+def run_crawl(args, headless: bool, sink: Optional["JsonlSink"] = None,
+              store: Optional["SqliteStore"] = None):
+    from batch import crawl_cause_lists
+    from export import cause_list_frame
     logger = setup_logger()
-    filename = args.output if args.output else generate_search_filename(
-        cnr=args.cnr,
-        case_type=args.case_type,
-        case_number=args.case_number,
-        case_year=args.year
-    )
-    filepath = save_to_json(result.to_dict(), filename)
-    logger.info(f"✓ Results saved to: {filepath}")
-    print(f"\n💾 Results saved to: {filepath}")
+    courts = parse_courts(args.courts) if args.courts else [CourtSelector.parse(args.court) if args.court else None]
+    dates = crawl_dates(args)
+    logger.info(f"Crawling {len(courts)} courts x {len(dates)} dates with {args.concurrency} workers...")
+    totals = {}
+    failed = 0
+    exported = []
+    differ = diff_feed = None
+    diff_totals = Counter()
+    if args.diff:
+        from causelist_diff import ConsecutiveDiffer, summarize
+        from sinks import JsonlSink
+        differ = ConsecutiveDiffer(dates=dates)
+        diff_feed = JsonlSink(args.diff)
+    for court, date, cause_list in crawl_cause_lists(courts, dates, concurrency=args.concurrency,
+                                                     headless=headless, backend=args.backend,
+                                                     captcha=create_captcha_queue(args)):
+        court_key = court.key if court else "all"
+        if differ:
+            for current, changes in differ.arrive(court_key, date, cause_list):
+                for change in changes:
+                    diff_feed.write(change.to_dict())
+                counts = summarize(changes)
+                diff_totals.update(counts)
+                if changes:
+                    print(f"  🔄 {court_key} {current.date}: +{counts['added']} -{counts['removed']} "
+                          f"~{counts['changed']} vs previous list")
+        if cause_list is None:
+            failed += 1
+            print(f"  ❌ {court_key} {date}: cause list could not be downloaded")
+            continue
+        totals.setdefault(court_key, {})[date] = cause_list.total_cases
+        print(f"  ✅ {court_key} {date}: {cause_list.total_cases} cases")
+        if args.save or sink or store:
+            save_cause_list(cause_list, args, sink, store, batch=True)
+        if args.parquet:
+            exported.append(cause_list)
+    print_crawl_summary(totals, dates)
+    print(f"Cause lists downloaded: {sum(len(counts) for counts in totals.values())}")
+    print(f"Failed: {failed}")
+    if diff_feed:
+        diff_feed.close()
+        print(f"\n🔄 Listing changes: {diff_totals['added']} added, {diff_totals['removed']} removed, "
+              f"{diff_totals['changed']} changed")
+        print(f"💾 {diff_feed.records_written} changes appended to: {diff_feed.path}")
+    if args.parquet:
+        export_parquet(cause_list_frame(exported), args.parquet)
+
+def print_case_change(change):
+    if change.is_new:
+        current = {name: new for name, (old, new) in change.changes.items()}
+        print(f"  ➕ {change.cnr}: now watched (status: {current.get('status') or '-'}, "
+              f"next hearing: {current.get('next_hearing_date') or '-'})")
+        return
+    print(f"  🔄 {change.cnr}:")
+    for name, (old, new) in change.changes.items():
+        print(f"      {name}: {old or '-'} → {new or '-'}")
+
+def run_service(args, headless: bool):
+    from service import ScraperService, ServiceHTTPServer, JobQueue
+    logger = setup_logger()
+    court = CourtSelector.parse(args.court) if args.court else None
+    with ScraperService(concurrency=args.concurrency, headless=headless, backend=args.backend,
+                        cache=create_cache(args), court=court,
+                        captcha=create_captcha_queue(args)) as service:
+        server = ServiceHTTPServer(service, args.host, args.port)
+        queue = JobQueue(service, args.queue_dir)
+        queue.start()
+        logger.info(f"✓ Serving on http://{args.host}:{server.server_port} with {service.concurrency} workers")
+        logger.info(f"✓ Watching job queue {queue.incoming}")
+        try:
+            server.serve_forever()
+        finally:
+            queue.stop()
+            server.server_close()
+
+def run_watch(args, headless: bool, sink: Optional["JsonlSink"] = None,
+              store: Optional["SqliteStore"] = None):
+    cnrs = read_batch_input(args) if args.cnr_file else []
+    from watch import WatchStore, Watcher
+    court = CourtSelector.parse(args.court) if args.court else None
+    watch_store = WatchStore()
+    changes = []
+    try:
+        for change in Watcher(watch_store).run(cnrs, concurrency=args.concurrency,
+                                         check_listing=args.today or args.tomorrow,
+                                         headless=headless, backend=args.backend,
+                                         cache=create_cache(args), court=court,
+                                         captcha=create_captcha_queue(args)):
+            print_case_change(change)
+            if store:
+                store.save_case(watch_store.get(change.cnr).case_details, change.cnr)
+            if sink:
+                sink.write(change.to_dict())
+            else:
+                changes.append(change)
+    finally:
+        watch_store.close()
+    print("\n" + "-"*70)
+    print(f"Watched cases: {len(watch_store)}")
+    print(f"Changed: {sink.records_written if sink else len(changes)}")
+    if sink:
+        print(f"\n💾 Changes appended to: {sink.path}")
+    elif args.save and changes:
+        filename = args.output or sanitize_filename(f"watch_changes_{get_date_string(0, 'internal')}")
+        filepath = save_to_json({"changes": [change.to_dict() for change in changes]}, filename)
+        print(f"\n💾 Changes saved to: {filepath}")
 
 def main():
     print_banner()
@@ -221,26 +833,66 @@ def main():
         print(f"\n❌ Error: {error_message}\n")
         parser.print_help()
         sys.exit(1)
+    if args.captcha_solver is None:
+        args.captcha_solver = SHARD_CAPTCHA_SOLVER if args.shards else CAPTCHA_SOLVER
     logger = setup_logger()
     headless = not args.no_headless
+    sink = create_sink(args)
+    store = create_store(args)
+    if args.metrics:
+        REGISTRY.add_sink(create_metrics_sink(args.metrics))
     try:
         logger.info("Starting eCourts Scraper...")
-        scraper = ECourtsScraper(headless=headless)
+        if args.import_jsonl:
+            run_import(args, store)
+            return
+        if args.serve:
+            run_service(args, headless)
+            return
+        if args.watch:
+            run_watch(args, headless, sink, store)
+            return
+        if args.cnr_file and args.shards:
+            run_sharded(args, headless, sink, store)
+            return
+        if args.cnr_file:
+            run_batch(args, headless, sink, store)
+            return
+        if args.causelist and (args.courts or args.date_from or args.date_to):
+            run_crawl(args, headless, sink, store)
+            return
+        from scraper import ECourtsScraper
+        court = CourtSelector.parse(args.court) if args.court else None
+        scraper = ECourtsScraper(headless=headless, backend=args.backend,
+                                 cache=create_cache(args), refresh=args.refresh, court=court,
+                                 captcha=create_captcha_queue(args))
         if args.causelist:
-            date = args.date if args.date else None
+            date = args.date if args.date else get_date_string(1 if args.tomorrow else 0, "ecourts")
             logger.info(f"Downloading cause list...")
             cause_list = scraper.download_cause_list(date)
             if cause_list:
                 print(f"\n✅ Cause list downloaded successfully")
-                # TODO: Display and save cause list
+                print_cause_list(cause_list)
+                if args.save or sink or store:
+                    save_cause_list(cause_list, args, sink, store)
+                if args.parquet:
+                    from export import cause_list_frame
+                    export_parquet(cause_list_frame(cause_list), args.parquet)
             else:
                 print(f"\n❌ Failed to download cause list")
         elif args.cnr:
             check_listing = args.today or args.tomorrow
             result = scraper.search_by_cnr(args.cnr, check_listing=check_listing)
             print_search_result(result, args)
-            if args.save:
-                save_result(result, args)
+            if args.save or sink or store:
+                save_result(result, args, sink=sink, store=store)
+            if args.parquet:
+                from export import search_results_frame
+                export_parquet(search_results_frame([result], cnrs=[args.cnr]), args.parquet)
+            if args.download_pdf and result.success:
+                print("\n📄 Downloading order PDFs...")
+                orders = scraper.fetch_case_orders(args.cnr)
+                download_orders(((args.cnr, order) for order in orders), cookies=scraper.order_cookies())
         elif args.case_type and args.case_number and args.year:
             logger.info("Search by case details not yet implemented")
             print("\n⚠️  Search by case details is not yet implemented")
@@ -255,6 +907,13 @@ def main():
         logger.error(f"Unexpected error: {e}")
         print(f"\n❌ An error occurred: {e}")
         sys.exit(1)
+    finally:
+        if sink:
+            sink.close()
+        if store:
+            store.close()
+        if args.metrics:
+            REGISTRY.flush()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,200 @@
+"""
+Lightweight metrics for the eCourts scraper
+Counters and latency histograms kept in-process and exported to Prometheus text or JSON files
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from config import METRICS_BUCKETS, METRICS_FLUSH_INTERVAL
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class MetricsSink:
+    """
+    Destination for registry snapshots, written on flush()
+    """
+    def export(self, registry: "MetricsRegistry"):
+        raise NotImplementedError
+
+
+class _FileSink(MetricsSink):
+    def __init__(self, path: str):
+        self.path = path
+
+    def render(self, registry: "MetricsRegistry") -> str:
+        raise NotImplementedError
+
+    def export(self, registry: "MetricsRegistry"):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(registry))
+        os.replace(tmp_path, self.path)
+
+
+class JsonMetricsSink(_FileSink):
+    def render(self, registry: "MetricsRegistry") -> str:
+        return json.dumps(registry.snapshot(), indent=2)
+
+
+class PrometheusTextSink(_FileSink):
+    """
+    Prometheus text exposition format, for node_exporter's textfile collector
+    """
+    def render(self, registry: "MetricsRegistry") -> str:
+        def fmt(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = labels + extra
+            return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}" if pairs else ""
+
+        lines = []
+        counters, histograms = registry.collect()
+        for name in sorted(counters):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{fmt(labels)} {value}")
+        for name in sorted(histograms):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(histograms[name].items()):
+                bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative()):
+                    lines.append(f"{name}_bucket{fmt(labels, (('le', bound),))} {count}")
+                lines.append(f"{name}_sum{fmt(labels)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{fmt(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def create_metrics_sink(path: str) -> MetricsSink:
+    return JsonMetricsSink(path) if path.endswith('.json') else PrometheusTextSink(path)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process store of counters and histograms
+    Recording is a dict update under a lock, cheap enough to leave on. Attached
+    sinks are written on flush(), and automatically every flush_interval seconds
+    while metrics are being recorded.
+    """
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS,
+                 flush_interval: float = METRICS_FLUSH_INTERVAL):
+        self.buckets = tuple(sorted(buckets))
+        self.flush_interval = flush_interval
+        self.sinks: List[MetricsSink] = []
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._next_flush = time.monotonic() + flush_interval
+
+    def add_sink(self, sink: MetricsSink):
+        self.sinks.append(sink)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name: str, value: float, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+        self._maybe_flush()
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def collect(self) -> Tuple[Dict[str, Dict[Labels, float]], Dict[str, Dict[Labels, Histogram]]]:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = {}
+                for labels, histogram in series.items():
+                    copy = Histogram(histogram.buckets)
+                    copy.counts, copy.count, copy.sum = list(histogram.counts), histogram.count, histogram.sum
+                    histograms[name][labels] = copy
+        return counters, histograms
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        counters, histograms = self.collect()
+        return {
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for name, series in sorted(counters.items()) for labels, value in sorted(series.items())
+            ],
+            "histograms": [
+                {"name": name, "labels": dict(labels), "count": histogram.count, "sum": histogram.sum,
+                 "buckets": dict(zip([str(bound) for bound in histogram.buckets] + ["+Inf"], histogram.cumulative()))}
+                for name, series in sorted(histograms.items()) for labels, histogram in sorted(series.items())
+            ],
+        }
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def _maybe_flush(self):
+        if self.sinks and time.monotonic() >= self._next_flush and self._flush_lock.acquire(blocking=False):
+            try:
+                self._export()
+            finally:
+                self._flush_lock.release()
+
+    def flush(self):
+        with self._flush_lock:
+            self._export()
+
+    def _export(self):
+        self._next_flush = time.monotonic() + self.flush_interval
+        for sink in self.sinks:
+            sink.export(self)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+REGISTRY = MetricsRegistry()
@@ -3,11 +3,69 @@ Data models for eCourts case information
 These classes represent the structure of case data we'll scrape
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, List
+import sys
+from dataclasses import dataclass, field, fields, MISSING
+from operator import attrgetter
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
-@dataclass
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _generate_codecs(cls, nested: Dict[str, type], nested_lists: Dict[str, type]):
+    namespace = {}
+    to_items = []
+    from_items = []
+    for f in fields(cls):
+        name = f.name
+        if name in nested:
+            namespace[f"_type_{name}"] = nested[name]
+            to_items.append(f"{name!r}: self.{name}.to_dict() if self.{name} is not None else None")
+            from_value = f"_type_{name}.from_dict(data[{name!r}]) if data.get({name!r}) is not None else None"
+        elif name in nested_lists:
+            namespace[f"_type_{name}"] = nested_lists[name]
+            to_items.append(f"{name!r}: [item.to_dict() for item in self.{name}]")
+            from_value = f"[_type_{name}.from_dict(item) for item in data.get({name!r}) or ()]"
+        else:
+            to_items.append(f"{name!r}: self.{name}")
+            if f.default is not MISSING:
+                namespace[f"_default_{name}"] = f.default
+                from_value = f"data.get({name!r}, _default_{name})"
+            elif f.default_factory is not MISSING:
+                namespace[f"_factory_{name}"] = f.default_factory
+                from_value = f"data[{name!r}] if {name!r} in data else _factory_{name}()"
+            else:
+                from_value = f"data[{name!r}]"
+        from_items.append(f"{name}={from_value}")
+    source = (
+        "def to_tuple(self):\n"
+        f"    return ({''.join(f'self.{f.name}, ' for f in fields(cls))})\n"
+        "def to_dict(self):\n"
+        f"    return {{{', '.join(to_items)}}}\n"
+        "def from_dict(cls, data):\n"
+        f"    return cls({', '.join(from_items)})\n"
+    )
+    exec(source, namespace)
+    cls.to_dict = namespace["to_dict"]
+    cls.from_dict = classmethod(namespace["from_dict"])
+    cls.to_tuple = namespace["to_tuple"]
+    return cls
+
+
+def model(cls=None, *, frozen: bool = False,
+          nested: Optional[Dict[str, type]] = None,
+          nested_lists: Optional[Dict[str, type]] = None):
+    """
+    Slotted dataclass with generated to_dict/from_dict/to_tuple
+    nested and nested_lists name the fields that hold other models.
+    """
+    def wrap(cls):
+        cls = dataclass(cls, frozen=frozen, **_DATACLASS_OPTIONS)
+        return _generate_codecs(cls, nested or {}, nested_lists or {})
+    return wrap if cls is None else wrap(cls)
+
+
+@model
 class CaseDetails:
     cnr: Optional[str] = None
     case_type: Optional[str] = None
@@ -23,24 +81,28 @@ class CaseDetails:
     status: Optional[str] = None
     next_hearing_date: Optional[str] = None
 
-    def to_dict(self):
-        return {
-            "cnr": self.cnr,
-            "case_type": self.case_type,
-            "case_number": self.case_number,
-            "case_year": self.case_year,
-            "petitioner": self.petitioner,
-            "respondent": self.respondent,
-            "court_name": self.court_name,
-            "court_number": self.court_number,
-            "judge_name": self.judge_name,
-            "filing_date": self.filing_date,
-            "registration_date": self.registration_date,
-            "status": self.status,
-            "next_hearing_date": self.next_hearing_date,
-        }
-
-@dataclass
+@model(frozen=True)
+class CourtSelector:
+    state_code: str
+    district_code: str
+    complex_code: str
+    court_code: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "CourtSelector":
+        parts = [part.strip() for part in spec.split(":")]
+        if len(parts) not in (3, 4) or not all(parts):
+            raise ValueError(f"Invalid court selector '{spec}'. Use STATE:DISTRICT:COMPLEX[:COURT]")
+        return cls(*parts)
+
+    @property
+    def key(self) -> str:
+        parts = [self.state_code, self.district_code, self.complex_code]
+        if self.court_code:
+            parts.append(self.court_code)
+        return ":".join(parts)
+
+@model(nested={"case_details": CaseDetails})
 class CaseListing:
     serial_number: Optional[int] = None
     listing_date: Optional[str] = None
@@ -50,36 +112,39 @@ class CaseListing:
     case_details: Optional[CaseDetails] = None
     purpose: Optional[str] = None
 
-    def to_dict(self):
-        return {
-            "serial_number": self.serial_number,
-            "listing_date": self.listing_date,
-            "court_name": self.court_name,
-            "court_number": self.court_number,
-            "judge_name": self.judge_name,
-            "case_details": self.case_details.to_dict() if self.case_details else None,
-            "purpose": self.purpose,
-        }
-
-@dataclass
+LISTING_COLUMNS = (
+    "serial_number", "listing_date", "court_name", "court_number", "judge_name", "purpose",
+    "cnr", "case_type", "case_number", "case_year", "petitioner", "respondent",
+)
+_listing_fields = attrgetter(*LISTING_COLUMNS[:6])
+_listing_case_fields = attrgetter(*LISTING_COLUMNS[6:])
+_EMPTY_CASE_ROW = (None,) * len(LISTING_COLUMNS[6:])
+
+def listing_row(listing: CaseListing) -> Tuple:
+    details = listing.case_details
+    return _listing_fields(listing) + (_listing_case_fields(details) if details is not None else _EMPTY_CASE_ROW)
+
+@model(nested_lists={"listings": CaseListing})
 class CauseList:
     date: str
     court_complex: Optional[str] = None
     total_cases: int = 0
     listings: List[CaseListing] = field(default_factory=list)
 
-    def to_dict(self):
-        return {
-            "date": self.date,
-            "court_complex": self.court_complex,
-            "total_cases": self.total_cases,
-            "listings": [listing.to_dict() for listing in self.listings]
-        }
     def add_listing(self, listing: CaseListing):
         self.listings.append(listing)
         self.total_cases = len(self.listings)
 
-@dataclass
+    def to_rows(self) -> List[Tuple]:
+        return [listing_row(listing) for listing in self.listings]
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        rows = self.to_rows()
+        if not rows:
+            return {column: [] for column in LISTING_COLUMNS}
+        return {column: list(values) for column, values in zip(LISTING_COLUMNS, zip(*rows))}
+
+@model(nested={"case_details": CaseDetails, "listing_info": CaseListing})
 class SearchResult:
     success: bool = False
     message: str = ""
@@ -87,15 +152,49 @@ class SearchResult:
     is_listed: bool = False
     listing_info: Optional[CaseListing] = None
     error: Optional[str] = None
+    failure_reason: Optional[str] = None
     search_timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
 
-    def to_dict(self):
-        return {
-            "success": self.success,
-            "message": self.message,
-            "case_details": self.case_details.to_dict() if self.case_details else None,
-            "is_listed": self.is_listed,
-            "listing_info": self.listing_info.to_dict() if self.listing_info else None,
-            "error": self.error,
-            "search_timestamp": self.search_timestamp,
-        }
+@model
+class CaseOrder:
+    url: str
+    order_number: Optional[str] = None
+    order_date: Optional[str] = None
+    description: Optional[str] = None
+
+@model(nested={"order": CaseOrder})
+class OrderDownload:
+    order: CaseOrder
+    cnr: Optional[str] = None
+    status: str = "failed"
+    path: Optional[str] = None
+    sha256: Optional[str] = None
+    size: int = 0
+    error: Optional[str] = None
+
+@model(nested={"case_details": CaseDetails})
+class WatchEntry:
+    cnr: str
+    case_details: Optional[CaseDetails] = None
+    content_hash: Optional[str] = None
+    next_hearing_date: Optional[str] = None
+    last_checked: Optional[str] = None
+    last_changed: Optional[str] = None
+
+@model
+class ListingChange:
+    key: str
+    kind: str
+    cnr: Optional[str] = None
+    case_number: Optional[str] = None
+    court_complex: Optional[str] = None
+    old_date: Optional[str] = None
+    new_date: Optional[str] = None
+    changes: Dict[str, List[Any]] = field(default_factory=dict)
+
+@model
+class CaseChange:
+    cnr: str
+    is_new: bool = False
+    changes: Dict[str, List[Any]] = field(default_factory=dict)
+    checked_at: str = field(default_factory=lambda: datetime.now().isoformat())
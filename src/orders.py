@@ -0,0 +1,226 @@
+"""
+Order and judgment PDF downloads
+Streams order PDFs to disk over one pooled session, resumes partial files and keeps each distinct file once
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import PDF_DIR, PDF_CONCURRENCY, PDF_CHUNK_SIZE, REQUEST_TIMEOUT, USER_AGENT
+from metrics import MetricsRegistry, REGISTRY
+from models import CaseOrder, OrderDownload
+from ratelimit import HostRateLimiter
+from resilience import Resilience
+from utils import setup_logger, sanitize_filename
+
+STATUS_DOWNLOADED = "downloaded"
+STATUS_DUPLICATE = "duplicate"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+PDF_MAGIC = b"%PDF"
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _endpoint(url: str) -> str:
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class OrderDownloader:
+    """
+    Concurrent PDF downloader with resume and content-hash dedup
+    Responses are streamed in chunk_size pieces to partial/<url hash>.part and
+    hashed on the way; an interrupted download resumes with a Range request.
+    Finished files live once under by-hash/ and are linked into a folder per
+    CNR. manifest.json maps each order URL to its file, so orders already on
+    disk are skipped without a request.
+    """
+    def __init__(self,
+                 directory: str = PDF_DIR,
+                 concurrency: int = PDF_CONCURRENCY,
+                 cookies: Optional[requests.cookies.RequestsCookieJar] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 resilience: Optional[Resilience] = None,
+                 timeout: float = REQUEST_TIMEOUT,
+                 chunk_size: int = PDF_CHUNK_SIZE,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.logger = setup_logger()
+        self.directory = directory
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics or REGISTRY
+        self.resilience = resilience or Resilience(metrics=self.metrics)
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if cookies is not None:
+            self.session.cookies.update(cookies)
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._manifest: Dict[str, Dict] = {}
+        self._dirty = False
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self._manifest = json.load(f)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "by-hash", digest[:2], f"{digest}.pdf")
+
+    def _part_path(self, url: str) -> str:
+        return os.path.join(self.directory, "partial", f"{_url_key(url)}.part")
+
+    def _case_path(self, order: CaseOrder, cnr: str) -> str:
+        name = "_".join(part for part in (order.order_date, order.order_number) if part)
+        name = sanitize_filename(f"{name}_{_url_key(order.url)[:8]}" if name else _url_key(order.url)[:12])
+        return os.path.join(self.directory, sanitize_filename(cnr), f"{name}.pdf")
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def download(self, order: CaseOrder, cnr: Optional[str] = None) -> OrderDownload:
+        # One download per URL at a time: the second caller finds it in the manifest
+        with self._url_lock(order.url):
+            result = self._download(order, cnr)
+        self.metrics.inc("ecourts_pdf_downloads_total", status=result.status)
+        return result
+
+    def _download(self, order: CaseOrder, cnr: Optional[str]) -> OrderDownload:
+        entry = self._manifest.get(order.url)
+        if entry and os.path.exists(self._object_path(entry["sha256"])):
+            return OrderDownload(order=order, cnr=cnr, status=STATUS_SKIPPED,
+                                 path=self._link(entry["sha256"], order, cnr),
+                                 sha256=entry["sha256"], size=entry["size"])
+        try:
+            digest, size = self.resilience.call(_endpoint(order.url), self._fetch, order.url)
+        except Exception as e:
+            self.logger.warning(f"⚠ Could not download {order.url}: {e}")
+            return OrderDownload(order=order, cnr=cnr, status=STATUS_FAILED, error=str(e))
+        object_path = self._object_path(digest)
+        with self._lock:
+            duplicate = os.path.exists(object_path)
+            if duplicate:
+                os.remove(self._part_path(order.url))
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(self._part_path(order.url), object_path)
+            self._manifest[order.url] = {"sha256": digest, "size": size}
+            self._dirty = True
+        self.metrics.inc("ecourts_pdf_bytes_total", size)
+        return OrderDownload(order=order, cnr=cnr, status=STATUS_DUPLICATE if duplicate else STATUS_DOWNLOADED,
+                             path=self._link(digest, order, cnr), sha256=digest, size=size)
+
+    def _fetch(self, url: str) -> Tuple[str, int]:
+        """
+        Streams url into its partial file, resuming from what is already there; returns (sha256, size)
+        """
+        part_path = self._part_path(url)
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+        hasher = hashlib.sha256()
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            # 416 on a resume means the partial file already holds the whole document
+            complete = offset and response.status_code == 416
+            if not complete:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    offset = 0
+            if offset:
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                        hasher.update(chunk)
+            if not complete:
+                with open(part_path, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+                        hasher.update(chunk)
+        with open(part_path, 'rb') as f:
+            is_pdf = f.read(len(PDF_MAGIC)) == PDF_MAGIC
+        if not is_pdf:
+            os.remove(part_path)
+            raise ValueError("Response is not a PDF")
+        return hasher.hexdigest(), os.path.getsize(part_path)
+
+    def _link(self, digest: str, order: CaseOrder, cnr: Optional[str]) -> str:
+        object_path = self._object_path(digest)
+        if not cnr:
+            return object_path
+        case_path = self._case_path(order, cnr)
+        if not os.path.exists(case_path):
+            os.makedirs(os.path.dirname(case_path), exist_ok=True)
+            try:
+                os.link(object_path, case_path)
+            except OSError:
+                shutil.copyfile(object_path, case_path)
+        return case_path
+
+    def download_many(self, items: Iterable[Tuple[Optional[str], CaseOrder]]) -> Iterator[OrderDownload]:
+        """
+        Downloads (cnr, order) pairs on concurrency threads and yields results as they finish;
+        only 2 * concurrency downloads are queued at a time
+        """
+        pending = set()
+        item_iter = iter(items)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                try:
+                    while True:
+                        for cnr, order in item_iter:
+                            pending.add(executor.submit(self.download, order, cnr))
+                            if len(pending) >= self.concurrency * 2:
+                                break
+                        if not pending:
+                            break
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                finally:
+                    for future in pending:
+                        future.cancel()
+        finally:
+            self.save()
+
+    def download_all(self, orders: Iterable[CaseOrder], cnr: Optional[str] = None) -> Iterator[OrderDownload]:
+        return self.download_many((cnr, order) for order in orders)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._manifest)
+            self._dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def close(self):
+        self.save()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,217 @@
+"""
+HTML parsers for eCourts result pages
+Single-pass lxml parsing with a precompiled label-to-field dispatch
+"""
+import re
+from functools import lru_cache
+from typing import Optional, List
+from urllib.parse import urljoin
+
+from lxml import html as lxml_html
+
+from config import CASE_DETAILS_CONTAINER_IDS, CAUSE_LIST_CONTAINER_IDS, ORDER_LINK_MARKERS
+from models import CaseDetails, CaseListing, CauseList, CaseOrder
+
+# Ordered like the original if/elif chain: the first alternative that matches wins.
+_LABEL_PATTERN = re.compile(
+    r"(?:"
+    r"(?P<case_number>(?=.*case)(?=.*number))"
+    r"|(?P<case_type>(?=.*case)(?=.*type))"
+    r"|(?P<case_year>(?=.*year))"
+    r"|(?P<petitioner>(?=.*(?:petitioner|plaintiff)))"
+    r"|(?P<respondent>(?=.*(?:respondent|defendant)))"
+    r"|(?P<court_name>(?=.*court)(?=.*name))"
+    r"|(?P<filing_date>(?=.*filing)(?=.*date))"
+    r"|(?P<registration_date>(?=.*registration)(?=.*date))"
+    r"|(?P<status>(?=.*status))"
+    r"|(?P<judge_name>(?=.*judge))"
+    r"|(?P<next_hearing_date>(?=.*next)(?=.*(?:hearing|date)))"
+    r")",
+    re.DOTALL
+)
+
+_COLUMN_PATTERN = re.compile(
+    r"(?:"
+    r"(?P<serial_number>(?=.*(?:sr|sl\.|s\.no|serial)))"
+    r"|(?P<case>(?=.*case))"
+    r"|(?P<parties>(?=.*part))"
+    r"|(?P<advocate>(?=.*advocate))"
+    r"|(?P<purpose>(?=.*(?:purpose|stage)))"
+    r")",
+    re.DOTALL
+)
+DEFAULT_CAUSE_LIST_COLUMNS = ["serial_number", "case", "parties", "advocate"]
+
+CASE_NUMBER_PATTERN = re.compile(r"(?P<type>[A-Za-z][A-Za-z0-9.()\s]*?)\s*/\s*(?P<number>\d+)\s*/\s*(?P<year>\d{4})")
+CNR_PATTERN = re.compile(r"\b[A-Z]{4}\d{12}\b")
+_COURT_HEADER_PATTERN = re.compile(r"^court\s*(?:no\.?|number)\s*:?\s*(?P<number>\d+)\s*[:\-]?\s*(?P<name>.*)$", re.IGNORECASE)
+_JUDGE_HEADER_PATTERN = re.compile(r"^judge\s*[:\-]\s*(?P<name>.+)$", re.IGNORECASE)
+_PARTY_SEPARATOR = re.compile(r"\s+(?:versus|vs\.?|v/s)\s+", re.IGNORECASE)
+_ORDER_LINK_PATTERN = re.compile("|".join(re.escape(marker) for marker in ORDER_LINK_MARKERS), re.IGNORECASE)
+_QUOTED = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+def _container_xpath(container_ids: List[str]) -> str:
+    return " | ".join(f"//*[@id='{container_id}']" for container_id in container_ids)
+
+
+_CONTAINER_XPATH = _container_xpath(CASE_DETAILS_CONTAINER_IDS)
+_CAUSE_LIST_CONTAINER_XPATH = _container_xpath(CAUSE_LIST_CONTAINER_IDS)
+
+
+@lru_cache(maxsize=1024)
+def classify_label(label: str) -> Optional[str]:
+    match = _LABEL_PATTERN.match(label.lower())
+    return match.lastgroup if match else None
+
+
+@lru_cache(maxsize=256)
+def classify_column(header: str) -> Optional[str]:
+    match = _COLUMN_PATTERN.match(header.lower())
+    return match.lastgroup if match else None
+
+
+def _cells(row) -> List:
+    return [child for child in row if child.tag == 'td' or child.tag == 'th']
+
+
+def _cell_text(cell) -> str:
+    return "".join(text.strip() for text in cell.itertext())
+
+
+def _cell_words(cell) -> str:
+    return " ".join(text.strip() for text in cell.itertext() if text.strip())
+
+
+def _attribute_text(row) -> str:
+    return " ".join(value for element in row.iter() for value in element.attrib.values())
+
+
+def _scoped_tables(page_source: str, container_xpath: str) -> List:
+    root = lxml_html.fromstring(page_source)
+    containers = root.xpath(container_xpath) if container_xpath else []
+    if containers:
+        tables = []
+        for container in containers:
+            if container.tag == 'table':
+                tables.append(container)
+            else:
+                tables.extend(container.iter('table'))
+        return list(dict.fromkeys(tables))
+    return list(root.iter('table'))
+
+
+def _detail_tables(page_source: str) -> List:
+    return _scoped_tables(page_source, _CONTAINER_XPATH)
+
+
+def parse_case_details(page_source: str) -> Optional[CaseDetails]:
+    tables = _detail_tables(page_source)
+    if not tables:
+        return None
+    case = CaseDetails()
+    for table in tables:
+        for row in table.iter('tr'):
+            cells = _cells(row)
+            if len(cells) < 2:
+                continue
+            field_name = classify_label(_cell_text(cells[0]))
+            if field_name:
+                setattr(case, field_name, _cell_text(cells[1]))
+    return case if case.case_number else None
+
+
+def parse_cause_list(page_source: str, date: str, court_complex: Optional[str] = None) -> CauseList:
+    cause_list = CauseList(date=date, court_complex=court_complex)
+    court_name = court_number = judge_name = section_purpose = None
+    for table in _scoped_tables(page_source, _CAUSE_LIST_CONTAINER_XPATH):
+        columns = None
+        for row in table.iter('tr'):
+            cells = _cells(row)
+            if not cells:
+                continue
+            if columns is None and any(cell.tag == 'th' for cell in cells):
+                headers = [classify_column(_cell_words(cell)) for cell in cells]
+                if any(headers):
+                    columns = headers
+                    continue
+            if len(cells) == 1:
+                text = _cell_words(cells[0])
+                court_match = _COURT_HEADER_PATTERN.match(text)
+                judge_match = _JUDGE_HEADER_PATTERN.match(text)
+                if court_match:
+                    court_number = court_match.group("number")
+                    court_name = court_match.group("name") or None
+                elif judge_match:
+                    judge_name = judge_match.group("name")
+                elif text:
+                    section_purpose = text
+                continue
+            values = dict(zip(columns or DEFAULT_CAUSE_LIST_COLUMNS, cells))
+            case_cell = values.get("case")
+            if case_cell is None:
+                continue
+            case_text = _cell_words(case_cell)
+            case_match = CASE_NUMBER_PATTERN.search(case_text)
+            if not case_match:
+                continue
+            details = CaseDetails(
+                case_type=case_match.group("type").strip(),
+                case_number=case_match.group("number"),
+                case_year=case_match.group("year"),
+                court_name=court_name,
+                court_number=court_number,
+                judge_name=judge_name,
+            )
+            cnr_match = CNR_PATTERN.search(_attribute_text(row) + " " + case_text)
+            if cnr_match:
+                details.cnr = cnr_match.group(0)
+            if "parties" in values:
+                parties = _PARTY_SEPARATOR.split(_cell_words(values["parties"]), maxsplit=1)
+                details.petitioner = parties[0] or None
+                details.respondent = parties[1] if len(parties) > 1 else None
+            serial_text = _cell_text(values["serial_number"]) if "serial_number" in values else ""
+            purpose = _cell_words(values["purpose"]) if "purpose" in values else None
+            cause_list.add_listing(CaseListing(
+                serial_number=int(serial_text) if serial_text.isdigit() else None,
+                listing_date=date,
+                court_name=court_name,
+                court_number=court_number,
+                judge_name=judge_name,
+                case_details=details,
+                purpose=purpose or section_purpose,
+            ))
+    return cause_list
+
+
+def _order_link(anchor) -> Optional[str]:
+    href = (anchor.get('href') or '').strip()
+    if href and not href.startswith(('#', 'javascript:')) and _ORDER_LINK_PATTERN.search(href):
+        return href
+    # The portal opens most orders through onclick="displayPdf('...')" rather than an href
+    for quoted in _QUOTED.findall(anchor.get('onclick') or ''):
+        if _ORDER_LINK_PATTERN.search(quoted):
+            return quoted
+    return None
+
+
+def parse_case_orders(page_source: str, page_url: str) -> List[CaseOrder]:
+    """
+    Order and judgment PDF links on a case status page, with the order number
+    and date from the row they sit in; each URL appears once
+    """
+    orders = {}
+    for anchor in lxml_html.fromstring(page_source).iter('a'):
+        link = _order_link(anchor)
+        if link is None:
+            continue
+        url = urljoin(page_url, link)
+        if url in orders:
+            continue
+        row = next((parent for parent in anchor.iterancestors() if parent.tag == 'tr'), None)
+        cells = [_cell_words(cell) for cell in _cells(row)] if row is not None else []
+        # Order tables run: order number, order date, link
+        number, date = (cells[0] or None, cells[1] or None) if len(cells) >= 3 else (None, None)
+        orders[url] = CaseOrder(url=url, order_number=number, order_date=date,
+                                description=_cell_words(anchor) or None)
+    return list(orders.values())
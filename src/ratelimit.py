@@ -0,0 +1,30 @@
+"""
+Rate limiting helpers for the eCourts scraper
+Keeps concurrent workers from hammering the same portal host
+"""
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+from config import HOST_MIN_INTERVAL
+
+
+class HostRateLimiter:
+    """
+    Thread-safe limiter that spaces requests to each host at least min_interval seconds apart
+    """
+    def __init__(self, min_interval: float = HOST_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,237 @@
+"""
+Retries and circuit breaking for portal requests
+Classifies failures, retries the transient ones with jittered exponential backoff and stops calling an endpoint while it keeps failing
+"""
+import asyncio
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+
+from config import (
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_BUDGETS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+)
+from captcha import CaptchaRequiredError
+from metrics import MetricsRegistry, REGISTRY
+from utils import setup_logger
+
+# Failure reasons are ERROR_MESSAGES keys; these ones mean the portal itself is unhealthy
+PORTAL_FAILURES = frozenset({"timeout", "no_connection", "server_error", "rate_limited"})
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+@lru_cache(maxsize=None)
+def _httpx_errors() -> Tuple[tuple, tuple]:
+    try:
+        import httpx
+    except ImportError:
+        return (), ()
+    return (httpx.TimeoutException,), (httpx.TransportError,)
+
+
+def failure_status(error: BaseException) -> Optional[int]:
+    return getattr(getattr(error, "response", None), "status_code", None)
+
+
+def classify_failure(error: BaseException) -> str:
+    """
+    Maps an exception from the HTTP transports or the browser onto an ERROR_MESSAGES key
+    """
+    httpx_timeouts, httpx_transport_errors = _httpx_errors()
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, CaptchaRequiredError):
+        return "captcha_required"
+    if isinstance(error, (TimeoutException, requests.Timeout, TimeoutError, asyncio.TimeoutError) + httpx_timeouts):
+        return "timeout"
+    if isinstance(error, NoSuchElementException):
+        return "element_missing"
+    status = failure_status(error)
+    if status == 429:
+        return "rate_limited"
+    if status is not None and status >= 500:
+        return "server_error"
+    if isinstance(error, (requests.ConnectionError, ConnectionError) + httpx_transport_errors):
+        return "no_connection"
+    if isinstance(error, WebDriverException) and "net::ERR_" in (error.msg or ""):
+        return "no_connection"
+    return "unexpected"
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff with a retry budget per failure reason
+    Retry n waits between half and all of base_delay * 2**n (capped at max_delay),
+    or the Retry-After the portal asked for. Reasons without a budget are not retried.
+    """
+    def __init__(self, budgets: Dict[str, int] = RETRY_BUDGETS,
+                 base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY):
+        self.budgets = dict(budgets)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def retries(self, reason: str) -> int:
+        return self.budgets.get(reason, 0)
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        hinted = retry_after(error) if error is not None else None
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "probing")
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker keyed by endpoint URL
+    After failure_threshold consecutive portal failures the endpoint is open and
+    calls fail fast with CircuitOpenError. Once reset_timeout seconds have passed
+    a single trial call is let through: success closes the circuit, failure
+    opens it again.
+    """
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def state(self, endpoint: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None or circuit.opened_at is None:
+                return "closed"
+            if circuit.probing or self.clock() < circuit.opened_at + self.reset_timeout:
+                return "open"
+            return "half_open"
+
+    def acquire(self, endpoint: str):
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            if circuit.opened_at is None:
+                return
+            retry_in = circuit.opened_at + self.reset_timeout - self.clock()
+            if retry_in > 0 or circuit.probing:
+                raise CircuitOpenError(endpoint, max(retry_in, 0))
+            circuit.probing = True
+
+    def record_success(self, endpoint: str):
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.probing = False
+
+    def record_failure(self, endpoint: str):
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            circuit.failures += 1
+            if circuit.probing or circuit.failures >= self.failure_threshold:
+                circuit.opened_at = self.clock()
+            circuit.probing = False
+
+    def release(self, endpoint: str):
+        """
+        Ends a call that failed for a reason unrelated to the portal's health
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is not None:
+                circuit.probing = False
+
+
+class Resilience:
+    """
+    Runs portal calls under a RetryPolicy and a CircuitBreaker
+    Share one instance between the scrapers of a batch so every worker sees the same circuits.
+    """
+    def __init__(self, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.logger = setup_logger()
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or REGISTRY
+        self.sleep = sleep
+
+    def call(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            self.breaker.acquire(endpoint)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._failed(endpoint, attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                self.sleep(delay)
+                continue
+            self.breaker.record_success(endpoint)
+            return result
+
+    async def call_async(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            self.breaker.acquire(endpoint)
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._failed(endpoint, attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success(endpoint)
+            return result
+
+    def _failed(self, endpoint: str, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Records a failed call and returns how long to wait before retrying it, or None to give up
+        """
+        reason = classify_failure(error)
+        if reason in PORTAL_FAILURES:
+            self.breaker.record_failure(endpoint)
+        else:
+            self.breaker.release(endpoint)
+        if attempt >= self.policy.retries(reason) or self.breaker.state(endpoint) != "closed":
+            return None
+        delay = self.policy.delay(attempt, error)
+        self.metrics.inc("ecourts_retries_total", reason=reason)
+        self.logger.warning(f"⚠ {reason} (attempt {attempt + 1}) - retrying in {delay:.1f}s")
+        return delay
@@ -3,176 +3,292 @@ Core web scraping functionality for eCourts
 This file contains the main ECourtsScraper class
 """
 import time
-import requests
-from typing import Optional, Dict, Any
-from selenium import webdriver
+from typing import Optional, Dict, Any, List
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
 
 from config import *
-from models import CaseDetails, CaseListing, SearchResult, CauseList
+from models import CaseDetails, CaseListing, SearchResult, CauseList, CourtSelector, CaseOrder
 from utils import setup_logger, get_date_string, validate_cnr
+from transport import Transport, HttpTransport, court_form_fields, captcha_rejected
+from captcha import CaptchaQueue, CaptchaRequiredError
+from parser import parse_case_details, parse_case_orders, parse_cause_list
+from cache import ResponseCache, case_key, CASE_STATUS_KIND
+from causelist_index import CauseListIndexRegistry
+from ratelimit import HostRateLimiter
+from browser_pool import BrowserPool
+from metrics import MetricsRegistry, REGISTRY
+from resilience import Resilience, classify_failure
+from waits import (
+    StepTimer,
+    AdaptiveDelay,
+    wait_for_document_ready,
+    wait_for_ajax_idle,
+    wait_for_element
+)
 
 class ECourtsScraper:
     """
     Main scraper class for eCourts portal
     """
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, backend: str = DEFAULT_BACKEND,
+                 transport: Optional[Transport] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 pool: Optional[BrowserPool] = None,
+                 cache: Optional[ResponseCache] = None,
+                 refresh: bool = False,
+                 court: Optional[CourtSelector] = None,
+                 cause_lists: Optional[CauseListIndexRegistry] = None,
+                 captcha: Optional[CaptchaQueue] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 resilience: Optional[Resilience] = None):
         self.logger = setup_logger()
         self.logger.info("Initializing eCourts Scraper...")
         self.headless = headless
-        self.driver = None
-        self.session = requests.Session()
-        self._setup_browser()
+        self.rate_limiter = rate_limiter
+        self.pool = pool
+        self._owns_pool = False
+        self.cache = cache
+        self.refresh = refresh
+        self.court = court
+        self.cause_lists = cause_lists or CauseListIndexRegistry()
+        self.metrics = metrics or REGISTRY
+        self.timer = StepTimer(self.metrics)
+        self.resilience = resilience or Resilience(metrics=self.metrics)
+        self.politeness = AdaptiveDelay()
+        self._last_case_page = None
+        self.captcha = captcha
+        self._owns_captcha = captcha is None
+        if self.captcha is None:
+            self.captcha = CaptchaQueue()
+        if transport is None and backend == BACKEND_HTTP:
+            transport = HttpTransport(rate_limiter=rate_limiter, captcha=self.captcha)
+        self.transport = transport
+        if self.transport is None:
+            self._get_pool().start()
         self.logger.info("✓ Scraper initialized successfully")
-    
-    def _setup_browser(self):
-        from selenium.webdriver.chrome.options import Options
-        from webdriver_manager.chrome import ChromeDriverManager
-        from selenium.webdriver.chrome.service import Service
-
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument(f"--window-size={WINDOW_SIZE}")
-        chrome_options.add_argument(f"user-agent={USER_AGENT}")
-
-        if DISABLE_IMAGES:
-            prefs = {"profile.managed_default_content_settings.images": 2}
-            chrome_options.add_experimental_option("prefs", prefs)
-
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
 
-        try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.implicitly_wait(IMPLICIT_WAIT)
-            self.logger.info("✓ Browser initialized")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize browser: {e}")
-            raise
-    
+    def _get_pool(self) -> BrowserPool:
+        if self.pool is None:
+            self.pool = BrowserPool(size=1, headless=self.headless)
+            self._owns_pool = True
+        return self.pool
+
+    def _throttle(self, url: str):
+        self.politeness.wait()
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+
     def search_by_cnr(self, cnr: str, check_listing: bool = True) -> SearchResult:
         self.logger.info(f"Searching for case with CNR: {cnr}")
         is_valid, message = validate_cnr(cnr)
         if not is_valid:
             self.logger.error(f"Invalid CNR: {message}")
+            self.metrics.inc("ecourts_lookups_total", outcome="invalid_cnr")
             return SearchResult(
                 success=False,
                 message=message,
-                error="Invalid CNR"
+                error="Invalid CNR",
+                failure_reason="invalid_cnr"
             )
+        self.timer.reset()
+        outcome = "unexpected"
+        start = time.perf_counter()
         try:
-            self.driver.get(CASE_STATUS_URL)
-            self.logger.info("✓ Loaded case status page")
-            time.sleep(2)
-            try:
-                cnr_radio = self.driver.find_element(By.ID, "radCNR")
-                cnr_radio.click()
-                self.logger.info("✓ Selected CNR search option")
-                time.sleep(1)
-                cnr_input = self.driver.find_element(By.ID, "cnr_number")
-                cnr_input.clear()
-                cnr_input.send_keys(cnr)
-                self.logger.info("✓ Entered CNR number")
-
-                self.logger.warning("⚠ CAPTCHA detected - Manual intervention required")
-                self.logger.info("Please solve the CAPTCHA in the browser window...")
-                self.logger.info("The script will continue after you submit the form")
-                input("Press Enter after you've solved the CAPTCHA and clicked 'Go'...")
-
-                WebDriverWait(self.driver, EXPLICIT_WAIT).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "table"))
-                )
-                self.logger.info("✓ Results page loaded")
-                case_details = self._parse_case_details()
-                if case_details:
-                    self.logger.info("✓ Case found successfully")
-                    listing_info = None
-                    is_listed = False
-                    if check_listing:
-                        self.logger.info("Checking case listing status...")
+            case_details = self._load_case_details(cnr)
+            if case_details:
+                self.logger.info("✓ Case found successfully")
+                listing_info = None
+                is_listed = False
+                if check_listing:
+                    self.logger.info("Checking case listing status...")
+                    with self.timer.step("listing"):
                         is_listed, listing_info = self._check_case_listing(case_details)
-                    return SearchResult(
-                        success=True,
-                        message="Case found successfully",
-                        case_details=case_details,
-                        is_listed=is_listed,
-                        listing_info=listing_info
-                    )
-                else:
-                    return SearchResult(
-                        success=False,
-                        message="Case not found",
-                        error="No case data found for this CNR"
-                    )
-            except NoSuchElementException as e:
-                self.logger.error(f"Element not found: {e}")
+                outcome = "success"
+                return SearchResult(
+                    success=True,
+                    message="Case found successfully",
+                    case_details=case_details,
+                    is_listed=is_listed,
+                    listing_info=listing_info
+                )
+            else:
+                outcome = "case_not_found"
                 return SearchResult(
                     success=False,
-                    message="Failed to locate search elements",
-                    error=str(e)
-                )   
+                    message="Case not found",
+                    error="No case data found for this CNR",
+                    failure_reason=outcome
+                )
+        except NoSuchElementException as e:
+            self.logger.error(f"Element not found: {e}")
+            outcome = "element_missing"
+            return SearchResult(
+                success=False,
+                message="Failed to locate search elements",
+                error=str(e),
+                failure_reason=outcome
+            )
         except TimeoutException:
             self.logger.error("Request timed out")
+            outcome = "timeout"
             return SearchResult(
                 success=False,
                 message="Request timed out",
-                error="The server took too long to respond"
+                error="The server took too long to respond",
+                failure_reason=outcome
             )
         except Exception as e:
-            self.logger.error(f"Unexpected error: {e}")
+            outcome = classify_failure(e)
+            self.logger.error(f"Lookup failed ({outcome}): {e}")
             return SearchResult(
                 success=False,
-                message="An unexpected error occurred",
-                error=str(e)
+                message="An unexpected error occurred" if outcome == "unexpected" else ERROR_MESSAGES[outcome],
+                error=str(e),
+                failure_reason=outcome
             )
-    
-    def _parse_case_details(self) -> Optional[CaseDetails]:
+        finally:
+            self.metrics.inc("ecourts_lookups_total", outcome=outcome)
+            self.metrics.observe("ecourts_lookup_seconds", time.perf_counter() - start, outcome=outcome)
+            self._log_timings()
+
+    def _load_case_details(self, cnr: str) -> Optional[CaseDetails]:
+        key = case_key(cnr=cnr)
+        if self.cache and not self.refresh:
+            cached = self.cache.get_case_details(key)
+            if cached:
+                self.metrics.inc("ecourts_cache_requests_total", result="hit")
+                self.logger.info("✓ Loaded case details from cache")
+                return cached
+            self.metrics.inc("ecourts_cache_requests_total", result="miss")
         try:
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
-            case = CaseDetails()
-            tables = soup.find_all('table')
-            if not tables:
-                self.logger.warning("No tables found on page")
-                return None
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        label = cells[0].get_text(strip=True).lower()
-                        value = cells[1].get_text(strip=True)
-                        if 'case' in label and 'number' in label:
-                            case.case_number = value
-                        elif 'case' in label and 'type' in label:
-                            case.case_type = value
-                        elif 'year' in label:
-                            case.case_year = value
-                        elif 'petitioner' in label or 'plaintiff' in label:
-                            case.petitioner = value
-                        elif 'respondent' in label or 'defendant' in label:
-                            case.respondent = value
-                        elif 'court' in label and 'name' in label:
-                            case.court_name = value
-                        elif 'filing' in label and 'date' in label:
-                            case.filing_date = value
-                        elif 'registration' in label and 'date' in label:
-                            case.registration_date = value
-                        elif 'status' in label:
-                            case.status = value
-                        elif 'judge' in label:
-                            case.judge_name = value
-                        elif 'next' in label and ('hearing' in label or 'date' in label):
-                            case.next_hearing_date = value
-            return case if case.case_number else None
+            page_source = self.resilience.call(CASE_STATUS_URL, self._fetch_case_status, cnr)
+        except Exception as e:
+            # Filing and registration data outlive the volatile TTL: serve them with the hearing fields cleared
+            stale = self.cache.get_case_details(key, stable_only=True) if self.cache and not self.refresh else None
+            if stale is None:
+                raise
+            self.metrics.inc("ecourts_cache_requests_total", result="stable")
+            self.logger.warning(f"⚠ Portal lookup failed ({e}) - serving cached filing details without hearing data")
+            return stale
+        self._last_case_page = (cnr, page_source)
+        with self.timer.step("parse"):
+            case_details = self._parse_case_details(page_source)
+        if case_details and self.cache:
+            self.cache.put_case_details(key, case_details, html=page_source)
+        return case_details
+
+    def fetch_case_orders(self, cnr: str) -> List[CaseOrder]:
+        """
+        Order and judgment PDF links for a case, reusing the page of the last lookup or the cache when possible
+        """
+        page_source = None
+        if self._last_case_page and self._last_case_page[0] == cnr:
+            page_source = self._last_case_page[1]
+        elif self.cache and not self.refresh:
+            entry = self.cache.get(CASE_STATUS_KIND, case_key(cnr=cnr))
+            page_source = entry.get("html") if entry else None
+        if not page_source:
+            page_source = self.resilience.call(CASE_STATUS_URL, self._fetch_case_status, cnr)
+        return parse_case_orders(page_source, CASE_STATUS_URL)
+
+    def order_cookies(self):
+        """
+        Portal session cookies for order downloads, when the HTTP backend holds them
+        """
+        return self.transport.session.cookies if isinstance(self.transport, HttpTransport) else None
+
+    def _fetch_case_status(self, cnr: str) -> str:
+        page_source = self._fetch_with_transport(self.transport.fetch_case_status, cnr) if self.transport else None
+        if page_source is None:
+            page_source = self._fetch_case_status_with_browser(cnr)
+        return page_source
+
+    def _log_timings(self):
+        steps = ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.timer.timings.items())
+        self.logger.debug(f"Step timings: {steps}")
+
+    def _fetch_with_transport(self, fetch, *args) -> Optional[str]:
+        """
+        Fetches a page over the transport; None means the page needs a browser
+        HTTP errors, timeouts and connection failures propagate, so Resilience
+        retries them and counts them against the endpoint's circuit instead of
+        a browser being started for a portal that is down.
+        """
+        self.politeness.wait()
+        with self.timer.step("fetch"):
+            page_source = fetch(*args)
+        self.politeness.observe(self.timer.timings["fetch"])
+        if page_source is None:
+            self.metrics.inc("ecourts_transport_fallbacks_total", backend=self.transport.name, reason="javascript")
+            self.logger.info(f"{self.transport.name} backend needs JavaScript - falling back to browser")
+        else:
+            self.logger.info(f"✓ Fetched page via {self.transport.name} backend")
+        return page_source
+
+    def _fetch_case_status_with_browser(self, cnr: str) -> str:
+        with self._get_pool().lease() as driver:
+            with self.timer.step("page_load"):
+                if driver.current_url != CASE_STATUS_URL:
+                    self._throttle(CASE_STATUS_URL)
+                    driver.get(CASE_STATUS_URL)
+                wait_for_document_ready(driver)
+                cnr_radio = wait_for_element(driver, (By.ID, "radCNR"), clickable=True)
+            self.politeness.observe(self.timer.timings["page_load"])
+            self.logger.info("✓ Loaded case status page")
+            with self.timer.step("form_fill"):
+                cnr_radio.click()
+                self.logger.info("✓ Selected CNR search option")
+                wait_for_ajax_idle(driver)
+                cnr_input = wait_for_element(driver, (By.ID, "cnr_number"), clickable=True)
+                cnr_input.clear()
+                cnr_input.send_keys(cnr)
+                self.logger.info("✓ Entered CNR number")
+
+            with self.timer.step("captcha"):
+                self._submit_with_captcha(driver)
+
+            with self.timer.step("results"):
+                WebDriverWait(driver, EXPLICIT_WAIT).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "table"))
+                )
+                wait_for_ajax_idle(driver)
+            self.logger.info("✓ Results page loaded")
+            self._share_session(driver)
+            return driver.page_source
+
+    def _submit_with_captcha(self, driver):
+        for attempt in range(CAPTCHA_ATTEMPTS):
+            has_captcha = CAPTCHA_IMAGE_ID in driver.page_source
+            if has_captcha:
+                self.logger.warning("⚠ CAPTCHA detected - waiting for the solver queue")
+                image = driver.find_element(By.ID, CAPTCHA_IMAGE_ID).screenshot_as_png
+                answer = self.captcha.solve(image)
+                if answer is None:
+                    raise CaptchaRequiredError("CAPTCHA was not solved")
+                captcha_input = wait_for_element(driver, (By.ID, CAPTCHA_FORM_FIELD), clickable=True)
+                captcha_input.clear()
+                captcha_input.send_keys(answer)
+            driver.find_element(By.CSS_SELECTOR, CAPTCHA_SUBMIT_SELECTOR).click()
+            wait_for_ajax_idle(driver)
+            if not has_captcha or not captcha_rejected(driver.page_source):
+                self.logger.info("✓ Form submitted")
+                return
+            self.logger.warning(f"⚠ CAPTCHA rejected (attempt {attempt + 1}/{CAPTCHA_ATTEMPTS})")
+        raise CaptchaRequiredError(f"Portal rejected the CAPTCHA {CAPTCHA_ATTEMPTS} times")
+
+    def _share_session(self, driver):
+        if isinstance(self.transport, HttpTransport):
+            self.transport.adopt_cookies(driver.get_cookies())
+
+    def _parse_case_details(self, page_source: str) -> Optional[CaseDetails]:
+        try:
+            case = parse_case_details(page_source)
+            if case is None:
+                self.logger.warning("No case details found on page")
+            return case
         except Exception as e:
             self.logger.error(f"Error parsing case details: {e}")
             return None
@@ -196,26 +312,89 @@ class ECourtsScraper:
             return False, None
 
     def _check_cause_list_for_date(self, date: str, case_details: CaseDetails) -> Optional[CaseListing]:
-        self.logger.warning("Cause list checking not fully implemented - requires manual adaptation")
-        return None
+        court_key = self.court.key if self.court else "all"
+        index = self.cause_lists.get(court_key, date, lambda: self._download_cause_list(date, self.court))
+        if index is None:
+            self.logger.warning(f"No cause list available for {date}")
+            return None
+        return index.lookup(case_details)
 
-    def download_cause_list(self, date: Optional[str] = None) -> Optional[CauseList]:
+    def download_cause_list(self, date: Optional[str] = None,
+                            court: Optional[CourtSelector] = None) -> Optional[CauseList]:
         if date is None:
             date = get_date_string(0, "ecourts")
+        self.timer.reset()
+        cause_list = None
+        try:
+            cause_list = self._download_cause_list(date, court or self.court)
+            return cause_list
+        finally:
+            self.metrics.inc("ecourts_cause_list_downloads_total",
+                             outcome="success" if cause_list is not None else "error")
+            self._log_timings()
+
+    def _download_cause_list(self, date: str, court: Optional[CourtSelector]) -> Optional[CauseList]:
         self.logger.info(f"Downloading cause list for {date}")
         try:
-            self.driver.get(CAUSE_LIST_URL)
-            time.sleep(2)
-            self.logger.warning("Cause list download not fully implemented")
-            return None
+            page_source = self.fetch_cause_list_page(date, court)
+            with self.timer.step("parse"):
+                cause_list = parse_cause_list(page_source, date, court.key if court else None)
+            self.logger.info(f"✓ Cause list has {cause_list.total_cases} cases")
+            return cause_list
         except Exception as e:
-            self.logger.error(f"Error downloading cause list: {e}")
+            self.logger.error(f"Error downloading cause list ({classify_failure(e)}): {e}")
             return None
 
+    def fetch_cause_list_page(self, date: str, court: Optional[CourtSelector] = None) -> str:
+        """
+        Raw cause list page for one court and date, for callers that parse (or dedupe) pages themselves
+        """
+        return self.resilience.call(CAUSE_LIST_URL, self._fetch_cause_list, date, court)
+
+    def _fetch_cause_list(self, date: str, court: Optional[CourtSelector]) -> str:
+        page_source = self._fetch_with_transport(self.transport.fetch_cause_list, date, court) if self.transport else None
+        if page_source is None:
+            page_source = self._fetch_cause_list_with_browser(date, court)
+        return page_source
+
+    def _fetch_cause_list_with_browser(self, date: str, court: Optional[CourtSelector]) -> str:
+        with self._get_pool().lease() as driver:
+            with self.timer.step("page_load"):
+                self._throttle(CAUSE_LIST_URL)
+                driver.get(CAUSE_LIST_URL)
+                wait_for_document_ready(driver)
+                wait_for_ajax_idle(driver)
+            self.politeness.observe(self.timer.timings["page_load"])
+            self.logger.info("✓ Loaded cause list page")
+            with self.timer.step("form_fill"):
+                for field_id, value in court_form_fields(court).items():
+                    Select(wait_for_element(driver, (By.ID, field_id), clickable=True)).select_by_value(value)
+                    wait_for_ajax_idle(driver)
+                date_input = wait_for_element(driver, (By.ID, CAUSE_LIST_DATE_FIELD), clickable=True)
+                date_input.clear()
+                date_input.send_keys(date)
+                self.logger.info("✓ Entered cause list date")
+
+            with self.timer.step("captcha"):
+                self._submit_with_captcha(driver)
+
+            with self.timer.step("results"):
+                WebDriverWait(driver, EXPLICIT_WAIT).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "table"))
+                )
+                wait_for_ajax_idle(driver)
+            self.logger.info("✓ Cause list loaded")
+            self._share_session(driver)
+            return driver.page_source
+
     def close(self):
-        if self.driver:
-            self.driver.quit()
-            self.logger.info("✓ Browser closed")
+        if self.transport:
+            self.transport.close()
+        if self.pool and self._owns_pool:
+            self.pool.close()
+            self.pool = None
+        if self._owns_captcha:
+            self.captcha.close()
         
     def __enter__(self):
         return self
@@ -0,0 +1,326 @@
+"""
+Resident scraper service
+Keeps scrapers warm between lookups and answers them over a local HTTP/JSON API and a file-backed job queue
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import ExitStack
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from config import (
+    BATCH_CONCURRENCY,
+    DEFAULT_BACKEND,
+    ERROR_MESSAGES,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_LOOKUP_TIMEOUT,
+    SERVICE_MAX_BATCH,
+    QUEUE_DIR,
+    QUEUE_POLL_INTERVAL,
+)
+from batch import shared_scrapers
+from cache import ResponseCache
+from captcha import CaptchaQueue
+from metrics import MetricsRegistry, PrometheusTextSink, REGISTRY
+from models import SearchResult, CourtSelector
+from ratelimit import HostRateLimiter
+from resilience import Resilience
+from scraper import ECourtsScraper
+from utils import setup_logger
+
+# HTTP status for each failure reason; anything else is a 502 from the portal side
+FAILURE_STATUS = {
+    "invalid_cnr": 400,
+    "case_not_found": 404,
+    "circuit_open": 503,
+    "timeout": 504,
+}
+
+
+class ScraperService:
+    """
+    Long-lived pool of scrapers behind a coalescing submit()
+    Each worker thread keeps its scraper, and with it the HTTP session and any
+    leased browser, for the life of the service. Identical lookups that arrive
+    while one is in flight share its Future, so ten callers asking for the same
+    CNR cause one portal fetch.
+    """
+    def __init__(self,
+                 concurrency: int = BATCH_CONCURRENCY,
+                 headless: bool = True,
+                 backend: str = DEFAULT_BACKEND,
+                 cache: Optional[ResponseCache] = None,
+                 court: Optional[CourtSelector] = None,
+                 captcha: Optional[CaptchaQueue] = None,
+                 resilience: Optional[Resilience] = None,
+                 scraper_factory: Optional[Callable[[], ECourtsScraper]] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.logger = setup_logger()
+        self.concurrency = max(1, concurrency)
+        self.metrics = metrics or REGISTRY
+        self._stack = ExitStack()
+        if scraper_factory is None:
+            scraper_factory = self._stack.enter_context(shared_scrapers(
+                self.concurrency, headless, backend, HostRateLimiter(), cache, False,
+                court, captcha, resilience
+            ))
+        self._scraper_factory = scraper_factory
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="service")
+        self._local = threading.local()
+        self._scrapers: List[ECourtsScraper] = []
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, bool], Future] = {}
+
+    def _scraper(self) -> ECourtsScraper:
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            scraper = self._local.scraper = self._scraper_factory()
+            with self._lock:
+                self._scrapers.append(scraper)
+        return scraper
+
+    def _lookup(self, cnr: str, check_listing: bool) -> SearchResult:
+        try:
+            return self._scraper().search_by_cnr(cnr, check_listing=check_listing)
+        except Exception as e:
+            self.logger.error(f"Lookup of {cnr} failed: {e}")
+            return SearchResult(success=False, message=ERROR_MESSAGES["unexpected"],
+                                error=str(e), failure_reason="unexpected")
+
+    def submit(self, cnr: str, check_listing: bool = False) -> Future:
+        key = (cnr.strip().replace(" ", "").upper(), check_listing)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.metrics.inc("ecourts_service_requests_total", result="coalesced")
+                return future
+            future = self._in_flight[key] = self._executor.submit(self._lookup, key[0], check_listing)
+        self.metrics.inc("ecourts_service_requests_total", result="submitted")
+        # Registered outside the lock: the callback runs inline if the lookup already finished
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key: Tuple[str, bool], future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def lookup(self, cnr: str, check_listing: bool = False,
+               timeout: float = SERVICE_LOOKUP_TIMEOUT) -> SearchResult:
+        """
+        Blocking lookup; on timeout the fetch keeps running and a later call picks up its result
+        """
+        try:
+            return self.submit(cnr, check_listing).result(timeout=timeout)
+        except FutureTimeoutError:
+            return SearchResult(success=False, message=ERROR_MESSAGES["timeout"],
+                                error=f"No result within {timeout}s", failure_reason="timeout")
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for scraper in self._scrapers:
+            scraper.close()
+        self._stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def result_status(result: SearchResult) -> int:
+    if result.success:
+        return 200
+    return FAILURE_STATUS.get(result.failure_reason, 502)
+
+
+def _flag(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """
+    Local JSON API over a ScraperService
+
+    GET  /health                          service status
+    GET  /cases/<cnr>?check_listing=1     one SearchResult
+    POST /cases {"cnrs": [...], "check_listing": false}
+                                          {"results": {cnr: SearchResult}}, looked up in parallel
+    GET  /metrics                         Prometheus text
+    """
+    daemon_threads = True
+
+    def __init__(self, service: ScraperService, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                 timeout: float = SERVICE_LOOKUP_TIMEOUT):
+        self.service = service
+        self.lookup_timeout = timeout
+        super().__init__((host, port), _ServiceHandler)
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    server: ServiceHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def _error(self, status: int, message: str):
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        service = self.server.service
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok", "workers": service.concurrency,
+                                  "in_flight": service.in_flight()})
+        elif url.path == "/metrics":
+            body = PrometheusTextSink("").render(service.metrics)
+            self._send(200, body.encode('utf-8'), "text/plain; version=0.0.4")
+        elif url.path.startswith("/cases/"):
+            query = parse_qs(url.query)
+            check_listing = _flag(query.get("check_listing", ["0"])[0])
+            result = service.lookup(url.path[len("/cases/"):], check_listing, self.server.lookup_timeout)
+            self._send_json(result_status(result), result.to_dict())
+        else:
+            self._error(404, f"Unknown path {url.path}")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/cases":
+            self._error(404, f"Unknown path {url.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            cnrs = request["cnrs"]
+            if not isinstance(cnrs, list):
+                raise ValueError("'cnrs' must be a list")
+        except (KeyError, TypeError, ValueError) as e:
+            self._error(400, f"Expected {{\"cnrs\": [...]}}: {e}")
+            return
+        if len(cnrs) > SERVICE_MAX_BATCH:
+            self._error(413, f"At most {SERVICE_MAX_BATCH} CNRs per request")
+            return
+        service = self.server.service
+        check_listing = _flag(request.get("check_listing", False))
+        futures = {str(cnr): service.submit(str(cnr), check_listing) for cnr in cnrs}
+        deadline = time.monotonic() + self.server.lookup_timeout
+        results = {}
+        for cnr, future in futures.items():
+            try:
+                results[cnr] = future.result(timeout=max(0, deadline - time.monotonic())).to_dict()
+            except FutureTimeoutError:
+                results[cnr] = SearchResult(success=False, message=ERROR_MESSAGES["timeout"],
+                                            failure_reason="timeout").to_dict()
+        self._send_json(200, {"results": results})
+
+
+class JobQueue:
+    """
+    File-backed lookup queue on a shared directory
+    Producers drop a job as incoming/<id>.json ({"cnr": ..., "check_listing": false});
+    the result is written to done/<id>.json. Jobs are claimed by moving them to
+    processing/, and jobs left there by a stopped service are requeued on start.
+    """
+    def __init__(self, service: ScraperService, directory: str = QUEUE_DIR,
+                 poll_interval: float = QUEUE_POLL_INTERVAL):
+        self.logger = setup_logger()
+        self.service = service
+        self.poll_interval = poll_interval
+        self.incoming = os.path.join(directory, "incoming")
+        self.processing = os.path.join(directory, "processing")
+        self.done = os.path.join(directory, "done")
+        for path in (self.incoming, self.processing, self.done):
+            os.makedirs(path, exist_ok=True)
+        for name in os.listdir(self.processing):
+            os.replace(os.path.join(self.processing, name), os.path.join(self.incoming, name))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def enqueue(cnr: str, check_listing: bool = False, directory: str = QUEUE_DIR) -> str:
+        """
+        Queues a lookup and returns its job id
+        """
+        incoming = os.path.join(directory, "incoming")
+        os.makedirs(incoming, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        tmp_path = os.path.join(incoming, f".{job_id}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"cnr": cnr, "check_listing": check_listing}, f)
+        os.replace(tmp_path, os.path.join(incoming, f"{job_id}.json"))
+        return job_id
+
+    def poll(self) -> int:
+        """
+        Claims and submits every waiting job; returns how many were picked up
+        """
+        names = sorted(name for name in os.listdir(self.incoming) if name.endswith('.json'))
+        for name in names:
+            claimed = os.path.join(self.processing, name)
+            try:
+                os.replace(os.path.join(self.incoming, name), claimed)
+            except FileNotFoundError:
+                continue
+            try:
+                with open(claimed, 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+                future = self.service.submit(str(job["cnr"]), _flag(job.get("check_listing", False)))
+            except (OSError, KeyError, TypeError, ValueError) as e:
+                self.logger.warning(f"⚠ Rejected queue job {name}: {e}")
+                self._write(name, claimed, {"error": f"Invalid job: {e}"})
+                continue
+            future.add_done_callback(lambda done, name=name, claimed=claimed: self._complete(name, claimed, done))
+        return len(names)
+
+    def _complete(self, name: str, claimed: str, future: Future):
+        # Lookups cancelled at shutdown stay in processing/ and are requeued on the next start
+        if not future.cancelled():
+            self._write(name, claimed, future.result().to_dict())
+
+    def _write(self, name: str, claimed: str, data: Dict):
+        tmp_path = os.path.join(self.done, f".{name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(self.done, name))
+        os.remove(claimed)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except OSError as e:
+                self.logger.error(f"Job queue poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="job-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
@@ -0,0 +1,207 @@
+"""
+Sharded, resumable CNR sweeps
+Splits a CNR list over worker processes and journals every finished lookup so an interrupted sweep picks up where it stopped
+"""
+import json
+import multiprocessing
+import os
+import queue
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tqdm import tqdm
+
+from config import DEFAULT_BACKEND, JOURNAL_DIR, SHARD_THREADS, SHARD_RETRY_REASONS, SHARD_CAPTCHA_SOLVER
+from metrics import MetricsRegistry, REGISTRY
+from models import SearchResult
+from utils import setup_logger, sanitize_filename
+
+
+def journal_path(input_path: str) -> str:
+    """
+    Default journal for a CNR input file: data/journal/<file name>.journal.jsonl
+    """
+    name = sanitize_filename(os.path.basename(input_path))
+    return os.path.join(JOURNAL_DIR, f"{name}.journal.jsonl")
+
+
+class Journal:
+    """
+    Append-only JSON Lines record of finished lookups
+    Each line is flushed and fsynced as it is written, so a crash loses at most
+    the lookups still in flight. A torn last line from a crash is cut off on
+    load. The latest line for a CNR wins.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = setup_logger()
+        self._records: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            self._load()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        end = 0
+        with open(self.path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"⚠ Ignoring unreadable journal line {line_number} in {self.path}")
+                    continue
+                self._records[record["cnr"]] = record
+        # Drop a half-written last line so the next record starts on a line of its own
+        if os.path.getsize(self.path) > end:
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def is_complete(self, cnr: str) -> bool:
+        record = self._records.get(cnr)
+        return record is not None and record.get("failure_reason") not in SHARD_RETRY_REASONS
+
+    def outcome(self, cnr: str) -> Optional[str]:
+        """
+        "success" or the failure reason of a complete CNR, from this run or an earlier one; None while it is still to do
+        """
+        if not self.is_complete(cnr):
+            return None
+        record = self._records[cnr]
+        return "success" if record.get("success") else record.get("failure_reason") or "unexpected"
+
+    def record(self, cnr: str, result: SearchResult):
+        entry = {
+            "cnr": cnr,
+            "success": result.success,
+            "failure_reason": result.failure_reason,
+            "finished_at": datetime.now().isoformat(),
+        }
+        self._records[cnr] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _shard_worker(shard: int, cnrs: List[str], options: Dict, results: multiprocessing.Queue):
+    """
+    Runs in a worker process: looks up its shard with its own scrapers and streams results to the parent
+    """
+    from batch import search_many
+    from cache import ResponseCache
+    from captcha import CaptchaQueue, create_solver
+    from models import CourtSelector
+
+    captcha = CaptchaQueue(create_solver(options["captcha_solver"]))
+    try:
+        for cnr, result in search_many(cnrs,
+                                       concurrency=options["threads"],
+                                       check_listing=options["check_listing"],
+                                       headless=options["headless"],
+                                       backend=options["backend"],
+                                       cache=ResponseCache() if options["use_cache"] else None,
+                                       refresh=options["refresh"],
+                                       court=CourtSelector.parse(options["court"]) if options["court"] else None,
+                                       captcha=captcha):
+            results.put(("result", shard, cnr, result.to_dict()))
+    finally:
+        captcha.close()
+        results.put(("done", shard, None, None))
+
+
+def run_shards(cnrs: Iterable[str],
+               journal: Journal,
+               shards: int,
+               threads: int = SHARD_THREADS,
+               check_listing: bool = False,
+               headless: bool = True,
+               backend: str = DEFAULT_BACKEND,
+               use_cache: bool = True,
+               refresh: bool = False,
+               court: Optional[str] = None,
+               captcha_solver: str = SHARD_CAPTCHA_SOLVER,
+               progress: bool = True,
+               metrics: Optional[MetricsRegistry] = None) -> Iterator[Tuple[str, SearchResult]]:
+    """
+    Yields (cnr, result) for every CNR not already complete in the journal
+    The remaining CNRs are dealt round-robin to shards worker processes, each
+    running threads lookups at a time with its own scrapers. Results are
+    journaled by this process, the only writer, before they are yielded. A
+    shard whose process dies loses only its in-flight lookups; run again
+    with the same journal to finish them.
+    """
+    if captcha_solver == "manual":
+        raise ValueError("Shard processes cannot prompt for CAPTCHAs; use the operator, ocr or stub solver")
+    metrics = metrics or REGISTRY
+    logger = setup_logger()
+    cnrs = list(dict.fromkeys(cnrs))
+    pending = [cnr for cnr in cnrs if not journal.is_complete(cnr)]
+    if len(pending) < len(cnrs):
+        logger.info(f"✓ Resuming: {len(cnrs) - len(pending)} of {len(cnrs)} CNRs already done")
+    if not pending:
+        return
+    shards = max(1, min(shards, len(pending)))
+    options = {
+        "threads": max(1, threads), "check_listing": check_listing, "headless": headless,
+        "backend": backend, "use_cache": use_cache, "refresh": refresh, "court": court,
+        "captcha_solver": captcha_solver,
+    }
+    # spawn, not fork: worker processes must not inherit this process's threads and open drivers
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=_shard_worker, args=(shard, pending[shard::shards], options, results),
+                        name=f"shard-{shard}", daemon=True)
+        for shard in range(shards)
+    ]
+    for process in processes:
+        process.start()
+    running = set(range(shards))
+    found = failed = 0
+    bar = tqdm(total=len(cnrs), initial=len(cnrs) - len(pending), unit="case",
+               desc=f"{shards} shards", disable=not progress)
+    try:
+        while running:
+            try:
+                kind, shard, cnr, data = results.get(timeout=1)
+            except queue.Empty:
+                for shard in list(running):
+                    if not processes[shard].is_alive():
+                        logger.error(f"Shard {shard} exited with code {processes[shard].exitcode}; "
+                                     f"rerun to finish its remaining CNRs")
+                        running.discard(shard)
+                continue
+            if kind == "done":
+                running.discard(shard)
+                continue
+            result = SearchResult.from_dict(data)
+            journal.record(cnr, result)
+            outcome = "success" if result.success else result.failure_reason or "unexpected"
+            metrics.inc("ecourts_lookups_total", outcome=outcome)
+            if result.success:
+                found += 1
+            else:
+                failed += 1
+            bar.update(1)
+            bar.set_postfix(found=found, failed=failed, refresh=False)
+            yield cnr, result
+    finally:
+        bar.close()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
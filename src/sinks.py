@@ -0,0 +1,166 @@
+"""
+Streaming result sinks for the eCourts scraper
+Appends results to JSON Lines files (optionally compressed and rotated) and reads them back lazily
+"""
+import glob
+import gzip
+import io
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Union
+
+from config import JSON_DIR, JSONL_COMPRESSIONS
+from models import CauseList, SearchResult
+
+
+def _open_zstd(path: str, mode: str):
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    if 'r' in mode:
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    writer = zstandard.ZstdCompressor().stream_writer(open(path, 'ab'), closefd=True)
+    return io.TextIOWrapper(writer, encoding='utf-8')
+
+
+def open_jsonl(path: str, mode: str = 'r'):
+    text_mode = 'rt' if 'r' in mode else 'at'
+    if path.endswith('.gz'):
+        return gzip.open(path, text_mode, encoding='utf-8')
+    if path.endswith('.zst'):
+        return _open_zstd(path, mode)
+    return open(path, 'r' if 'r' in mode else 'a', encoding='utf-8')
+
+
+def _content_bytes(path: str) -> int:
+    """
+    Uncompressed size of a JSON Lines file
+    """
+    if not path.endswith(('.gz', '.zst')):
+        return os.path.getsize(path)
+    size = 0
+    with open_jsonl(path, 'r') as f:
+        for line in f:
+            size += len(line.encode('utf-8'))
+    return size
+
+
+class JsonlSink:
+    """
+    Append-only JSON Lines writer
+    With rotation enabled, records go to numbered segments named
+    <stem>-<YYYYMMDD>-<NNNN>.jsonl[.gz|.zst] next to the base path; a new
+    segment starts when the current one holds rotate_bytes of uncompressed
+    JSON or the date changes.
+    """
+    def __init__(self, path: Optional[str] = None,
+                 compression: Optional[str] = None,
+                 rotate_bytes: Optional[int] = None,
+                 rotate_daily: bool = False):
+        if compression not in JSONL_COMPRESSIONS:
+            raise ValueError(f"Unsupported compression '{compression}'")
+        path = path or os.path.join(JSON_DIR, "results.jsonl")
+        if os.path.isdir(path):
+            path = os.path.join(path, "results.jsonl")
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.stem = os.path.basename(path).split('.jsonl')[0]
+        self.suffix = ".jsonl" + JSONL_COMPRESSIONS[compression]
+        self.rotate_bytes = rotate_bytes
+        self.rotate_daily = rotate_daily
+        self.records_written = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._written = 0
+        self._day = None
+        self._sequence = 0
+        self.path = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def rotating(self) -> bool:
+        return bool(self.rotate_bytes) or self.rotate_daily
+
+    def _segment_path(self, day: str, sequence: int) -> str:
+        return os.path.join(self.directory, f"{self.stem}-{day}-{sequence:04d}{self.suffix}")
+
+    def _open(self):
+        self._written = 0
+        if not self.rotating:
+            self.path = os.path.join(self.directory, self.stem + self.suffix)
+        else:
+            day = datetime.now().strftime("%Y%m%d")
+            if day != self._day:
+                self._day = day
+                self._sequence = 0
+            self._sequence += 1
+            self.path = self._segment_path(day, self._sequence)
+            # A segment left by an earlier run is counted uncompressed, like the writes below
+            while self.rotate_bytes and os.path.exists(self.path):
+                self._written = _content_bytes(self.path)
+                if self._written < self.rotate_bytes:
+                    break
+                self._sequence += 1
+                self.path = self._segment_path(day, self._sequence)
+                self._written = 0
+        self._file = open_jsonl(self.path, 'a')
+
+    def _needs_rotation(self) -> bool:
+        if not self.rotating or self._file is None:
+            return False
+        if self.rotate_bytes and self._written >= self.rotate_bytes:
+            return True
+        return self.rotate_daily and datetime.now().strftime("%Y%m%d") != self._day
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+        with self._lock:
+            if self._needs_rotation():
+                self._file.close()
+                self._file = None
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            self._written += len(line.encode('utf-8'))
+            self.records_written += 1
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def iter_jsonl(pattern: str) -> Iterator[Dict[str, Any]]:
+    """
+    Records of a JSON Lines file, or of every segment matching a glob, in file name order
+    """
+    paths = sorted(glob.glob(pattern)) if any(char in pattern for char in "*?[") else [pattern]
+    for path in paths:
+        with open_jsonl(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def iter_saved(pattern: str) -> Iterator[Union[SearchResult, CauseList]]:
+    """
+    Search results and cause lists written by JsonlSink, read back one record at a time
+    """
+    for record in iter_jsonl(pattern):
+        yield CauseList.from_dict(record) if "listings" in record else SearchResult.from_dict(record)
@@ -0,0 +1,231 @@
+"""
+SQLite result store for the eCourts scraper
+Persists search results, case details and cause lists into indexed tables so they can be queried without scanning JSON files
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from config import STORE_DB_FILE, STORE_BATCH_SIZE, INTERNAL_DATE_FORMAT
+from models import CaseDetails, CaseListing, CauseList, SearchResult, LISTING_COLUMNS, listing_row
+from utils import parse_portal_date
+
+CASE_COLUMNS = (
+    "cnr", "case_type", "case_number", "case_year", "petitioner", "respondent",
+    "court_name", "court_number", "judge_name", "filing_date", "registration_date",
+    "status", "next_hearing_date",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    cnr TEXT PRIMARY KEY,
+    case_type TEXT,
+    case_number TEXT,
+    case_year TEXT,
+    petitioner TEXT,
+    respondent TEXT,
+    court_name TEXT,
+    court_number TEXT,
+    judge_name TEXT,
+    filing_date TEXT,
+    registration_date TEXT,
+    status TEXT,
+    next_hearing_date TEXT,
+    hearing_day TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cases_hearing ON cases (hearing_day, court_name);
+CREATE INDEX IF NOT EXISTS idx_cases_court ON cases (court_name);
+CREATE INDEX IF NOT EXISTS idx_cases_judge ON cases (judge_name);
+
+CREATE TABLE IF NOT EXISTS search_results (
+    id INTEGER PRIMARY KEY,
+    cnr TEXT,
+    success INTEGER NOT NULL,
+    message TEXT,
+    is_listed INTEGER NOT NULL,
+    error TEXT,
+    search_timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_cnr ON search_results (cnr, search_timestamp);
+
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    list_day TEXT NOT NULL,
+    court_complex TEXT NOT NULL,
+    serial_number INTEGER,
+    listing_date TEXT,
+    court_name TEXT,
+    court_number TEXT,
+    judge_name TEXT,
+    purpose TEXT,
+    cnr TEXT,
+    case_type TEXT,
+    case_number TEXT,
+    case_year TEXT,
+    petitioner TEXT,
+    respondent TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_listings_day ON listings (list_day, court_complex);
+CREATE INDEX IF NOT EXISTS idx_listings_cnr ON listings (cnr, list_day);
+CREATE INDEX IF NOT EXISTS idx_listings_court ON listings (court_name, list_day);
+CREATE INDEX IF NOT EXISTS idx_listings_judge ON listings (judge_name, list_day);
+"""
+
+_LISTING_INSERT = (
+    f"INSERT INTO listings (list_day, court_complex, {', '.join(LISTING_COLUMNS)}) "
+    f"VALUES (?, ?, {', '.join('?' * len(LISTING_COLUMNS))})"
+)
+_CASE_UPSERT = (
+    f"INSERT OR REPLACE INTO cases ({', '.join(CASE_COLUMNS)}, hearing_day, updated_at) "
+    f"VALUES ({', '.join('?' * (len(CASE_COLUMNS) + 2))})"
+)
+_RESULT_INSERT = (
+    "INSERT INTO search_results (cnr, success, message, is_listed, error, search_timestamp, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+DateLike = Union[str, date]
+
+
+def iso_day(value: Optional[DateLike]) -> Optional[str]:
+    if value is None or isinstance(value, date):
+        return value.strftime(INTERNAL_DATE_FORMAT) if value else None
+    parsed = parse_portal_date(value)
+    return parsed.strftime(INTERNAL_DATE_FORMAT) if parsed else None
+
+
+class SqliteStore:
+    """
+    Write-behind SQLite store in WAL mode
+    Case and result rows are buffered and written with executemany every
+    batch_size rows (or on flush/close); cause lists replace the rows stored
+    for the same date and court complex in one transaction.
+    """
+    def __init__(self, path: str = STORE_DB_FILE, batch_size: int = STORE_BATCH_SIZE):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._cases: List[Tuple] = []
+        self._results: List[Tuple] = []
+
+    def save_case(self, case_details: CaseDetails, cnr: Optional[str] = None):
+        cnr = case_details.cnr or cnr if case_details else None
+        if not cnr:
+            return
+        row = ((cnr,) + case_details.to_tuple()[1:] +
+               (iso_day(case_details.next_hearing_date), datetime.now().isoformat()))
+        with self._lock:
+            self._cases.append(row)
+            if len(self._cases) >= self.batch_size:
+                self.flush()
+
+    def save_result(self, result: SearchResult, cnr: Optional[str] = None):
+        details = result.case_details
+        cnr = cnr or (details.cnr if details else None)
+        row = (cnr, int(result.success), result.message, int(result.is_listed), result.error,
+               result.search_timestamp, json.dumps(result.to_dict(), ensure_ascii=False))
+        with self._lock:
+            self._results.append(row)
+            if details is not None:
+                self.save_case(details, cnr)
+            if len(self._results) >= self.batch_size:
+                self.flush()
+
+    def save_cause_list(self, cause_list: CauseList):
+        day = iso_day(cause_list.date) or cause_list.date
+        court = cause_list.court_complex or ""
+        rows = [(day, court) + listing_row(listing) for listing in cause_list.listings]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM listings WHERE list_day = ? AND court_complex = ?", (day, court))
+            self._conn.executemany(_LISTING_INSERT, rows)
+
+    def flush(self):
+        with self._lock:
+            if not (self._cases or self._results):
+                return
+            with self._conn:
+                if self._cases:
+                    self._conn.executemany(_CASE_UPSERT, self._cases)
+                if self._results:
+                    self._conn.executemany(_RESULT_INSERT, self._results)
+            self._cases.clear()
+            self._results.clear()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        self.flush()
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            cursor.row_factory = sqlite3.Row
+            return cursor.fetchall()
+
+    @staticmethod
+    def _filters(clauses: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        active = [(column, value) for column, value in clauses.items() if value is not None]
+        where = " AND ".join(f"{column} = ?" for column, _ in active)
+        return where, [value for _, value in active]
+
+    def get_case(self, cnr: str) -> Optional[CaseDetails]:
+        rows = self._query(f"SELECT {', '.join(CASE_COLUMNS)} FROM cases WHERE cnr = ?", (cnr,))
+        return CaseDetails(*rows[0]) if rows else None
+
+    def cases_heard_on(self, day: DateLike, court_name: Optional[str] = None,
+                       judge_name: Optional[str] = None) -> List[CaseDetails]:
+        where, params = self._filters({"hearing_day": iso_day(day) or day, "court_name": court_name,
+                                       "judge_name": judge_name})
+        rows = self._query(f"SELECT {', '.join(CASE_COLUMNS)} FROM cases WHERE {where} ORDER BY cnr", params)
+        return [CaseDetails(*row) for row in rows]
+
+    def listings_on(self, day: DateLike, court_complex: Optional[str] = None,
+                    court_name: Optional[str] = None, judge_name: Optional[str] = None,
+                    cnrs: Optional[Sequence[str]] = None) -> List[CaseListing]:
+        where, params = self._filters({"list_day": iso_day(day) or day, "court_complex": court_complex,
+                                       "court_name": court_name, "judge_name": judge_name})
+        if cnrs:
+            where += f" AND cnr IN ({', '.join('?' * len(cnrs))})"
+            params.extend(cnrs)
+        rows = self._query(
+            f"SELECT {', '.join(LISTING_COLUMNS)} FROM listings WHERE {where} ORDER BY serial_number", params
+        )
+        return [self._listing(row) for row in rows]
+
+    def listing_history(self, cnr: str) -> List[CaseListing]:
+        rows = self._query(
+            f"SELECT {', '.join(LISTING_COLUMNS)} FROM listings WHERE cnr = ? ORDER BY list_day", (cnr,)
+        )
+        return [self._listing(row) for row in rows]
+
+    def results_for(self, cnr: str, limit: Optional[int] = None) -> List[SearchResult]:
+        sql = "SELECT data FROM search_results WHERE cnr = ? ORDER BY search_timestamp DESC"
+        params: List[Any] = [cnr]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [SearchResult.from_dict(json.loads(row[0])) for row in self._query(sql, params)]
+
+    @staticmethod
+    def _listing(row: sqlite3.Row) -> CaseListing:
+        values = dict(zip(LISTING_COLUMNS, row))
+        case_values = {column: values.pop(column) for column in LISTING_COLUMNS[6:]}
+        return CaseListing(**values, case_details=CaseDetails(**case_values))
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,235 @@
+"""
+Transport backends for fetching eCourts pages
+Replays the portal forms over plain HTTP so the browser is only needed for JavaScript pages
+"""
+import time
+from typing import Any, Optional, Dict, List, Tuple
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from config import (
+    CASE_STATUS_URL,
+    CAUSE_LIST_URL,
+    REQUEST_TIMEOUT,
+    USER_AGENT,
+    SEARCH_TYPE_FIELD,
+    CNR_FORM_FIELD,
+    CAUSE_LIST_DATE_FIELD,
+    JS_REQUIRED_MARKERS,
+    SEARCH_BY_CNR,
+    STATE_FORM_FIELD,
+    DISTRICT_FORM_FIELD,
+    COMPLEX_FORM_FIELD,
+    COURT_FORM_FIELD,
+    CAPTCHA_IMAGE_ID,
+    CAPTCHA_FORM_FIELD,
+    CAPTCHA_INVALID_MARKERS,
+    CAPTCHA_ATTEMPTS,
+    SESSION_MAX_AGE,
+    SESSION_EXPIRED_STATUS,
+    SESSION_EXPIRED_MARKERS,
+)
+from models import CourtSelector
+from ratelimit import HostRateLimiter
+from captcha import CaptchaQueue, CaptchaRequiredError
+
+
+def extract_form(page_html: str, page_url: str, field_name: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    soup = BeautifulSoup(page_html, 'lxml')
+    form = None
+    if field_name:
+        field = soup.find(attrs={"name": field_name})
+        if field is not None:
+            form = field.find_parent('form')
+    if form is None:
+        form = soup.find('form')
+    action = urljoin(page_url, form.get('action')) if form is not None and form.get('action') else page_url
+    hidden = {}
+    for tag in soup.find_all('input', attrs={"type": "hidden"}):
+        name = tag.get('name')
+        if name:
+            hidden[name] = tag.get('value', '')
+    return action, hidden
+
+
+def court_form_fields(court: Optional[CourtSelector]) -> Dict[str, str]:
+    if court is None:
+        return {}
+    fields = {
+        STATE_FORM_FIELD: court.state_code,
+        DISTRICT_FORM_FIELD: court.district_code,
+        COMPLEX_FORM_FIELD: court.complex_code,
+    }
+    if court.court_code:
+        fields[COURT_FORM_FIELD] = court.court_code
+    return fields
+
+
+def needs_javascript(page_html: str) -> bool:
+    lowered = page_html.lower()
+    if '<table' in lowered:
+        return False
+    return any(marker in lowered for marker in JS_REQUIRED_MARKERS)
+
+
+def find_captcha_image(page_html: str, page_url: str) -> Optional[str]:
+    if CAPTCHA_IMAGE_ID not in page_html:
+        return None
+    image = BeautifulSoup(page_html, 'lxml').find('img', id=CAPTCHA_IMAGE_ID)
+    if image is None or not image.get('src'):
+        return None
+    return urljoin(page_url, image['src'])
+
+
+def captcha_rejected(page_html: str) -> bool:
+    lowered = page_html.lower()
+    return any(marker in lowered for marker in CAPTCHA_INVALID_MARKERS)
+
+
+def session_expired(status_code: int, page_html: str) -> bool:
+    if status_code in SESSION_EXPIRED_STATUS:
+        return True
+    lowered = page_html.lower()
+    return any(marker in lowered for marker in SESSION_EXPIRED_MARKERS)
+
+
+class Handshake:
+    """
+    Form action and tokens (hidden inputs, solved CAPTCHA) from one visit to a portal form page
+    Later queries are posted with these tokens until the portal rejects them or max_age passes.
+    """
+    __slots__ = ("action", "tokens", "created_at")
+
+    def __init__(self, action: str, tokens: Dict[str, str]):
+        self.action = action
+        self.tokens = tokens
+        self.created_at = time.monotonic()
+
+    def expired(self, max_age: float = SESSION_MAX_AGE) -> bool:
+        return time.monotonic() - self.created_at > max_age
+
+    def payload(self, fields: Dict[str, str]) -> Dict[str, str]:
+        payload = dict(self.tokens)
+        payload.update(fields)
+        return payload
+
+
+class Transport:
+    """
+    Base class for page fetchers used by ECourtsScraper
+    A fetch returns the result page HTML, or None when the page has to be driven
+    by a browser. A CAPTCHA that cannot be passed raises CaptchaRequiredError.
+    """
+    name = "base"
+
+    def fetch_case_status(self, cnr: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def fetch_cause_list(self, date: str, court: Optional[CourtSelector] = None) -> Optional[str]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpTransport(Transport):
+    """
+    requests-based backend that posts the case status and cause list forms directly
+    The form page is loaded once per session (cookies, app token and any CAPTCHA);
+    later queries are bare POSTs against that session, with a fresh handshake
+    when the portal reports it expired.
+    """
+    name = "http"
+
+    def __init__(self,
+                 case_status_url: str = CASE_STATUS_URL,
+                 cause_list_url: str = CAUSE_LIST_URL,
+                 session: Optional[requests.Session] = None,
+                 timeout: int = REQUEST_TIMEOUT,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 captcha: Optional[CaptchaQueue] = None,
+                 session_max_age: float = SESSION_MAX_AGE):
+        self.case_status_url = case_status_url
+        self.cause_list_url = cause_list_url
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.captcha = captcha
+        self.session_max_age = session_max_age
+        self._handshakes: Dict[str, Handshake] = {}
+        self.session = session or requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+    def fetch_case_status(self, cnr: str) -> Optional[str]:
+        return self.submit_form(
+            self.case_status_url,
+            {SEARCH_TYPE_FIELD: SEARCH_BY_CNR, CNR_FORM_FIELD: cnr},
+            field_name=CNR_FORM_FIELD
+        )
+
+    def fetch_cause_list(self, date: str, court: Optional[CourtSelector] = None) -> Optional[str]:
+        fields = court_form_fields(court)
+        fields[CAUSE_LIST_DATE_FIELD] = date
+        return self.submit_form(
+            self.cause_list_url,
+            fields,
+            field_name=CAUSE_LIST_DATE_FIELD
+        )
+
+    def submit_form(self, page_url: str, fields: Dict[str, str], field_name: Optional[str] = None) -> Optional[str]:
+        for attempt in range(CAPTCHA_ATTEMPTS):
+            handshake = self._handshakes.get(page_url)
+            if handshake is None or handshake.expired(self.session_max_age):
+                handshake = self.handshake(page_url, field_name)
+            self._throttle(handshake.action)
+            response = self.session.post(
+                handshake.action,
+                data=handshake.payload(fields),
+                headers={"Referer": page_url},
+                timeout=self.timeout
+            )
+            if session_expired(response.status_code, response.text) or captcha_rejected(response.text):
+                self._handshakes.pop(page_url, None)
+                continue
+            response.raise_for_status()
+            if needs_javascript(response.text):
+                return None
+            return response.text
+        raise CaptchaRequiredError(f"Portal rejected the CAPTCHA or session {CAPTCHA_ATTEMPTS} times for {page_url}")
+
+    def handshake(self, page_url: str, field_name: Optional[str] = None) -> Handshake:
+        self._handshakes.pop(page_url, None)
+        self._throttle(page_url)
+        page = self.session.get(page_url, timeout=self.timeout)
+        page.raise_for_status()
+        action, tokens = extract_form(page.text, page_url, field_name)
+        captcha_url = find_captcha_image(page.text, page_url)
+        if captcha_url and self.captcha is not None:
+            answer = self._solve_captcha(captcha_url, page_url)
+            if answer is None:
+                raise CaptchaRequiredError(f"CAPTCHA for {page_url} was not solved")
+            tokens[CAPTCHA_FORM_FIELD] = answer
+        handshake = Handshake(action, tokens)
+        self._handshakes[page_url] = handshake
+        return handshake
+
+    def _solve_captcha(self, captcha_url: str, page_url: str) -> Optional[str]:
+        self._throttle(captcha_url)
+        image = self.session.get(captcha_url, headers={"Referer": page_url}, timeout=self.timeout)
+        image.raise_for_status()
+        return self.captcha.solve(image.content)
+
+    def adopt_cookies(self, cookies: List[Dict[str, Any]]):
+        self._handshakes.clear()
+        for cookie in cookies:
+            self.session.cookies.set(cookie["name"], cookie["value"],
+                                     domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+
+    def _throttle(self, url: str):
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+
+    def close(self):
+        self._handshakes.clear()
+        self.session.close()
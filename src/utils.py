@@ -5,17 +5,19 @@ Helper functions used throughout the project
 import os
 import json
 import re
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, Any, List
 import logging
 from config import (
     ECOURTS_DATE_FORMAT, 
     INTERNAL_DATE_FORMAT, 
     DISPLAY_DATE_FORMAT,
+    PORTAL_DATE_FORMATS,
     CNR_LENGTH,
     MIN_YEAR,
     MAX_YEAR,
-    JSON_DIR
+    JSON_DIR,
+    CRAWL_MAX_DAYS
 )
 
 def setup_logger(name: str = "ecourts_scraper") -> logging.Logger:
@@ -82,6 +84,31 @@ def convert_date_format(date_str: str, from_format: str, to_format: str) -> Opti
     except ValueError:
         return None
 
+def parse_portal_date(date_str: Optional[str]) -> Optional[date]:
+    if not date_str:
+        return None
+    cleaned = re.sub(r'(\d)(st|nd|rd|th)\b', r'\1', date_str.strip(), flags=re.IGNORECASE)
+    for date_format in PORTAL_DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def date_range(start: str, end: str, max_days: int = CRAWL_MAX_DAYS) -> List[str]:
+    """
+    Every date from start to end inclusive, in the eCourts DD-MM-YYYY format
+    """
+    first, last = parse_portal_date(start), parse_portal_date(end)
+    if first is None or last is None:
+        raise ValueError(f"Invalid date range '{start}' to '{end}'. Use DD-MM-YYYY")
+    days = (last - first).days + 1
+    if days < 1:
+        raise ValueError(f"Date range ends before it starts: {start} to {end}")
+    if days > max_days:
+        raise ValueError(f"Date range covers {days} days, the limit is {max_days}")
+    return [(first + timedelta(days=offset)).strftime(ECOURTS_DATE_FORMAT) for offset in range(days)]
+
 def save_to_json(data: Dict[Any, Any], filename: str, directory: Optional[str] = None) -> str:
     if directory is None:
         directory = JSON_DIR
@@ -0,0 +1,108 @@
+"""
+Readiness waits and request pacing for the eCourts scraper
+Condition-based waits replace fixed sleeps; politeness delays follow observed server latency
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+from config import (
+    EXPLICIT_WAIT,
+    REQUEST_DELAY,
+    POLITENESS_MIN_DELAY,
+    POLITENESS_LATENCY_FACTOR,
+    POLITENESS_SMOOTHING,
+)
+from metrics import MetricsRegistry
+
+AJAX_IDLE_SCRIPT = "return window.jQuery ? window.jQuery.active === 0 : true"
+
+
+def wait_for_document_ready(driver, timeout: float = EXPLICIT_WAIT):
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+
+def wait_for_ajax_idle(driver, timeout: float = EXPLICIT_WAIT):
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script(AJAX_IDLE_SCRIPT))
+
+
+def wait_for_element(driver, locator: Tuple[str, str], timeout: float = EXPLICIT_WAIT, clickable: bool = False):
+    condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+    try:
+        return WebDriverWait(driver, timeout).until(condition)
+    except TimeoutException:
+        raise NoSuchElementException(f"Timed out waiting for element {locator[1]!r}")
+
+
+class StepTimer:
+    """
+    Records the wall-clock duration of each named step of a lookup
+    Each step is also observed in the metrics registry's histogram, labelled with the step name.
+    """
+    def __init__(self, metrics: Optional[MetricsRegistry] = None, histogram: str = "ecourts_step_seconds"):
+        self.timings: Dict[str, float] = {}
+        self.metrics = metrics
+        self.histogram = histogram
+
+    def reset(self):
+        self.timings = {}
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = elapsed
+            if self.metrics is not None:
+                self.metrics.observe(self.histogram, elapsed, step=name)
+
+
+class AdaptiveDelay:
+    """
+    Politeness delay between requests that scales with the server's recent latency
+    A slow portal gets proportionally more breathing room, up to max_delay.
+    """
+    def __init__(self,
+                 min_delay: float = POLITENESS_MIN_DELAY,
+                 max_delay: float = REQUEST_DELAY,
+                 factor: float = POLITENESS_LATENCY_FACTOR,
+                 smoothing: float = POLITENESS_SMOOTHING):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.smoothing = smoothing
+        self.latency: Optional[float] = None
+        self._last_request: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self) -> float:
+        if self.latency is None:
+            return self.min_delay
+        return min(self.max_delay, max(self.min_delay, self.factor * self.latency))
+
+    def observe(self, latency: float):
+        with self._lock:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._last_request is not None:
+                remaining = self.delay - (now - self._last_request)
+                if remaining > 0:
+                    time.sleep(remaining)
+                    now = time.monotonic()
+            self._last_request = now
@@ -0,0 +1,192 @@
+"""
+Incremental change detection for watch lists
+Keeps the last seen state of each watched case and only re-fetches the cases that can have changed
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import (
+    WATCH_STATE_FILE,
+    WATCH_MAX_INTERVAL_DAYS,
+    WATCH_DISPOSED_INTERVAL_DAYS,
+    WATCH_DISPOSED_MARKERS,
+    INTERNAL_DATE_FORMAT,
+)
+from batch import search_many
+from models import CaseDetails, CaseChange, WatchEntry
+from utils import setup_logger, parse_portal_date
+
+PRIORITY_NEW = 0
+PRIORITY_HEARING = 0
+PRIORITY_HEARD = 1
+PRIORITY_ROUTINE = 2
+PRIORITY_DISPOSED = 3
+
+
+def content_hash(case_details: CaseDetails) -> str:
+    data = json.dumps(case_details.to_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def diff_cases(old: Optional[CaseDetails], new: CaseDetails) -> Dict[str, List[Any]]:
+    old_values = old.to_dict() if old is not None else {}
+    return {
+        name: [old_values.get(name), value]
+        for name, value in new.to_dict().items()
+        if old_values.get(name) != value
+    }
+
+
+def is_disposed(case_details: Optional[CaseDetails]) -> bool:
+    status = (case_details.status or "").lower() if case_details else ""
+    return any(marker in status for marker in WATCH_DISPOSED_MARKERS)
+
+
+def refresh_priority(entry: WatchEntry, today: Optional[date] = None) -> Optional[int]:
+    """
+    Priority of re-fetching entry today (lower runs first), or None if it is not due
+    Hearings today or tomorrow are always refreshed, a past hearing is refreshed
+    once after it happened, disposed cases every WATCH_DISPOSED_INTERVAL_DAYS and
+    everything else at least every WATCH_MAX_INTERVAL_DAYS.
+    """
+    today = today or date.today()
+    if entry.case_details is None or not entry.last_checked:
+        return PRIORITY_NEW
+    last_checked = datetime.fromisoformat(entry.last_checked).date()
+    if is_disposed(entry.case_details):
+        due = last_checked + timedelta(days=WATCH_DISPOSED_INTERVAL_DAYS) <= today
+        return PRIORITY_DISPOSED if due else None
+    hearing = parse_portal_date(entry.next_hearing_date)
+    if hearing is not None:
+        if today <= hearing <= today + timedelta(days=1):
+            return PRIORITY_HEARING if last_checked < today else None
+        if hearing < today:
+            return PRIORITY_HEARD if last_checked <= hearing else None
+    due = last_checked + timedelta(days=WATCH_MAX_INTERVAL_DAYS) <= today
+    return PRIORITY_ROUTINE if due else None
+
+
+class WatchStore:
+    """
+    JSON file holding one WatchEntry per watched CNR
+    Writes go to a temporary file that replaces the state file, so a crash
+    never leaves a half-written store behind.
+    """
+    def __init__(self, path: str = WATCH_STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, WatchEntry] = {}
+        self._dirty = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for data in json.load(f).get("entries", []):
+                    entry = WatchEntry.from_dict(data)
+                    self._entries[entry.cnr] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, cnr: str) -> bool:
+        return cnr in self._entries
+
+    def get(self, cnr: str) -> Optional[WatchEntry]:
+        return self._entries.get(cnr)
+
+    def entries(self) -> List[WatchEntry]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def put(self, entry: WatchEntry):
+        with self._lock:
+            self._entries[entry.cnr] = entry
+            self._dirty = True
+
+    def add(self, cnrs: Iterable[str]) -> int:
+        added = 0
+        with self._lock:
+            for cnr in cnrs:
+                if cnr not in self._entries:
+                    self._entries[cnr] = WatchEntry(cnr=cnr)
+                    added += 1
+            self._dirty = self._dirty or added > 0
+        return added
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"entries": [entry.to_dict() for entry in self._entries.values()]}
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        self.save()
+
+
+class Watcher:
+    """
+    Re-fetches the due cases of a WatchStore and yields a CaseChange for each case that changed
+    """
+    def __init__(self, store: WatchStore):
+        self.logger = setup_logger()
+        self.store = store
+
+    def due(self, today: Optional[date] = None) -> List[str]:
+        ranked: List[Tuple[int, date, str]] = []
+        for entry in self.store.entries():
+            priority = refresh_priority(entry, today)
+            if priority is not None:
+                hearing = parse_portal_date(entry.next_hearing_date) or date.max
+                ranked.append((priority, hearing, entry.cnr))
+        ranked.sort()
+        return [cnr for _, _, cnr in ranked]
+
+    def record(self, cnr: str, case_details: CaseDetails,
+               checked_at: Optional[datetime] = None) -> Optional[CaseChange]:
+        checked_at = (checked_at or datetime.now()).isoformat()
+        entry = self.store.get(cnr) or WatchEntry(cnr=cnr)
+        new_hash = content_hash(case_details)
+        changed = new_hash != entry.content_hash
+        change = None
+        if changed:
+            change = CaseChange(
+                cnr=cnr,
+                is_new=entry.case_details is None,
+                changes=diff_cases(entry.case_details, case_details),
+                checked_at=checked_at
+            )
+        hearing = parse_portal_date(case_details.next_hearing_date)
+        self.store.put(WatchEntry(
+            cnr=cnr,
+            case_details=case_details,
+            content_hash=new_hash,
+            next_hearing_date=hearing.strftime(INTERNAL_DATE_FORMAT) if hearing else case_details.next_hearing_date,
+            last_checked=checked_at,
+            last_changed=checked_at if changed else entry.last_changed
+        ))
+        return change
+
+    def run(self, cnrs: Iterable[str] = (), today: Optional[date] = None,
+            **search_kwargs) -> Iterator[CaseChange]:
+        added = self.store.add(cnrs)
+        due = self.due(today)
+        self.logger.info(f"Watching {len(self.store)} cases ({added} new): {len(due)} due for refresh")
+        search_kwargs.setdefault("refresh", True)
+        try:
+            for cnr, result in search_many(due, **search_kwargs):
+                if not result.success:
+                    self.logger.warning(f"⚠ Could not refresh {cnr}: {result.message}")
+                    continue
+                change = self.record(cnr, result.case_details)
+                if change is not None:
+                    yield change
+        finally:
+            self.store.save()
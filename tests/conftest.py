@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the test suite
+Tests run against the recorded portal pages served by the benchmarks' StubPortal and never start Chrome
+"""
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fixtures import load_case_status, load_cause_list
+from benchmarks.stub_server import StubPortal
+import browser_pool
+from metrics import MetricsRegistry
+from resilience import Resilience
+from scraper import ECourtsScraper
+from transport import HttpTransport
+
+
+@pytest.fixture(autouse=True)
+def no_chrome(monkeypatch):
+    def create_driver(headless: bool = True):
+        raise AssertionError("tests must not start Chrome")
+    monkeypatch.setattr(browser_pool, "create_driver", create_driver)
+
+
+@pytest.fixture
+def portal():
+    with StubPortal(load_case_status(), load_cause_list("small")) as stub:
+        yield stub
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def make_scraper(portal, metrics):
+    """
+    Builds HTTP-backend scrapers pointed at the stub portal; retries do not sleep
+    """
+    scrapers = []
+
+    def make(**kwargs) -> ECourtsScraper:
+        kwargs.setdefault("resilience", Resilience(metrics=metrics, sleep=lambda seconds: None))
+        scraper = ECourtsScraper(transport=HttpTransport(portal.case_status_url, portal.cause_list_url),
+                                 metrics=metrics, **kwargs)
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        scraper.close()
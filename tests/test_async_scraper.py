@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from async_scraper import AsyncECourtsScraper
+from benchmarks.fixtures import load_cause_list
+from benchmarks.stub_server import StubPortal
+from models import CaseDetails, CaseListing, CauseList, SearchResult
+from resilience import Resilience
+
+pytest.importorskip("httpx")
+
+CNR = "MHAU019999992015"
+JAVASCRIPT_PAGE = "<html><body><noscript>Please enable JavaScript to use this site.</noscript></body></html>"
+
+
+def lookup(portal, metrics, cnr=CNR):
+    async def run():
+        scraper = AsyncECourtsScraper(portal.case_status_url, portal.cause_list_url, http2=False, metrics=metrics,
+                                      resilience=Resilience(metrics=metrics, sleep=lambda seconds: None))
+        try:
+            return await scraper.search_by_cnr(cnr)
+        finally:
+            await scraper.close()
+    return asyncio.run(run())
+
+
+def test_lookup_over_async_http(portal, metrics):
+    result = lookup(portal, metrics)
+    assert result.success
+    assert result.case_details.case_number == "999"
+
+
+def test_javascript_page_is_reported_as_such(metrics):
+    with StubPortal(JAVASCRIPT_PAGE, load_cause_list("small")) as portal:
+        result = lookup(portal, metrics)
+    assert not result.success
+    assert result.failure_reason == "javascript_required"
+    assert result.error == "Page requires JavaScript"
+    assert metrics.counter_value("ecourts_lookups_total", outcome="javascript_required") == 1
+
+
+def index_loads(results, max_age=3600):
+    calls = []
+
+    async def run():
+        scraper = AsyncECourtsScraper(http2=False, cause_list_max_age=max_age)
+        pending = list(results)
+
+        async def download_cause_list(date=None, court=None):
+            calls.append(date)
+            return pending.pop(0)
+
+        scraper.download_cause_list = download_cause_list
+        try:
+            return [await scraper._cause_list_index("20-10-2026") for _ in results]
+        finally:
+            await scraper.close()
+    return asyncio.run(run()), calls
+
+
+def cause_list():
+    details = CaseDetails(cnr=CNR, case_type="CS", case_number="999", case_year="2015")
+    return CauseList(date="20-10-2026", listings=[CaseListing(case_details=details)], total_cases=1)
+
+
+def test_failed_cause_list_download_is_retried():
+    indexes, calls = index_loads([None, cause_list()])
+    assert indexes[0] is None and indexes[1] is not None
+    assert len(calls) == 2
+
+
+def test_cause_list_index_is_shared_while_fresh():
+    indexes, calls = index_loads([cause_list(), cause_list()])
+    assert indexes[0] is indexes[1]
+    assert len(calls) == 1
+
+
+def test_expired_cause_list_index_is_rebuilt():
+    indexes, calls = index_loads([cause_list(), cause_list()], max_age=0)
+    assert indexes[0] is not indexes[1]
+    assert len(calls) == 2
+
+
+def test_search_many_keeps_in_flight_lookups_bounded():
+    in_flight, peak, consumed = 0, 0, []
+
+    def cnrs():
+        for number in range(20):
+            consumed.append(number)
+            yield f"MHAU0199999920{number:02d}"
+
+    async def run():
+        scraper = AsyncECourtsScraper(http2=False)
+
+        async def search_by_cnr(cnr, check_listing=False):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return SearchResult(success=True)
+
+        scraper.search_by_cnr = search_by_cnr
+        try:
+            first = None
+            async for cnr, _ in scraper.search_many(cnrs(), concurrency=3):
+                if first is None:
+                    first, consumed_at_first = cnr, len(consumed)
+            return consumed_at_first
+        finally:
+            await scraper.close()
+
+    consumed_at_first = asyncio.run(run())
+    assert peak == 3
+    assert consumed_at_first <= 4
+    assert len(consumed) == 20
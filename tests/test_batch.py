@@ -0,0 +1,53 @@
+from functools import partial
+from types import SimpleNamespace
+
+import batch
+import main
+from batch import crawl_cause_lists, list_orders_many
+from models import CourtSelector
+
+CNR = "MHAU019999992015"
+DATES = ["20-10-2026", "21-10-2026"]
+
+
+def crawl(make_scraper, metrics, courts, dates=DATES):
+    return list(crawl_cause_lists(courts, dates, concurrency=1, scraper_factory=make_scraper, metrics=metrics))
+
+
+def test_repeated_page_on_another_date_carries_that_date(make_scraper, metrics):
+    crawled = crawl(make_scraper, metrics, [None])
+    assert [date for _, date, _ in crawled] == DATES
+    for _, date, cause_list in crawled:
+        assert cause_list.date == date
+        assert cause_list.total_cases == 12
+        assert {listing.listing_date for listing in cause_list.listings} == {date}
+    assert metrics.counter_value("ecourts_cause_list_pages_total", result="unique") == 1
+    assert metrics.counter_value("ecourts_cause_list_pages_total", result="duplicate") == 1
+
+
+def test_courts_with_the_same_page_get_their_own_listings(make_scraper, metrics):
+    courts = [CourtSelector.parse("27:1:1"), CourtSelector.parse("27:1:2")]
+    crawled = crawl(make_scraper, metrics, courts, DATES[:1])
+    first, second = crawled[0][2], crawled[1][2]
+    assert first.listings == second.listings
+    first.listings.pop()
+    assert len(second.listings) == 12
+    assert [cause_list.court_complex for _, _, cause_list in crawled] == [court.key for court in courts]
+
+
+def test_order_listing_returns_session_cookies(make_scraper):
+    listed = list(list_orders_many([CNR], concurrency=1, scraper_factory=make_scraper))
+    assert [cnr for cnr, _, _ in listed] == [CNR]
+    assert listed[0][2].get("PHPSESSID") == "stub"
+
+
+def test_batch_order_downloads_carry_listing_cookies(make_scraper, monkeypatch):
+    monkeypatch.setattr(batch, "list_orders_many",
+                        partial(list_orders_many, scraper_factory=make_scraper))
+    downloads = []
+    monkeypatch.setattr(main, "download_orders",
+                        lambda items, cookies=None: downloads.append((list(items), cookies)))
+    args = SimpleNamespace(concurrency=1, backend="http", no_cache=True, captcha_solver="stub")
+    main.download_batch_orders([CNR], args, headless=True)
+    _, cookies = downloads[0]
+    assert cookies.get("PHPSESSID") == "stub"
@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+
+import browser_pool
+from browser_pool import BrowserPool
+
+
+class FakeDriver:
+    launched = 0
+
+    def __init__(self):
+        FakeDriver.launched += 1
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return "about:blank"
+
+    def get(self, url):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def fake_chrome(monkeypatch):
+    FakeDriver.launched = 0
+    monkeypatch.setattr(browser_pool, "create_driver", lambda headless=True: FakeDriver())
+
+
+def lease_in_thread(pool, hold: threading.Event, leased: threading.Event):
+    def run():
+        with pool.lease():
+            leased.set()
+            hold.wait()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert leased.wait(2)
+    return thread
+
+
+def test_waiter_gets_replacement_when_driver_is_recycled():
+    pool = BrowserPool(size=1, max_uses=1, warm_url=None, lease_timeout=5)
+    hold, leased = threading.Event(), threading.Event()
+    holder = lease_in_thread(pool, hold, leased)
+    got = []
+
+    def wait_for_driver():
+        with pool.lease() as driver:
+            got.append(driver)
+
+    waiter = threading.Thread(target=wait_for_driver, daemon=True)
+    waiter.start()
+    time.sleep(0.1)
+    assert got == []
+    hold.set()
+    holder.join(2)
+    waiter.join(2)
+    assert len(got) == 1
+    assert FakeDriver.launched == 2
+    pool.close()
+
+
+def test_lease_times_out_when_pool_is_busy():
+    pool = BrowserPool(size=1, warm_url=None)
+    hold, leased = threading.Event(), threading.Event()
+    holder = lease_in_thread(pool, hold, leased)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        with pool.lease(timeout=0.1):
+            pass
+    assert time.monotonic() - start < 1
+    hold.set()
+    holder.join(2)
+    pool.close()
+
+
+def test_default_lease_timeout_is_finite():
+    assert BrowserPool(warm_url=None).lease_timeout > 0
+
+
+def test_crashed_driver_is_replaced():
+    pool = BrowserPool(size=1, warm_url=None)
+    with pytest.raises(ValueError):
+        with pool.lease() as driver:
+            driver.alive = False
+            raise ValueError("page broke")
+    assert driver.quit_called
+    with pool.lease() as replacement:
+        assert replacement is not driver
+    pool.close()
+
+
+def test_healthy_driver_is_reused_until_max_uses():
+    pool = BrowserPool(size=1, max_uses=2, warm_url=None)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    with pool.lease() as third:
+        pass
+    assert first is second
+    assert third is not first
+    pool.close()
+
+
+def test_every_concurrent_lease_is_counted(monkeypatch):
+    drivers = []
+    monkeypatch.setattr(browser_pool, "create_driver", lambda headless=True: drivers.append(FakeDriver()) or drivers[-1])
+    pool = BrowserPool(size=4, max_uses=10, warm_url=None)
+
+    def lease_many():
+        for _ in range(50):
+            with pool.lease():
+                pass
+
+    workers = [threading.Thread(target=lease_many) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+    retired = [driver for driver in drivers if driver.quit_called]
+    assert 10 * len(retired) + sum(pool._uses[id(driver)] for driver in pool._idle) == 400
+    pool.close()
+
+
+def test_close_wakes_waiters():
+    pool = BrowserPool(size=1, warm_url=None, lease_timeout=5)
+    hold, leased = threading.Event(), threading.Event()
+    holder = lease_in_thread(pool, hold, leased)
+    errors = []
+
+    def wait_for_driver():
+        try:
+            with pool.lease():
+                pass
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait_for_driver, daemon=True)
+    waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    waiter.join(2)
+    assert len(errors) == 1
+    hold.set()
+    holder.join(2)
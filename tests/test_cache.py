@@ -0,0 +1,82 @@
+import json
+
+import main
+from cache import ResponseCache, case_key
+from config import CACHE_TTL_VOLATILE
+from models import CaseDetails
+
+CNR = "MHAU019999992015"
+
+
+def age_entry(cache, key, seconds):
+    path = cache._path("case_status", key)
+    with open(path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+    entry["stored_at"] -= seconds
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+
+
+def test_repeat_lookup_is_served_from_cache(portal, make_scraper, metrics, tmp_path):
+    scraper = make_scraper(cache=ResponseCache(str(tmp_path)))
+    assert scraper.search_by_cnr(CNR, check_listing=False).success
+    requests_after_first = portal.requests
+    assert scraper.search_by_cnr(CNR, check_listing=False).success
+    assert portal.requests == requests_after_first
+    assert metrics.counter_value("ecourts_cache_requests_total", result="hit") == 1
+
+
+def test_stable_fields_are_served_when_portal_fails(portal, make_scraper, metrics, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    scraper = make_scraper(cache=cache)
+    fresh = scraper.search_by_cnr(CNR, check_listing=False)
+    assert fresh.success
+    age_entry(cache, case_key(cnr=CNR), CACHE_TTL_VOLATILE + 60)
+    portal.fail_next(503, times=10)
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert result.success
+    assert result.case_details.case_number == fresh.case_details.case_number
+    assert result.case_details.status is None
+    assert result.case_details.next_hearing_date is None
+    assert metrics.counter_value("ecourts_cache_requests_total", result="stable") == 1
+
+
+def test_stale_entry_is_refetched_when_portal_is_up(portal, make_scraper, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    scraper = make_scraper(cache=cache)
+    scraper.search_by_cnr(CNR, check_listing=False)
+    age_entry(cache, case_key(cnr=CNR), CACHE_TTL_VOLATILE + 60)
+    requests_before = portal.requests
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert result.success and result.case_details.status is not None
+    assert portal.requests > requests_before
+
+
+def test_failure_without_cached_entry_is_reported(portal, make_scraper, tmp_path):
+    scraper = make_scraper(cache=ResponseCache(str(tmp_path)))
+    portal.fail_next(503, times=10)
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert not result.success
+    assert result.failure_reason == "server_error"
+
+
+def test_ttl_overrides_apply_to_case_details(tmp_path):
+    key = case_key(cnr=CNR)
+    details = CaseDetails(cnr=CNR, case_number="123", status="Pending")
+    default = ResponseCache(str(tmp_path))
+    default.put_case_details(key, details)
+    age_entry(default, key, 120)
+    assert default.get_case_details(key) is not None
+
+    short = ResponseCache(str(tmp_path), ttls={"case_status": 60, "case_status_stable": 600})
+    assert short.get_case_details(key) is None
+    stable = short.get_case_details(key, stable_only=True)
+    assert stable.case_number == "123" and stable.status is None
+    age_entry(short, key, 600)
+    assert short.get_case_details(key, stable_only=True) is None
+
+
+def test_cache_ttl_option_sets_the_case_details_window():
+    args = main.create_parser().parse_args(["--cnr", CNR, "--cache-ttl", "1"])
+    cache = main.create_cache(args)
+    assert cache.ttls["case_status"] == 60
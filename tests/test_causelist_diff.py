@@ -0,0 +1,99 @@
+import pytest
+
+from causelist_diff import (ADDED, CHANGED, REMOVED, ConsecutiveDiffer, diff_listings, diff_sorted_listings,
+                            listing_key, summarize)
+from models import CaseDetails, CaseListing, CauseList
+
+DATES = ["20-10-2026", "21-10-2026", "22-10-2026"]
+
+
+def listing(number, court_number="1", purpose="Hearing", cnr=None):
+    details = CaseDetails(cnr=cnr, case_type="CS", case_number=str(number), case_year="2015")
+    return CaseListing(serial_number=number, court_number=court_number, purpose=purpose, case_details=details)
+
+
+def sort_by_key(listings):
+    return sorted(listings, key=listing_key)
+
+
+def cause_list(date, listings, court="27:1:1"):
+    return CauseList(date=date, court_complex=court, listings=listings, total_cases=len(listings))
+
+
+OLD = [listing(1), listing(2), listing(3)]
+NEW = [listing(1), listing(2, court_number="4"), listing(4)]
+
+
+def kinds(changes):
+    return {(change.kind, change.key.split("/")[1]) for change in changes}
+
+
+@pytest.mark.parametrize("differ", [
+    lambda old, new: list(diff_listings(old, new, DATES[0], DATES[1])),
+    lambda old, new: list(diff_sorted_listings(sort_by_key(old), sort_by_key(new), DATES[0], DATES[1])),
+], ids=["linear", "merge"])
+def test_added_removed_and_changed(differ):
+    changes = differ(OLD, NEW)
+    assert kinds(changes) == {(CHANGED, "2"), (REMOVED, "3"), (ADDED, "4")}
+    changed = next(change for change in changes if change.kind == CHANGED)
+    assert changed.changes == {"court_number": ["1", "4"]}
+    assert (changed.old_date, changed.new_date, changed.case_number) == (DATES[0], DATES[1], "CS/2/2015")
+    assert summarize(changes) == {ADDED: 1, REMOVED: 1, CHANGED: 1, "court_number": 1}
+
+
+def test_linear_and_merge_paths_agree():
+    linear = sorted(diff_listings(OLD, NEW), key=lambda change: change.key)
+    merged = list(diff_sorted_listings(sort_by_key(OLD), sort_by_key(NEW)))
+    assert linear == merged
+
+
+@pytest.mark.parametrize("differ", [
+    lambda old, new: list(diff_listings(old, new)),
+    lambda old, new: list(diff_sorted_listings(sort_by_key(old), sort_by_key(new))),
+], ids=["linear", "merge"])
+def test_duplicate_keys_keep_first_listing(differ):
+    old = [listing(1), listing(1, purpose="Orders")]
+    new = [listing(1), listing(1, purpose="Evidence")]
+    assert differ(old, new) == []
+
+
+def test_cnr_identifies_a_case_before_its_number():
+    old = [listing(1, cnr="mhau019999992015")]
+    new = [listing(7, cnr="MHAU019999992015")]
+    changes = list(diff_listings(old, new))
+    assert [(change.kind, change.key) for change in changes] == [(CHANGED, "MHAU019999992015")]
+
+
+def test_merge_rejects_unsorted_input():
+    with pytest.raises(ValueError):
+        list(diff_sorted_listings([], [listing(2), listing(1)]))
+
+
+def test_add_diffs_against_the_courts_previous_list():
+    differ = ConsecutiveDiffer()
+    assert differ.add(cause_list(DATES[0], OLD)) == []
+    assert differ.add(cause_list(DATES[0], OLD, court="27:1:2")) == []
+    assert kinds(differ.add(cause_list(DATES[1], NEW))) == {(CHANGED, "2"), (REMOVED, "3"), (ADDED, "4")}
+    with pytest.raises(ValueError):
+        differ.add(cause_list(DATES[0], OLD))
+
+
+def test_arrive_reorders_out_of_order_dates():
+    differ = ConsecutiveDiffer(dates=DATES)
+    third = cause_list(DATES[2], [listing(1), listing(5)])
+    assert list(differ.arrive("27:1:1", DATES[2], third)) == []
+    assert list(differ.arrive("27:1:1", DATES[1], cause_list(DATES[1], NEW))) == []
+    ready = list(differ.arrive("27:1:1", DATES[0], cause_list(DATES[0], OLD)))
+    assert [listed.date for listed, _ in ready] == DATES
+    assert ready[0][1] == []
+    assert kinds(ready[1][1]) == {(CHANGED, "2"), (REMOVED, "3"), (ADDED, "4")}
+    assert kinds(ready[2][1]) == {(REMOVED, "2"), (REMOVED, "4"), (ADDED, "5")}
+
+
+def test_arrive_skips_a_missing_day():
+    differ = ConsecutiveDiffer(dates=DATES)
+    assert list(differ.arrive("27:1:1", DATES[1], None)) == []
+    assert list(differ.arrive("27:1:1", DATES[2], cause_list(DATES[2], NEW))) == []
+    ready = list(differ.arrive("27:1:1", DATES[0], cause_list(DATES[0], OLD)))
+    assert [listed.date for listed, _ in ready] == [DATES[0], DATES[2]]
+    assert ready[1][1][0].old_date == DATES[0]
@@ -0,0 +1,71 @@
+from causelist_index import CauseListIndexRegistry
+from models import CaseDetails, CaseListing, CauseList
+
+CNR = "MHAU019999992015"
+
+
+def cause_list():
+    listing = CaseListing(case_details=CaseDetails(cnr=CNR, case_type="CS", case_number="123", case_year="2015"))
+    return CauseList(date="20-10-2026", listings=[listing], total_cases=1)
+
+
+class Loader:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+def test_index_is_built_once_while_fresh():
+    registry = CauseListIndexRegistry(directory=None)
+    loader = Loader(cause_list())
+    first = registry.get("all", "20-10-2026", loader)
+    assert registry.get("all", "20-10-2026", loader) is first
+    assert loader.calls == 1
+    assert first.lookup(CaseDetails(cnr=CNR)) is not None
+
+
+def test_failed_fetch_is_not_cached():
+    registry = CauseListIndexRegistry(directory=None)
+    missing = Loader(None)
+    assert registry.get("all", "20-10-2026", missing) is None
+    found = Loader(cause_list())
+    assert registry.get("all", "20-10-2026", found) is not None
+    assert found.calls == 1
+
+
+def test_expired_entry_is_rebuilt(monkeypatch):
+    registry = CauseListIndexRegistry(directory=None, max_age=60)
+    loader = Loader(cause_list())
+    now = [1000.0]
+    monkeypatch.setattr("causelist_index.time.time", lambda: now[0])
+    first = registry.get("all", "20-10-2026", loader)
+    now[0] += 30
+    assert registry.get("all", "20-10-2026", loader) is first
+    now[0] += 31
+    assert registry.get("all", "20-10-2026", loader) is not first
+    assert loader.calls == 2
+
+
+def test_persisted_index_is_reused_by_a_new_registry(tmp_path):
+    loader = Loader(cause_list())
+    CauseListIndexRegistry(directory=str(tmp_path)).get("all", "20-10-2026", loader)
+    index = CauseListIndexRegistry(directory=str(tmp_path)).get("all", "20-10-2026", loader)
+    assert loader.calls == 1
+    assert index.lookup(CaseDetails(cnr=CNR)) is not None
+
+
+def test_per_list_locks_do_not_accumulate(monkeypatch):
+    registry = CauseListIndexRegistry(directory=None, max_age=60)
+    now = [1000.0]
+    monkeypatch.setattr("causelist_index.time.time", lambda: now[0])
+    for day in range(1, 31):
+        registry.get("all", f"{day:02d}-10-2026", Loader(cause_list()))
+    registry.get("all", "31-10-2026", Loader(None))
+    assert registry._locks == {}
+    now[0] += 61
+    assert registry.get("all", "01-10-2026", Loader(cause_list())) is not None
+    assert registry._locks == {}
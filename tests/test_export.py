@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from export import cause_list_frame, search_results_frame, to_arrow, write_parquet
+from models import SearchResult
+
+CNR = "MHAU019999992015"
+
+pytest.importorskip("pyarrow")
+
+
+def assert_round_trips(frame, path):
+    restored = pd.read_parquet(write_parquet(frame, path))
+    # pyarrow reads a column with no values back as plain nulls, so only populated columns keep their dtype
+    populated = frame.columns[frame.notna().any()]
+    assert list(restored[populated].dtypes) == list(frame[populated].dtypes)
+    pd.testing.assert_frame_equal(restored, frame, check_dtype=False, check_categorical=False)
+
+
+def test_cause_list_round_trips_through_parquet(make_scraper, tmp_path):
+    frame = cause_list_frame(make_scraper().download_cause_list("20-10-2026"))
+    assert len(frame) == 12
+    assert frame["serial_number"].dtype == "Int32"
+    assert frame["list_date"].iloc[0] == pd.Timestamp(2026, 10, 20)
+    assert_round_trips(frame, str(tmp_path / "causelist.parquet"))
+    assert to_arrow(frame).num_rows == 12
+
+
+def test_search_results_round_trip_through_parquet(make_scraper, tmp_path):
+    found = make_scraper().search_by_cnr(CNR, check_listing=False)
+    missing = SearchResult(success=False, message="Case not found", error="not_found")
+    frame = search_results_frame([found, missing], cnrs=[CNR, "MHAU010000002015"])
+    assert list(frame["cnr"]) == [CNR, "MHAU010000002015"]
+    assert frame["next_hearing_date"].iloc[0] == pd.Timestamp(2026, 10, 20)
+    assert pd.isna(frame["case_number"].iloc[1])
+    assert_round_trips(frame, str(tmp_path / "results.parquet"))
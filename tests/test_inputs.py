@@ -0,0 +1,39 @@
+import pytest
+
+from inputs import REJECT_DUPLICATE, REJECT_INVALID_CNR, load_references
+
+CNR = "MHAU019999992015"
+
+
+def load(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return load_references(str(path))
+
+
+@pytest.mark.parametrize("name, text", [
+    ("empty.txt", ""),
+    ("comments.txt", "# cases to check\n\n   \n# none yet\n"),
+    ("empty.csv", ""),
+    ("header.csv", "cnr\n"),
+    ("details_header.csv", "case_type,case_number,year\n"),
+])
+def test_inputs_without_references_load_empty(tmp_path, name, text):
+    accepted, rejects = load(tmp_path, name, text)
+    assert len(accepted) == 0
+    assert len(rejects) == 0
+    assert accepted["cnr"].dropna().tolist() == []
+
+
+def test_text_file_is_normalized_and_validated(tmp_path):
+    accepted, rejects = load(tmp_path, "cases.txt", f"# header\n{CNR.lower()}\nMHAU-0199-9999-2015\nABC\n")
+    assert accepted["cnr"].tolist() == [CNR]
+    assert rejects["reason"].tolist() == [REJECT_DUPLICATE, REJECT_INVALID_CNR]
+    assert rejects["source_row"].tolist() == [3, 4]
+
+
+def test_csv_case_details_are_canonicalized(tmp_path):
+    accepted, rejects = load(tmp_path, "cases.csv", "Case Type,Case No,Year\nw.p. (c),0123,2015\n")
+    assert len(rejects) == 0
+    row = accepted.iloc[0]
+    assert (row["case_number"], int(row["case_year"])) == ("123", 2015)
@@ -0,0 +1,44 @@
+import re
+
+from metrics import MetricsRegistry, JsonMetricsSink, PrometheusTextSink, create_metrics_sink
+
+CNR = "MHAU019999992015"
+
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? [0-9.e+-]+$')
+
+
+def test_prometheus_text_is_rendered_in_exposition_order():
+    registry = MetricsRegistry(buckets=(1.0, 0.1))
+    registry.inc("requests_total", result="ok", host="b")
+    registry.inc("requests_total", 2, result="ok", host="a")
+    registry.inc("failures_total")
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        registry.observe("latency_seconds", seconds, step="fetch")
+    assert PrometheusTextSink("").render(registry) == (
+        '# TYPE failures_total counter\n'
+        'failures_total 1\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{host="a",result="ok"} 2\n'
+        'requests_total{host="b",result="ok"} 1\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{step="fetch",le="0.1"} 2\n'
+        'latency_seconds_bucket{step="fetch",le="1.0"} 3\n'
+        'latency_seconds_bucket{step="fetch",le="+Inf"} 4\n'
+        'latency_seconds_sum{step="fetch"} 3.650000\n'
+        'latency_seconds_count{step="fetch"} 4\n'
+    )
+
+
+def test_scraper_metrics_render_as_valid_samples(make_scraper, metrics, tmp_path):
+    assert make_scraper().search_by_cnr(CNR, check_listing=False).success
+    path = str(tmp_path / "ecourts.prom")
+    sink = create_metrics_sink(path)
+    assert isinstance(sink, PrometheusTextSink)
+    metrics.add_sink(sink)
+    metrics.flush()
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    samples = [line for line in lines if not line.startswith("# TYPE ")]
+    assert samples and all(SAMPLE_LINE.match(line) for line in samples)
+    assert any(line.endswith(" histogram") for line in lines)
+    assert isinstance(create_metrics_sink(str(tmp_path / "ecourts.json")), JsonMetricsSink)
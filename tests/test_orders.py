@@ -0,0 +1,76 @@
+import hashlib
+import os
+
+import pytest
+
+from models import CaseOrder
+from orders import OrderDownloader, STATUS_DOWNLOADED, STATUS_DUPLICATE, STATUS_FAILED, STATUS_SKIPPED
+from resilience import Resilience
+
+CNR = "MHAU019999992015"
+PDF = b"%PDF-1.4\n" + b"order text " * 2000 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def downloader(metrics, tmp_path):
+    with OrderDownloader(str(tmp_path / "pdfs"), concurrency=2, chunk_size=1024, metrics=metrics,
+                         resilience=Resilience(metrics=metrics, sleep=lambda seconds: None)) as downloader:
+        yield downloader
+
+
+def order(portal, name):
+    portal.files[f"/orders/{name}"] = PDF
+    return CaseOrder(url=f"{portal.base_url}orders/{name}", order_number=name, order_date="01-10-2026")
+
+
+def write_partial(downloader, url, data):
+    path = downloader._part_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_partial_download_resumes_with_a_range_request(portal, downloader):
+    first = order(portal, "1.pdf")
+    write_partial(downloader, first.url, PDF[:5000])
+    result = downloader.download(first, CNR)
+    assert result.status == STATUS_DOWNLOADED
+    assert portal.ranges == ["bytes=5000-"]
+    assert result.sha256 == hashlib.sha256(PDF).hexdigest()
+    with open(result.path, 'rb') as f:
+        assert f.read() == PDF
+    assert not os.path.exists(downloader._part_path(first.url))
+
+
+def test_complete_partial_file_is_kept_when_range_is_not_satisfiable(portal, downloader):
+    first = order(portal, "1.pdf")
+    write_partial(downloader, first.url, PDF)
+    result = downloader.download(first)
+    assert portal.ranges == [f"bytes={len(PDF)}-"]
+    assert result.status == STATUS_DOWNLOADED
+    assert result.size == len(PDF)
+    assert result.sha256 == hashlib.sha256(PDF).hexdigest()
+
+
+def test_identical_orders_are_stored_once(portal, downloader):
+    orders = [order(portal, "1.pdf"), order(portal, "2.pdf")]
+    results = sorted(downloader.download_all(orders, CNR), key=lambda result: result.order.order_number)
+    assert sorted(result.status for result in results) == [STATUS_DOWNLOADED, STATUS_DUPLICATE]
+    assert results[0].sha256 == results[1].sha256
+    stored = [name for _, _, names in os.walk(os.path.join(downloader.directory, "by-hash")) for name in names]
+    assert stored == [f"{results[0].sha256}.pdf"]
+    assert results[0].path != results[1].path
+    assert all(os.path.getsize(result.path) == len(PDF) for result in results)
+
+    requests_before = portal.requests
+    again = OrderDownloader(downloader.directory).download(orders[0], CNR)
+    assert again.status == STATUS_SKIPPED
+    assert again.path == results[0].path
+    assert portal.requests == requests_before
+
+
+def test_non_pdf_response_is_rejected(portal, downloader):
+    portal.files["/orders/error.pdf"] = b"<html><body>Session expired</body></html>"
+    result = downloader.download(CaseOrder(url=f"{portal.base_url}orders/error.pdf"))
+    assert result.status == STATUS_FAILED
+    assert not os.path.exists(downloader._part_path(result.order.url))
@@ -0,0 +1,61 @@
+import pytest
+
+from resilience import CircuitBreaker, Resilience
+
+CNR = "MHAU019999992015"
+
+
+@pytest.fixture
+def browser_calls(monkeypatch):
+    """
+    Records browser fallbacks instead of starting Chrome
+    """
+    import scraper
+
+    calls = []
+
+    def fail(self, *args):
+        calls.append(args)
+        raise AssertionError("browser fallback used")
+
+    monkeypatch.setattr(scraper.ECourtsScraper, "_fetch_case_status_with_browser", fail)
+    monkeypatch.setattr(scraper.ECourtsScraper, "_fetch_cause_list_with_browser", fail)
+    return calls
+
+
+def test_server_error_is_retried_over_http(make_scraper, portal, metrics, browser_calls):
+    scraper = make_scraper()
+    portal.fail_next(503)
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert result.success
+    assert browser_calls == []
+    assert scraper.pool is None
+    assert metrics.counter_value("ecourts_retries_total", reason="server_error") == 1
+
+
+def test_persistent_server_error_is_classified(make_scraper, portal, browser_calls):
+    scraper = make_scraper()
+    portal.fail_next(503, times=10)
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert not result.success
+    assert result.failure_reason == "server_error"
+    assert browser_calls == []
+
+
+def test_failures_open_the_circuit(make_scraper, portal, metrics, browser_calls):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    scraper = make_scraper(resilience=Resilience(breaker=breaker, metrics=metrics, sleep=lambda seconds: None))
+    portal.fail_next(503, times=10)
+    scraper.search_by_cnr(CNR, check_listing=False)
+    requests = portal.requests
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert result.failure_reason == "circuit_open"
+    assert portal.requests == requests
+    assert browser_calls == []
+
+
+def test_cause_list_server_error_is_retried(make_scraper, portal, browser_calls):
+    scraper = make_scraper()
+    portal.fail_next(500)
+    assert scraper.download_cause_list("20-10-2026").total_cases == 12
+    assert browser_calls == []
@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+import time
+
+from service import JobQueue, ScraperService
+
+CNR = "MHAU019999992015"
+
+
+def gated_factory(make_scraper, release, calls):
+    """
+    Scrapers whose lookups wait for release, so concurrent submits overlap
+    """
+    def factory():
+        scraper = make_scraper()
+        search = scraper.search_by_cnr
+
+        def gated(*args, **kwargs):
+            calls.append(args[0])
+            release.wait(5)
+            return search(*args, **kwargs)
+        scraper.search_by_cnr = gated
+        return scraper
+    return factory
+
+
+def test_identical_lookups_in_flight_share_one_fetch(make_scraper, metrics):
+    release, calls = threading.Event(), []
+    with ScraperService(concurrency=4, metrics=metrics,
+                        scraper_factory=gated_factory(make_scraper, release, calls)) as service:
+        futures = [service.submit(cnr) for cnr in [CNR] * 8 + [CNR.lower(), "MHAU 019999992015"]]
+        assert all(future is futures[0] for future in futures)
+        assert service.in_flight() == 1
+        release.set()
+        assert futures[0].result(timeout=5).success
+        assert calls == [CNR]
+        assert metrics.counter_value("ecourts_service_requests_total", result="coalesced") == 9
+        # The in-flight entry is dropped by a done-callback that can run just after result() returns
+        deadline = time.monotonic() + 5
+        while service.in_flight() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert service.submit(CNR).result(timeout=5).success
+        assert calls == [CNR, CNR]
+
+
+def test_job_queue_writes_results_and_requeues_claimed_jobs(make_scraper, metrics, tmp_path):
+    directory = str(tmp_path / "queue")
+    first = JobQueue.enqueue(CNR, directory=directory)
+    os.makedirs(os.path.join(directory, "processing"))
+    os.replace(os.path.join(directory, "incoming", f"{first}.json"),
+               os.path.join(directory, "processing", f"{first}.json"))
+    second = JobQueue.enqueue(CNR, directory=directory)
+    with open(os.path.join(directory, "incoming", "broken.json"), 'w', encoding='utf-8') as f:
+        f.write("{}")
+
+    service = ScraperService(concurrency=2, metrics=metrics, scraper_factory=make_scraper)
+    queue = JobQueue(service, directory)
+    assert queue.poll() == 3
+    service.close()
+
+    def done(name):
+        with open(os.path.join(queue.done, f"{name}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    assert done(first)["success"] and done(second)["success"]
+    assert done(first)["case_details"]["case_number"] == "999"
+    assert "error" in done("broken")
+    assert os.listdir(queue.incoming) == [] and os.listdir(queue.processing) == []
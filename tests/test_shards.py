@@ -0,0 +1,99 @@
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+import main
+import shards
+from models import SearchResult
+from shards import Journal
+
+CNRS = ["MHAU019999992015", "MHAU019999992016", "MHAU019999992017", "MHAU019999992018"]
+
+
+def found():
+    return SearchResult(success=True, message="Case found successfully")
+
+
+def failed(reason):
+    return SearchResult(success=False, message="failed", failure_reason=reason)
+
+
+def test_journal_survives_reopen_and_keeps_latest_record(tmp_path):
+    path = str(tmp_path / "sweep.journal.jsonl")
+    with Journal(path) as journal:
+        journal.record(CNRS[0], failed("timeout"))
+        journal.record(CNRS[1], failed("case_not_found"))
+        journal.record(CNRS[0], found())
+    with Journal(path) as journal:
+        assert len(journal) == 2
+        assert journal.outcome(CNRS[0]) == "success"
+        assert journal.outcome(CNRS[1]) == "case_not_found"
+        assert journal.outcome(CNRS[2]) is None
+
+
+def test_retryable_failures_are_not_complete(tmp_path):
+    with Journal(str(tmp_path / "sweep.journal.jsonl")) as journal:
+        journal.record(CNRS[0], failed("timeout"))
+        assert not journal.is_complete(CNRS[0])
+        assert journal.outcome(CNRS[0]) is None
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = tmp_path / "sweep.journal.jsonl"
+    with Journal(str(path)) as journal:
+        journal.record(CNRS[0], found())
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"cnr": "MHAU0199')
+    with Journal(str(path)) as journal:
+        journal.record(CNRS[1], found())
+    with Journal(str(path)) as journal:
+        assert journal.outcome(CNRS[0]) == journal.outcome(CNRS[1]) == "success"
+
+
+def test_resumed_sweep_totals_and_downloads_cover_earlier_runs(tmp_path, monkeypatch, capsys):
+    cnr_file = tmp_path / "sweep.txt"
+    cnr_file.write_text("\n".join(CNRS) + "\n", encoding="utf-8")
+    path = str(tmp_path / "sweep.journal.jsonl")
+    with Journal(path) as journal:
+        journal.record(CNRS[0], found())
+        journal.record(CNRS[1], failed("case_not_found"))
+
+    def run_shards(cnrs, journal, shard_count, **options):
+        for cnr, result in ((CNRS[2], found()), (CNRS[3], failed("timeout"))):
+            journal.record(cnr, result)
+            yield cnr, result
+
+    downloads = []
+    monkeypatch.setattr(shards, "run_shards", run_shards)
+    monkeypatch.setattr(main, "download_batch_orders", lambda cnrs, args, headless: downloads.append(cnrs))
+    args = SimpleNamespace(cnr_file=str(cnr_file), rejects=None, journal=path, shards=2, today=False,
+                           tomorrow=False, backend="http", no_cache=True, refresh=False, court=None,
+                           captcha_solver="stub", save=False, download_pdf=True)
+    main.run_sharded(args, headless=True)
+    output = capsys.readouterr().out
+    assert "Searched this run: 2" in output
+    assert "Found: 2 of 4" in output
+    assert "case_not_found: 1" in output
+    assert "1 CNRs still to do" in output
+    assert downloads == [[CNRS[0], CNRS[2]]]
+
+
+def test_shards_refuse_the_console_solver(tmp_path):
+    cnr_file = tmp_path / "sweep.txt"
+    cnr_file.write_text(CNRS[0] + "\n", encoding="utf-8")
+    args = main.create_parser().parse_args(["--cnr-file", str(cnr_file), "--shards", "2",
+                                            "--captcha-solver", "manual"])
+    is_valid, message = main.validate_arguments(args)
+    assert not is_valid and "--captcha-solver" in message
+    with Journal(str(tmp_path / "sweep.journal.jsonl")) as journal:
+        with pytest.raises(ValueError):
+            list(shards.run_shards(CNRS, journal, 2, captcha_solver="manual"))
+
+
+def test_shards_default_to_a_non_interactive_solver(tmp_path):
+    cnr_file = tmp_path / "sweep.txt"
+    cnr_file.write_text(CNRS[0] + "\n", encoding="utf-8")
+    args = main.create_parser().parse_args(["--cnr-file", str(cnr_file), "--shards", "2"])
+    assert main.validate_arguments(args) == (True, None)
+    assert inspect.signature(shards.run_shards).parameters["captcha_solver"].default != "manual"
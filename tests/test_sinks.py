@@ -0,0 +1,59 @@
+import glob
+import gzip
+from types import SimpleNamespace
+
+from main import run_import
+from models import CaseDetails, SearchResult
+from sinks import JsonlSink, iter_jsonl, iter_saved
+from store import SqliteStore
+
+CNR = "MHAU019999992015"
+
+
+def record(index):
+    return {"index": index, "padding": "x" * 100}
+
+
+def test_gzip_segments_rotate_on_uncompressed_size(tmp_path):
+    sink = JsonlSink(str(tmp_path / "results.jsonl"), compression="gzip", rotate_bytes=1000)
+    with sink:
+        for index in range(30):
+            sink.write(record(index))
+    segments = sorted(glob.glob(str(tmp_path / "results-*.jsonl.gz")))
+    # About 125 bytes per line: each segment closes on the line that takes it past 1000 bytes, however well it compresses
+    assert len(segments) == 4
+    for segment in segments[:-1]:
+        with gzip.open(segment, 'rb') as f:
+            assert 1000 <= len(f.read()) < 1130
+    assert [entry["index"] for entry in iter_jsonl(str(tmp_path / "results-*.jsonl.gz"))] == list(range(30))
+
+
+def test_rerun_continues_partly_filled_segment(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with JsonlSink(path, compression="gzip", rotate_bytes=1000) as sink:
+        for index in range(3):
+            sink.write(record(index))
+    with JsonlSink(path, compression="gzip", rotate_bytes=1000) as sink:
+        for index in range(3, 12):
+            sink.write(record(index))
+        last_path = sink.path
+    segments = sorted(glob.glob(str(tmp_path / "results-*.jsonl.gz")))
+    assert len(segments) == 2
+    assert last_path == segments[1]
+    assert [entry["index"] for entry in iter_jsonl(segments[0])] == list(range(8))
+
+
+def test_saved_results_and_cause_lists_import_into_store(portal, make_scraper, tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    cause_list = make_scraper().download_cause_list("20-10-2026")
+    result = SearchResult(success=True, message="Case found successfully",
+                          case_details=CaseDetails(cnr=CNR, case_type="CS", case_number="123", case_year="2015"))
+    with JsonlSink(path) as sink:
+        sink.write(result.to_dict())
+        sink.write(cause_list.to_dict())
+    assert list(iter_saved(path)) == [result, cause_list]
+    with SqliteStore(str(tmp_path / "ecourts.db")) as store:
+        run_import(SimpleNamespace(import_jsonl=path), store)
+        assert store.get_case(CNR).case_number == "123"
+        assert len(store.results_for(CNR)) == 1
+        assert len(store.listings_on("20-10-2026")) == 12
@@ -0,0 +1,46 @@
+import sqlite3
+from dataclasses import replace
+
+from store import SqliteStore
+
+CNR = "MHAU019999992015"
+
+
+def test_case_rows_are_upserted_by_cnr(make_scraper, tmp_path):
+    result = make_scraper().search_by_cnr(CNR, check_listing=False)
+    with SqliteStore(str(tmp_path / "store.db")) as store:
+        store.save_result(result, CNR)
+        store.save_case(replace(result.case_details, status="Disposed"), CNR)
+        assert store.get_case(CNR).status == "Disposed"
+        assert store._query("SELECT COUNT(*) FROM cases")[0][0] == 1
+        assert len(store.results_for(CNR)) == 1
+        assert [case.cnr for case in store.cases_heard_on("20-10-2026")] == [CNR]
+
+
+def test_rows_are_buffered_until_flush_in_wal_mode(make_scraper, tmp_path):
+    path = str(tmp_path / "store.db")
+    result = make_scraper().search_by_cnr(CNR, check_listing=False)
+    store = SqliteStore(path, batch_size=10)
+    reader = sqlite3.connect(path)
+    try:
+        assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.save_result(result, CNR)
+        assert reader.execute("SELECT COUNT(*) FROM search_results").fetchone()[0] == 0
+        store.flush()
+        assert reader.execute("SELECT COUNT(*) FROM search_results").fetchone()[0] == 1
+        assert reader.execute("SELECT case_number FROM cases WHERE cnr = ?", (CNR,)).fetchone()[0] == "999"
+    finally:
+        reader.close()
+        store.close()
+
+
+def test_cause_list_replaces_rows_for_the_same_day(make_scraper, tmp_path):
+    cause_list = make_scraper().download_cause_list("20-10-2026")
+    listed = cause_list.listings[0].case_details.cnr
+    with SqliteStore(str(tmp_path / "store.db")) as store:
+        store.save_cause_list(cause_list)
+        store.save_cause_list(cause_list)
+        listings = store.listings_on("20-10-2026")
+        assert [listing.serial_number for listing in listings] == list(range(1, 13))
+        assert store.listings_on("2026-10-20", cnrs=[listed])[0].case_details.cnr == listed
+        assert len(store.listing_history(listed)) == 1
@@ -0,0 +1,92 @@
+import pytest
+
+from benchmarks.fixtures import load_cause_list
+from benchmarks.stub_server import StubPortal
+from captcha import CaptchaQueue, CaptchaSolver, StubSolver
+from resilience import Resilience
+from scraper import ECourtsScraper
+from transport import HttpTransport
+
+CNR = "MHAU019999992015"
+
+
+def test_lookup_over_http_without_browser(make_scraper, metrics):
+    scraper = make_scraper()
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert result.success
+    assert result.case_details is not None
+    assert scraper.pool is None
+    assert metrics.counter_value("ecourts_lookups_total", outcome="success") == 1
+
+
+def test_handshake_is_reused_across_lookups(make_scraper, portal):
+    scraper = make_scraper()
+    scraper.search_by_cnr(CNR, check_listing=False)
+    scraper.search_by_cnr("MHAU019999992016", check_listing=False)
+    # one form page load, then one POST per lookup
+    assert portal.requests == 3
+
+
+def test_cause_list_over_http(make_scraper):
+    cause_list = make_scraper().download_cause_list("20-10-2026")
+    assert cause_list is not None
+    assert cause_list.total_cases == 12
+
+
+CAPTCHA_FORM = ('<html><body><form action="/case_status" method="post">'
+                '<input type="hidden" name="app_token" value="token">'
+                '<img id="captcha_image" src="/captcha.png"><input name="fcaptcha_code">'
+                '<input name="cnr_number"></form>{notice}</body></html>')
+
+
+class NoAnswer(CaptchaSolver):
+    def solve(self, image):
+        return None
+
+
+@pytest.fixture
+def captcha_scraper(metrics):
+    scrapers = []
+
+    def make(page: str, solver: CaptchaSolver) -> ECourtsScraper:
+        portal = StubPortal(page, load_cause_list("small")).start()
+        captcha = CaptchaQueue(solver)
+        transport = HttpTransport(portal.case_status_url, portal.cause_list_url, captcha=captcha)
+        scraper = ECourtsScraper(transport=transport, captcha=captcha, metrics=metrics,
+                                 resilience=Resilience(metrics=metrics, sleep=lambda seconds: None))
+        scrapers.append((scraper, portal))
+        return scraper
+
+    yield make
+    for scraper, portal in scrapers:
+        scraper.close()
+        portal.stop()
+
+
+def test_unsolved_captcha_is_reported_without_a_browser(captcha_scraper, metrics):
+    scraper = captcha_scraper(CAPTCHA_FORM.format(notice=""), NoAnswer())
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert not result.success
+    assert result.failure_reason == "captcha_required"
+    assert scraper.pool is None
+    assert metrics.counter_value("ecourts_transport_fallbacks_total", backend="http", reason="javascript") == 0
+
+
+def test_rejected_captcha_is_reported_without_a_browser(captcha_scraper):
+    scraper = captcha_scraper(CAPTCHA_FORM.format(notice="<p>Invalid Captcha</p>"), StubSolver())
+    result = scraper.search_by_cnr(CNR, check_listing=False)
+    assert result.failure_reason == "captcha_required"
+    assert scraper.pool is None
+
+
+def test_not_found_form_is_parsed_not_sent_to_the_browser(metrics):
+    page = CAPTCHA_FORM.format(notice="<p>This Case Code does not exist</p>")
+    with StubPortal(page, load_cause_list("small")) as portal:
+        scraper = ECourtsScraper(transport=HttpTransport(portal.case_status_url, portal.cause_list_url),
+                                 metrics=metrics, resilience=Resilience(metrics=metrics, sleep=lambda seconds: None))
+        try:
+            result = scraper.search_by_cnr(CNR, check_listing=False)
+        finally:
+            scraper.close()
+    assert result.failure_reason == "case_not_found"
+    assert scraper.pool is None
@@ -0,0 +1,43 @@
+from dataclasses import replace
+from datetime import date, datetime
+
+from models import CaseDetails
+from watch import WatchStore, Watcher, diff_cases
+
+CNR = "MHAU019999992015"
+
+
+def test_diff_lists_only_changed_fields():
+    old = CaseDetails(cnr=CNR, case_number="999", status="Pending", next_hearing_date="20-10-2026")
+    new = replace(old, status="Disposed", next_hearing_date=None)
+    assert diff_cases(old, new) == {"status": ["Pending", "Disposed"], "next_hearing_date": ["20-10-2026", None]}
+    assert diff_cases(None, old)["case_number"] == [None, "999"]
+
+
+def test_new_case_is_reported_once(portal, make_scraper, tmp_path):
+    path = str(tmp_path / "state.json")
+    changes = list(Watcher(WatchStore(path)).run([CNR], concurrency=1, scraper_factory=make_scraper))
+    assert [change.cnr for change in changes] == [CNR]
+    assert changes[0].is_new
+    assert changes[0].changes["status"] == [None, "Pending"]
+
+    store = WatchStore(path)
+    assert store.get(CNR).next_hearing_date == "2026-10-20"
+    requests_before = portal.requests
+    assert list(Watcher(store).run(concurrency=1, scraper_factory=make_scraper)) == []
+    assert portal.requests == requests_before
+
+
+def test_refetch_reports_changed_fields_only(make_scraper, tmp_path):
+    store = WatchStore(str(tmp_path / "state.json"))
+    watcher = Watcher(store)
+    current = make_scraper().search_by_cnr(CNR, check_listing=False).case_details
+    watcher.record(CNR, replace(current, status="Adjourned"), checked_at=datetime(2026, 10, 1))
+
+    changes = list(watcher.run(today=date(2026, 10, 20), concurrency=1, scraper_factory=make_scraper))
+    assert len(changes) == 1
+    assert not changes[0].is_new
+    assert changes[0].changes == {"status": ["Adjourned", "Pending"]}
+
+    store.put(replace(store.get(CNR), last_checked=datetime(2026, 10, 19).isoformat()))
+    assert list(watcher.run(today=date(2026, 10, 20), concurrency=1, scraper_factory=make_scraper)) == []